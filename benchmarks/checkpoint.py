@@ -0,0 +1,33 @@
+'''Time to save and load a checkpoint of a book holding `n` resting orders.'''
+
+import os, sys, time, tempfile, logging
+
+from fastlob import Orderbook, OrderParams, OrderSide
+
+def fill(lob: Orderbook, n: int) -> None:
+    # resting orders only, bids below asks, spread over 1000 levels per side
+    lob.process_many(OrderParams(OrderSide.BID, 100 - (i % 1000) / 100, 1 + i % 7) for i in range(n // 2))
+    lob.process_many(OrderParams(OrderSide.ASK, 101 + (i % 1000) / 100, 1 + i % 7) for i in range(n - n // 2))
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.FATAL)
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    path = os.path.join(tempfile.mkdtemp(), 'lob.ckpt')
+
+    for name, kwargs in {'default': dict(), 'ticks': dict(ticks=True)}.items():
+        with Orderbook('checkpoint', start=True, **kwargs) as lob:
+            fill(lob, n)
+
+            t0 = time.perf_counter()
+            lob.save_checkpoint(path)
+            saved = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        lob = Orderbook.load_checkpoint(path)
+        loaded = time.perf_counter() - t0
+
+        size = os.path.getsize(path) / 2**20
+        print(f'{name:>8}: {n} orders, save {saved:.2f}s, load {loaded:.2f}s, {size:.1f} MiB')
+
+    os.remove(path)
@@ -0,0 +1,43 @@
+'''Cost of journaling orders (in orders per second, with and without a journal), and replay speed.'''
+
+import os, sys, time, tempfile, logging
+
+from fastlob import Orderbook, OrderParams, OrderSide
+from fastlob.journal import Journal
+
+def orders(n: int) -> list[OrderParams]:
+    # limit orders on both sides, one in ten crossing the spread
+    return [OrderParams(OrderSide.BID if i % 2 else OrderSide.ASK,
+                        100 + (i % 500) / 100 * (1 if i % 2 == (i % 10 == 0) else -1), 1 + i % 7) for i in range(n)]
+
+def orders_per_second(params: list[OrderParams], journal=None, **kwargs) -> float:
+    with Orderbook('journal', journal=journal, **kwargs) as lob:
+        t0 = time.perf_counter()
+        lob.process_many(params)
+        return len(params) / (time.perf_counter() - t0)
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.FATAL)
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    path = os.path.join(tempfile.mkdtemp(), 'lob.journal')
+    params = orders(n)
+
+    def journaled_per_second(**kwargs) -> float:
+        if os.path.exists(path): os.remove(path)
+        with Journal(path) as journal: return orders_per_second(params, journal, **kwargs)
+
+    repeat = 3 # best of `repeat` runs, to reduce noise
+    for name, kwargs in {'default': dict(), 'ticks': dict(ticks=True)}.items():
+        plain = max(orders_per_second(params, **kwargs) for _ in range(repeat))
+        journaled = max(journaled_per_second(**kwargs) for _ in range(repeat))
+
+        with Orderbook('replay', start=True, **kwargs) as lob:
+            t0 = time.perf_counter()
+            lob.replay(path)
+            replayed = n / (time.perf_counter() - t0)
+
+        print(f'{name:>8}: {plain:10.0f} orders/s, {journaled:10.0f} orders/s journaled, '
+              f'{replayed:10.0f} orders/s replayed')
+
+    os.remove(path)
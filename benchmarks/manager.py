@@ -0,0 +1,41 @@
+'''Throughput of many books in one process and sharded across worker processes, in orders per second.'''
+
+import os, sys, time, logging
+
+from fastlob import Orderbook, OrderParams, OrderSide
+from fastlob.manager import BookManager
+
+def orders(n: int) -> list[OrderParams]:
+    # limit orders on both sides, one in ten crossing the spread
+    return [OrderParams(OrderSide.BID if i % 2 else OrderSide.ASK,
+                        100 + (i % 500) / 100 * (1 if i % 2 == (i % 10 == 0) else -1), 1 + i % 7) for i in range(n)]
+
+def local_per_second(symbols: list[str], params: list[OrderParams]) -> float:
+    lobs = {symbol: Orderbook(symbol, start=True, ticks=True, hot=True) for symbol in symbols}
+    t0 = time.perf_counter()
+    for i, order in enumerate(params): lobs[symbols[i % len(symbols)]].process(order)
+    elapsed = time.perf_counter() - t0
+    for lob in lobs.values(): lob.stop()
+    return len(params) / elapsed
+
+def sharded_per_second(symbols: list[str], params: list[OrderParams], shards: int) -> float:
+    with BookManager(shards=shards, ticks=True, hot=True) as manager:
+        for future in [manager.add(symbol) for symbol in symbols]: future.result()
+
+        t0 = time.perf_counter()
+        futures = [manager.process(symbols[i % len(symbols)], order) for i, order in enumerate(params)]
+        manager.flush()
+        for future in futures: future.result()
+        return len(params) / (time.perf_counter() - t0)
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.FATAL)
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    symbols = [f'SYM{i}' for i in range(100)]
+    params = orders(n)
+
+    print(f'{"1 process":>12}: {local_per_second(symbols, params):10.0f} orders/s')
+    for shards in sorted({1, 2, os.cpu_count() or 1}):
+        print(f'{f"{shards} shards":>12}: {sharded_per_second(symbols, params, shards):10.0f} orders/s '
+              f'({os.cpu_count()} cores)')
@@ -0,0 +1,41 @@
+'''Bytes per resting order and per historical order, measured with tracemalloc.'''
+
+import sys, logging, tracemalloc
+
+from fastlob import Orderbook, OrderParams, OrderSide
+
+def bytes_per_resting_order(n: int, **kwargs) -> float:
+    params = [OrderParams(OrderSide.BID, 100 + (i % 100) / 100, 1 + i % 7) for i in range(n)]
+
+    with Orderbook('memory', **kwargs) as lob:
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        lob.process_many(params)
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+    return (after - before) / n
+
+def bytes_per_historical_order(n: int, **kwargs) -> float:
+    # each bid is entirely filled by the next ask, so every order ends up in the history
+    params = [OrderParams(OrderSide.BID if i % 2 == 0 else OrderSide.ASK, 100, 1) for i in range(n)]
+
+    with Orderbook('memory', **kwargs) as lob:
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        lob.process_many(params)
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+    return (after - before) / n
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.FATAL)
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    configs = {'decimal': dict(), 'ticks': dict(ticks=True),
+               'ticks+compact_history': dict(ticks=True, compact_history=True)}
+
+    for name, kwargs in configs.items():
+        print(f'{name:>24}: {bytes_per_resting_order(n, **kwargs):8.1f} bytes/resting order, '
+              f'{bytes_per_historical_order(n, **kwargs):8.1f} bytes/historical order')
@@ -0,0 +1,66 @@
+'''Cost per operation (in microseconds) of a locked lob and of a single-writer one, with and without thread-affinity
+checks, and the saving of the single-writer mode per operation.'''
+
+import sys, time, logging
+
+from fastlob import Orderbook, OrderParams, OrderSide
+
+CHUNK = 500 # operations are timed by chunks, the fastest chunk is kept, to filter out the noise of the machine
+
+def fastest(function, args: list) -> float:
+    '''Seconds per call of `function` on each of `args`, in the fastest chunk of calls.'''
+
+    best = float('inf')
+    for i in range(0, len(args) - CHUNK + 1, CHUNK):
+        chunk = args[i:i + CHUNK]
+        t0 = time.perf_counter()
+        for arg in chunk: function(*arg)
+        best = min(best, (time.perf_counter() - t0) / CHUNK)
+    return best
+
+def seconds_per_operation(n: int, **kwargs) -> dict[str, float]:
+    places = [OrderParams(OrderSide.BID, 100 + (i % 500) / 100, 1 + i % 7) for i in range(n)]
+    levels = [OrderParams(OrderSide.ASK, 200 + i / 100, 1) for i in range(10)]
+    sweep = OrderParams(OrderSide.BID, 200 + 10 / 100, 10)
+
+    timings = dict()
+    with Orderbook('single-writer', **kwargs) as lob:
+        timings['place'] = fastest(lob.process, [(params,) for params in places])
+        ids = list(lob._orders)
+        timings['update'] = fastest(lob.update, [(orderid, 1) for orderid in ids])
+        timings['cancel'] = fastest(lob.cancel, [(orderid,) for orderid in ids])
+
+        best = float('inf')
+        for _ in range(n // 10):
+            lob.process_many(levels)
+            t0 = time.perf_counter()
+            lob(sweep)
+            best = min(best, time.perf_counter() - t0)
+        timings['sweep'] = best
+
+    return timings
+
+def best(n: int, repeat: int, configs: dict[str, dict]) -> dict[str, dict[str, float]]:
+    # configs are interleaved in each round, so that they all see the same noise
+    runs = {name: list() for name in configs}
+    for _ in range(repeat):
+        for name, kwargs in configs.items(): runs[name].append(seconds_per_operation(n, **kwargs))
+    return {name: {op: min(run[op] for run in timings) for op in timings[0]} for name, timings in runs.items()}
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.FATAL)
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    repeat = 3
+    base = dict(ticks=True, hot=True)
+    configs = {'locked': base, 'single-writer': dict(base, single_writer=True),
+               'affinity': dict(base, single_writer=True, check_affinity=True)}
+
+    results = best(n, repeat, configs)
+
+    print(f'{"":>14}' + ''.join(f'{op:>10}' for op in results['locked']) + '  (us/op, ticks+hot)')
+    for name, timings in results.items():
+        print(f'{name:>14}' + ''.join(f'{t * 1e6:10.3f}' for t in timings.values()))
+
+    saving = {op: results['locked'][op] - results['single-writer'][op] for op in results['locked']}
+    print(f'{"saving (ns)":>14}' + ''.join(f'{s * 1e9:10.0f}' for s in saving.values()))
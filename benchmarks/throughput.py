@@ -0,0 +1,40 @@
+'''Throughput of limit orders placement and market sweeps, in orders per second.'''
+
+import sys, time, logging
+
+from fastlob import Orderbook, OrderParams, OrderSide
+
+def limits_per_second(n: int, **kwargs) -> float:
+    params = [OrderParams(OrderSide.BID, 100 + (i % 500) / 100, 1 + i % 7) for i in range(n)]
+
+    with Orderbook('throughput', **kwargs) as lob:
+        t0 = time.perf_counter()
+        lob.process_many(params)
+        return n / (time.perf_counter() - t0)
+
+def sweeps_per_second(n: int, depth: int = 10, **kwargs) -> float:
+    # each market order sweeps `depth` levels, that are then placed back
+    levels = [OrderParams(OrderSide.ASK, 100 + i / 100, 1) for i in range(depth)]
+    sweep = OrderParams(OrderSide.BID, 100 + depth / 100, depth)
+
+    with Orderbook('throughput', **kwargs) as lob:
+        elapsed = 0.0
+        for _ in range(n):
+            lob.process_many(levels)
+            t0 = time.perf_counter()
+            lob(sweep)
+            elapsed += time.perf_counter() - t0
+        return n / elapsed
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.FATAL)
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    repeat = 3 # best of `repeat` runs, to reduce noise
+    configs = {'default': dict(), 'ticks': dict(ticks=True), 'hot': dict(hot=True),
+               'ticks+hot': dict(ticks=True, hot=True)}
+
+    for name, kwargs in configs.items():
+        limits = max(limits_per_second(n, **kwargs) for _ in range(repeat))
+        sweeps = max(sweeps_per_second(n // 10, **kwargs) for _ in range(repeat))
+        print(f'{name:>12}: {limits:10.0f} limits/s, {sweeps:10.0f} sweeps/s (10 levels)')
@@ -0,0 +1,49 @@
+'''Throughput of L2 updates (`Orderbook.step_updates`), in levels per second, for (price, volume) pairs and for numpy 
+arrays when numpy is installed.'''
+
+import sys, time, random, logging
+
+from fastlob import Orderbook
+
+try: import numpy as np
+except ImportError: np = None
+
+def make_updates(n: int, size: int, seed: int = 42) -> list[tuple[list, list]]:
+    # `n` updates of `size` levels per side, prices on a 0.01 grid and 1 in 10 levels deleted
+    rng = random.Random(seed)
+    updates = list()
+    for _ in range(n):
+        sides = list()
+        for base in (100, 200): # bids, asks
+            prices = [base + rng.randrange(10_000) / 100 for _ in range(size)]
+            volumes = [0.0 if rng.random() < 0.1 else rng.randrange(1, 10_000) / 100 for _ in range(size)]
+            sides.append((prices, volumes))
+        updates.append(tuple(sides))
+    return updates
+
+def levels_per_second(updates: list, form: str, **kwargs) -> float:
+    def convert(prices, volumes):
+        if form == 'pairs': return list(zip(prices, volumes))
+        return np.column_stack((prices, volumes))
+
+    updates = [{'bids': convert(*bids), 'asks': convert(*asks)} for bids, asks in updates]
+    nlevels = sum(len(u['bids']) + len(u['asks']) for u in updates)
+
+    with Orderbook('updates', start=False, **kwargs) as lob:
+        t0 = time.perf_counter()
+        for update in updates: lob.step_updates(update)
+        return nlevels / (time.perf_counter() - t0)
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.FATAL)
+
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000 # levels per run
+    forms = ['pairs'] if np is None else ['pairs', 'numpy']
+    configs = {'default': dict(), 'ticks': dict(ticks=True)}
+
+    for size in (10, 1_000, 100_000):
+        updates = make_updates(max(1, total // (2 * size)), size)
+        for name, kwargs in configs.items():
+            for form in forms:
+                rate = max(levels_per_second(updates, form, **kwargs) for _ in range(3))
+                print(f'{size:>7} levels/update {name:>8} {form:>6}: {rate:10.0f} levels/s')
@@ -1,39 +1,12 @@
-import random, time, os
-from scipy import stats
+import time, os
 
-from fastlob import Orderbook, OrderParams, OrderSide
+from fastlob import Orderbook
+from fastlob.sim import OrderFlow
 
 def generate_orders(T: int, midprice: float):
-    result = list()
-    
-    for _ in range(T):
-    
-        n_ask_limits = stats.poisson.rvs(500)
-        n_bid_limits = stats.poisson.rvs(500)
-    
-        ask_limits_price = stats.expon.rvs(loc=midprice, scale=1, size=n_ask_limits)
-        bid_limits_price = -stats.expon.rvs(loc=midprice, scale=1, size=n_bid_limits) + 2*midprice
-    
-        ask_limits_quantities = stats.uniform.rvs(loc=1, scale=100, size=n_ask_limits)
-        bid_limits_quantities = stats.uniform.rvs(loc=1, scale=100, size=n_bid_limits)
-    
-        ask_limits_params = [OrderParams(OrderSide.ASK, p, q) for (p, q) in zip(ask_limits_price, ask_limits_quantities)]
-        bid_limits_params = [OrderParams(OrderSide.BID, p, q) for (p, q) in zip(bid_limits_price, bid_limits_quantities)]
-    
-        n_markets = stats.poisson.rvs(100)
-    
-        markets_price = stats.norm.rvs(loc=midprice, scale=2, size=n_markets)
-        markets_quantities = stats.uniform.rvs(loc=1, scale=100, size=n_markets)
-        markets_bid_or_ask = [random.choice((OrderSide.BID, OrderSide.ASK)) for _ in range(n_markets)]
-    
-        markets_params = [OrderParams(s, p, q) for (s, p, q) in zip(markets_bid_or_ask, markets_price, markets_quantities)]
-    
-        orders = ask_limits_params + bid_limits_params + markets_params
-        random.shuffle(orders)
-        
-        result.append(orders)
-        
-    return result
+    # T batches of ~1100 limit and market orders, drawn around `midprice`
+    flow = OrderFlow(seed=0, midprice=midprice, p_market=0.1, p_cancel=0, p_update=0, offset=1, quantity=50)
+    return [flow.batch(1100).params() for _ in range(T)]
 
 def simulate(orders: list, speed: float):
     ob = Orderbook('Simulation')
@@ -1,4 +1,13 @@
-from .lob import Orderbook
-from .order import OrderParams
-from .result import ExecutionResult
-from .enums import OrderSide, OrderType, OrderStatus, ResultType
+from .lob import Orderbook, L2Diff, BookView
+from .order import (
+    OrderParams,
+    OrderId,
+    IdGenerator,
+    SequentialIdGenerator,
+    PrefixedIdGenerator,
+    ShardedIdGenerator,
+    RandomIdGenerator,
+)
+from .result import ExecutionResult, Fill
+from .enums import OrderSide, OrderType, OrderStatus, ResultType, ResultCode
+from .clock import Clock, WallClock, SimulatedClock
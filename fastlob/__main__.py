@@ -0,0 +1,62 @@
+'''Command line interface: `python -m fastlob bench --help`.'''
+
+import sys
+import json
+import argparse
+from typing import Optional
+
+from fastlob.bench import WORKLOADS, run_suite, compare
+from fastlob.bench.suite import DEFAULT_DEPTHS, DEFAULT_OPS, DEFAULT_THRESHOLD
+
+def bench(args: argparse.Namespace) -> int:
+    '''Run the benchmark suite, write its JSON report, and compare it to the baseline if any (returns 1 if there are
+    regressions).'''
+
+    report = run_suite(args.workloads, args.depths, args.ops, args.repeat, args.seed, progress=not args.quiet,
+                       ticks=args.ticks, hot=args.hot, single_writer=args.single_writer)
+
+    if args.baseline is not None:
+        with open(args.baseline, encoding='utf-8') as file: baseline = json.load(file)
+        report['baseline'] = args.baseline
+        report['regressions'] = compare(report, baseline, args.threshold)
+
+    output = json.dumps(report, indent=2)
+    if args.output is None: print(output)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as file: file.write(output + '\n')
+
+    for regression in report.get('regressions', ()):
+        print('REGRESSION {workload} (depth {depth}): {metric} {baseline:.6g} -> {current:.6g} ({change:+.1%})'
+              .format(**regression), file=sys.stderr)
+
+    return 1 if report.get('regressions') else 0
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m fastlob')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    parser_bench = commands.add_parser('bench', help='run the benchmark suite, report as JSON')
+    parser_bench.add_argument('-w', '--workloads', nargs='+', choices=list(WORKLOADS), default=None,
+                              help='workloads to run (default: all)')
+    parser_bench.add_argument('-d', '--depths', nargs='+', type=int, default=list(DEFAULT_DEPTHS),
+                              help='levels per side of the books (default: %(default)s)')
+    parser_bench.add_argument('-n', '--ops', type=int, default=DEFAULT_OPS,
+                              help='operations per workload (default: %(default)s)')
+    parser_bench.add_argument('-r', '--repeat', type=int, default=3,
+                              help='runs of each workload, the fastest is reported (default: %(default)s)')
+    parser_bench.add_argument('--seed', type=int, default=0, help='seed of the operations (default: %(default)s)')
+    parser_bench.add_argument('--ticks', action='store_true', help='use lobs in tick mode')
+    parser_bench.add_argument('--hot', action='store_true', help='use lobs in hot mode')
+    parser_bench.add_argument('--single-writer', action='store_true', help='use lobs in single-writer mode')
+    parser_bench.add_argument('-o', '--output', help='write the report to a file instead of stdout')
+    parser_bench.add_argument('-b', '--baseline', help='report to compare to, regressions make the exit status 1')
+    parser_bench.add_argument('-t', '--threshold', type=float, default=DEFAULT_THRESHOLD,
+                              help='relative change flagged as a regression (default: %(default)s)')
+    parser_bench.add_argument('-q', '--quiet', action='store_true', help='do not print the progress to stderr')
+    parser_bench.set_defaults(run=bench)
+
+    args = parser.parse_args(argv)
+    return args.run(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
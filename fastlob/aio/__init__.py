@@ -0,0 +1,3 @@
+'''An asyncio front end of the lob, with a single writer matching thread.'''
+
+from .orderbook import AsyncOrderbook
@@ -0,0 +1,160 @@
+'''
+An asyncio front end of the lob: commands are awaited from the event loop but matched by a single writer thread, so
+that matching never blocks the loop.
+'''
+
+import queue
+import asyncio
+import threading
+from numbers import Number
+from typing import Optional, Callable, Any
+
+from fastlob.lob import Orderbook
+from fastlob.order import OrderParams, OrderId
+from fastlob.result import ExecutionResult
+
+class AsyncOrderbook:
+    '''
+    Wrap an `Orderbook` whose commands are all applied by one matching thread (the single writer). Commands received
+    during one iteration of the event loop are handed to the thread as one batch, and their results are sent back to
+    the loop with one wake up per batch, so the per-command overhead of crossing threads is amortized.
+
+    To use as an async context manager, from a running event loop.
+    '''
+
+    _lob: Orderbook
+    _owned: bool
+    _pending: list[tuple[Callable, tuple, asyncio.Future]]
+    _queue: queue.SimpleQueue
+    _loop: Optional[asyncio.AbstractEventLoop]
+    _thread: Optional[threading.Thread]
+    _batches: int
+
+    def __init__(self, lob: Optional[Orderbook] = None, **kwargs):
+        '''
+        Args:
+            lob (Orderbook, optional): The lob to wrap, it must not be modified by other threads while wrapped.
+                Defaults to a new lob, created with `kwargs` and stopped when the wrapper is closed.
+            **kwargs: The arguments of the `Orderbook` constructor (e.g. `ticks`, `hot` or `single_writer`, as
+                only the matching thread modifies the lob), if `lob` is None.
+        '''
+
+        if lob is not None and kwargs: raise ValueError('kwargs are only used to create a new lob')
+
+        self._lob     = Orderbook(**kwargs) if lob is None else lob
+        self._owned   = lob is None
+        self._pending = list()
+        self._queue   = queue.SimpleQueue()
+        self._loop    = None
+        self._thread  = None
+        self._batches = 0
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, a, b, c):
+        await self.aclose()
+
+    def lob(self) -> Orderbook:
+        '''Getter for the wrapped lob, reading it from the event loop while commands are matched is not safe (use
+        `call` instead).'''
+
+        return self._lob
+
+    def batches(self) -> int:
+        '''Number of batches applied by the matching thread.'''
+
+        return self._batches
+
+    def start(self) -> None:
+        '''Start the matching thread (and the lob if it is not running), from the event loop that will await the
+        commands.'''
+
+        if self._thread is not None: raise RuntimeError('the async lob is already started')
+
+        self._loop = asyncio.get_running_loop()
+        if not self._lob.is_running(): self._lob.start()
+
+        self._thread = threading.Thread(target=self._run, name=f'fastlob-matching-{self._lob._name}', daemon=True)
+        self._thread.start()
+
+    async def aclose(self) -> None:
+        '''Apply the pending commands, stop the matching thread (and the lob if it was created by the wrapper).'''
+
+        if self._thread is None: return
+
+        self._flush()
+        self._queue.put(None)
+        await asyncio.to_thread(self._thread.join)
+        await asyncio.sleep(0) # let the results of the last batch be set
+        self._thread = None
+
+        if self._owned: self._lob.stop()
+
+    async def submit(self, orderparams: OrderParams) -> ExecutionResult:
+        '''Process an order, see `Orderbook.process`.'''
+
+        return await self._enqueue(self._lob.process, (orderparams,))
+
+    async def cancel(self, orderid: OrderId) -> ExecutionResult:
+        '''Cancel an order, see `Orderbook.cancel`.'''
+
+        return await self._enqueue(self._lob.cancel, (orderid,))
+
+    async def update(self, orderid: OrderId, new_qty: Number) -> ExecutionResult:
+        '''Update an order, see `Orderbook.update`.'''
+
+        return await self._enqueue(self._lob.update, (orderid, new_qty))
+
+    async def step_updates(self, updates: dict) -> None:
+        '''Apply L2 updates, see `Orderbook.step_updates`.'''
+
+        return await self._enqueue(self._lob.step_updates, (updates,))
+
+    async def call(self, method: str, *args) -> Any:
+        '''Call a public method of the lob (e.g. `best_bids`) from the matching thread, in order with the other
+        commands, returns what it returns.'''
+
+        if method.startswith('_'): raise ValueError(f'{method} is not a public method')
+        return await self._enqueue(getattr(self._lob, method), args)
+
+    def _enqueue(self, function: Callable, args: tuple) -> asyncio.Future:
+        loop = self._loop
+        if self._thread is None or loop is None:
+            raise RuntimeError('the async lob must be started (using <async with>) first')
+
+        future = loop.create_future()
+        if not self._pending: loop.call_soon(self._flush) # once per iteration of the loop
+        self._pending.append((function, args, future))
+        return future
+
+    def _flush(self) -> None:
+        '''Hand the commands received during this iteration of the loop to the matching thread.'''
+
+        if not self._pending: return
+        batch, self._pending = self._pending, list()
+        self._queue.put(batch)
+
+    def _run(self) -> None:
+        '''Main loop of the matching thread.'''
+
+        loop = self._loop
+        if loop is None: raise RuntimeError('the matching thread must be started by <start>')
+
+        while (batch := self._queue.get()) is not None:
+            results = list()
+            for function, args, _ in batch:
+                try: results.append((True, function(*args)))
+                except Exception as e: results.append((False, e))
+
+            self._batches += 1
+            loop.call_soon_threadsafe(_resolve, batch, results)
+
+def _resolve(batch: list[tuple[Callable, tuple, asyncio.Future]], results: list[tuple[bool, Any]]) -> None:
+    '''Set the results of a batch, from the event loop.'''
+
+    for (_, _, future), (ok, value) in zip(batch, results):
+        if future.cancelled(): continue
+        if ok: future.set_result(value)
+        else: future.set_exception(value)
@@ -0,0 +1,4 @@
+'''Benchmark suite of the lob, run with `python -m fastlob bench`.'''
+
+from .workloads import WORKLOADS
+from .suite import run_suite, run_workload, compare
@@ -0,0 +1,114 @@
+'''Runner of the benchmark suite, and comparison of its reports to a baseline.'''
+
+import gc
+import sys
+import time
+import random
+import logging
+import platform
+import tracemalloc
+from typing import Optional, Iterable
+from importlib import metadata
+
+from .workloads import WORKLOADS
+
+DEFAULT_DEPTHS = (10, 100, 1000)
+DEFAULT_OPS = 10_000
+DEFAULT_THRESHOLD = 0.1
+PERCENTILES = (50, 90, 99, 99.9)
+
+def percentile(durations: list[int], q: float) -> int:
+    '''Nearest-rank percentile `q` of sorted `durations`.'''
+
+    return durations[min(len(durations) - 1, max(0, round(q / 100 * len(durations)) - 1))]
+
+def time_workload(name: str, depth: int, n: int, seed: int, **kwargs) -> list[int]:
+    '''Durations (in ns) of the operations of a workload.'''
+
+    durations, clock = list(), time.perf_counter_ns
+    for function, args in WORKLOADS[name](depth, n, random.Random(seed), **kwargs):
+        t0 = clock()
+        function(*args)
+        durations.append(clock() - t0)
+    return durations
+
+def peak_memory(name: str, depth: int, n: int, seed: int, **kwargs) -> int:
+    '''Peak of the memory allocated (in bytes) while building the lob of a workload and running its operations,
+    measured in a separate (slower) run, traced with `tracemalloc`.'''
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        for function, args in WORKLOADS[name](depth, n, random.Random(seed), **kwargs): function(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally: tracemalloc.stop()
+
+def run_workload(name: str, depth: int, n: int = DEFAULT_OPS, repeat: int = 3, seed: int = 0, **kwargs) -> dict:
+    '''Run a workload `repeat` times and report the run with the best throughput: operations per second, latency
+    percentiles and maximum (in ns), and the peak memory.'''
+
+    if repeat < 1: raise ValueError(f'repeat must be >= 1 but is {repeat}')
+
+    best = min((time_workload(name, depth, n, seed, **kwargs) for _ in range(repeat)), key=sum)
+    best.sort()
+    latency = {f'p{q:g}': percentile(best, q) for q in PERCENTILES}
+    latency['max'] = best[-1]
+
+    return {'workload': name, 'depth': depth, 'ops': len(best), 'ops_per_sec': len(best) / (sum(best) / 1e9),
+            'latency_ns': latency, 'peak_memory_bytes': peak_memory(name, depth, n, seed, **kwargs)}
+
+def run_suite(workloads: Optional[Iterable[str]] = None, depths: Iterable[int] = DEFAULT_DEPTHS,
+              n: int = DEFAULT_OPS, repeat: int = 3, seed: int = 0, progress: bool = False, **kwargs) -> dict:
+    '''
+    Run the workloads of the suite at each book depth, and return the report (a JSON serializable dictionary).
+
+    Args:
+        workloads (Iterable[str], optional): Names of the workloads to run (see `WORKLOADS`). Defaults to all.
+        depths (Iterable[int], optional): Number of levels per side of the books. Defaults to (10, 100, 1000).
+        n (int, optional): Number of operations of the workloads (the ones whose operations are heavier, e.g.
+            sweeps, run fewer of them). Defaults to 10000.
+        repeat (int, optional): Number of runs of each workload, the fastest is reported. Defaults to 3.
+        seed (int, optional): Seed of the random operations. Defaults to 0.
+        progress (bool, optional): Whether to print the workloads to stderr as they run. Defaults to False.
+        **kwargs: Arguments of the `Orderbook` constructor (e.g. `ticks`, `hot`).
+    '''
+
+    workloads = list(WORKLOADS) if workloads is None else list(workloads)
+    if (unknown := set(workloads) - WORKLOADS.keys()): raise ValueError(f'unknown workloads {sorted(unknown)}')
+
+    level = logging.root.manager.disable
+    logging.disable(logging.CRITICAL) # the lob logs each operation if it is not hot
+    try:
+        results = list()
+        for name in workloads:
+            for depth in depths:
+                if progress: print(f'running {name} at depth {depth}..', file=sys.stderr)
+                results.append(run_workload(name, depth, n, repeat, seed, **kwargs))
+    finally: logging.disable(level)
+
+    try: version = metadata.version('fastlob')
+    except metadata.PackageNotFoundError: version = None
+
+    return {'fastlob': version, 'python': platform.python_version(), 'platform': platform.platform(),
+            'config': dict(kwargs, n=n, repeat=repeat, seed=seed), 'results': results}
+
+def compare(report: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list[dict]:
+    '''
+    Compare a report to a baseline report, returns the regressions: the (workload, depth) whose throughput dropped,
+    or whose peak memory grew, by more than `threshold` (relative). Results missing from the baseline are skipped.
+    '''
+
+    base = {(result['workload'], result['depth']): result for result in baseline['results']}
+    regressions = list()
+
+    for result in report['results']:
+        if (old := base.get((result['workload'], result['depth']))) is None: continue
+
+        for metric, worse in (('ops_per_sec', -1), ('peak_memory_bytes', 1)):
+            if not old[metric]: continue
+            change = (result[metric] - old[metric]) / old[metric]
+            if worse * change > threshold:
+                regressions.append({'workload': result['workload'], 'depth': result['depth'], 'metric': metric,
+                                    'baseline': old[metric], 'current': result[metric], 'change': change})
+
+    return regressions
@@ -0,0 +1,120 @@
+'''
+The workloads of the benchmark suite. A workload is a generator building a lob with `depth` levels per side, then
+yielding the (function, args) operations to time, one at a time: the work done between two operations (e.g. placing
+back the levels consumed by a sweep) is not timed.
+'''
+
+import random
+from typing import Iterator, Callable
+
+from fastlob.lob import Orderbook
+from fastlob.order import OrderParams
+from fastlob.enums import OrderSide, OrderType
+
+Operations = Iterator[tuple[Callable, tuple]]
+
+MID = 100
+TICK = 0.01
+
+def bid_price(level: int) -> float:
+    '''Price of the bid level `level` (0 being the best one).'''
+
+    return round(MID - (level + 1) * TICK, 2)
+
+def ask_price(level: int) -> float:
+    '''Price of the ask level `level` (0 being the best one).'''
+
+    return round(MID + (level + 1) * TICK, 2)
+
+def snapshot(depth: int, volume: float = 10) -> dict:
+    '''A snapshot with `depth` levels per side.'''
+
+    return {'bids': [(bid_price(i), volume) for i in range(depth)],
+            'asks': [(ask_price(i), volume) for i in range(depth)]}
+
+def book(depth: int, per_level: int = 1, **kwargs) -> tuple[Orderbook, list]:
+    '''A running lob with `per_level` orders of quantity 1 on each of the `depth` levels of each side, and the ids of
+    these orders.'''
+
+    lob = Orderbook('bench', start=True, **kwargs)
+    params = [OrderParams(side, price(i), 1) for i in range(depth) for _ in range(per_level)
+              for side, price in ((OrderSide.BID, bid_price), (OrderSide.ASK, ask_price))]
+    return lob, [result.orderid() for result in lob.process_many(params)]
+
+def place(depth: int, n: int, rng: random.Random, **kwargs) -> Operations:
+    '''Limit orders placed on the existing levels, without crossing the spread.'''
+
+    lob, _ = book(depth, **kwargs)
+    try:
+        for _ in range(n):
+            side = rng.choice((OrderSide.BID, OrderSide.ASK))
+            price = (bid_price if side == OrderSide.BID else ask_price)(rng.randrange(depth))
+            yield lob.process, (OrderParams(side, price, rng.randint(1, 10)),)
+    finally: lob.stop()
+
+def sweep(depth: int, n: int, rng: random.Random, **kwargs) -> Operations:
+    '''Market orders consuming all the levels of the ask side, placed back (untimed) after each sweep.'''
+
+    lob, _ = book(depth, **kwargs)
+    levels = [OrderParams(OrderSide.ASK, ask_price(i), 1) for i in range(depth)]
+    market = OrderParams(OrderSide.BID, ask_price(depth - 1), depth)
+    try:
+        for _ in range(max(10, n // depth)):
+            yield lob.process, (market,)
+            lob.process_many(levels)
+    finally: lob.stop()
+
+def cancel(depth: int, n: int, rng: random.Random, **kwargs) -> Operations:
+    '''A storm of cancellations of all the resting orders, in random order.'''
+
+    lob, ids = book(depth, max(1, n // (2 * depth)), **kwargs)
+    rng.shuffle(ids)
+    try:
+        for orderid in ids: yield lob.cancel, (orderid,)
+    finally: lob.stop()
+
+def update(depth: int, n: int, rng: random.Random, **kwargs) -> Operations:
+    '''Updates of the quantity of random resting orders.'''
+
+    lob, ids = book(depth, max(1, n // (2 * depth)), **kwargs)
+    try:
+        for _ in range(n): yield lob.update, (rng.choice(ids), rng.randint(1, 10))
+    finally: lob.stop()
+
+def fok(depth: int, n: int, rng: random.Random, **kwargs) -> Operations:
+    '''FOK orders reaching all the levels of the ask side but larger than its volume, rejected by the check.'''
+
+    lob, _ = book(depth, **kwargs)
+    order = OrderParams(OrderSide.BID, ask_price(depth - 1), depth + 1, OrderType.FOK)
+    try:
+        for _ in range(n): yield lob.process, (order,)
+    finally: lob.stop()
+
+def step_updates(depth: int, n: int, rng: random.Random, **kwargs) -> Operations:
+    '''L2 updates changing the volume of 10 random levels per side (a volume of 0 deleting the level).'''
+
+    lob = Orderbook('bench', start=True, **kwargs)
+    lob.step_updates(snapshot(depth))
+    levels, changed = range(depth), min(10, depth)
+    try:
+        for _ in range(max(10, n // 10)):
+            updates = {side: [(price(i), rng.choice((0, rng.randint(1, 100)))) for i in rng.sample(levels, changed)]
+                       for side, price in (('bids', bid_price), ('asks', ask_price))}
+            yield lob.step_updates, (updates,)
+    finally: lob.stop()
+
+def from_snapshot(depth: int, n: int, rng: random.Random, **kwargs) -> Operations:
+    '''Creation of a lob from a snapshot (only the `ticks` option is used).'''
+
+    data, ticks = snapshot(depth), kwargs.get('ticks', False)
+    for _ in range(max(10, n // depth)): yield Orderbook.from_snapshot, (data, 'bench', False, ticks)
+
+WORKLOADS: dict[str, Callable[..., Operations]] = {
+    'place': place,
+    'sweep': sweep,
+    'cancel': cancel,
+    'update': update,
+    'fok': fok,
+    'step_updates': step_updates,
+    'from_snapshot': from_snapshot,
+}
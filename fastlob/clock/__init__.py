@@ -0,0 +1,3 @@
+'''The clocks used by the lob to get the current time.'''
+
+from .clock import Clock, WallClock, SimulatedClock
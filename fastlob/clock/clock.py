@@ -0,0 +1,54 @@
+'''The clock is the source of time of the lob (GTD expiries, running time).'''
+
+import abc
+import time
+
+class Clock(abc.ABC):
+    '''Base class for clocks, time is a unix timestamp in seconds.'''
+
+    @abc.abstractmethod
+    def now(self) -> float:
+        '''Get the current time.'''
+
+    @abc.abstractmethod
+    def simulated(self) -> bool:
+        '''True if time only moves when the clock is explicitly advanced.'''
+
+    def advance_to(self, t: float) -> None:
+        '''Set the current time to `t`, only supported by simulated clocks.'''
+
+        raise NotImplementedError(f'{type(self).__name__} can not be advanced')
+
+class WallClock(Clock):
+    '''The system clock (`time.time`), the default.'''
+
+    def now(self) -> float:
+        return time.time()
+
+    def simulated(self) -> bool:
+        return False
+
+class SimulatedClock(Clock):
+    '''A clock that only moves forward when `advance_to` is called, e.g. from the timestamps of replayed events.'''
+
+    _now: float
+
+    def __init__(self, start: float = 0.0):
+        '''
+        Args:
+            start (float, optional): The initial time. Defaults to 0.
+        '''
+
+        self._now = float(start)
+
+    def now(self) -> float:
+        return self._now
+
+    def simulated(self) -> bool:
+        return True
+
+    def advance_to(self, t: float) -> None:
+        '''Set the current time to `t`, time can not go backwards.'''
+
+        if t < self._now: raise ValueError(f'simulated time can not go backwards ({t} < {self._now})')
+        self._now = float(t)
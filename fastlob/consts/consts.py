@@ -26,3 +26,5 @@ MAX_VALUE = Decimal(int(10e10))
 ORDERS_ID_SIZE = 8
 
 DEFAULT_LIMITS_VIEW = 10
+
+COMPACT_HISTORY_MIN = 1024
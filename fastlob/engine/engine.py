@@ -4,21 +4,19 @@ from decimal import Decimal
 
 from fastlob.side import Side
 from fastlob.order import Order
-from fastlob.enums import OrderSide
+from fastlob.enums import OrderSide, ResultCode
 from fastlob.result import ResultBuilder
+from fastlob.utils import fromticks_price, fromticks_quantity
 
 def execute(order: Order, side: Side) -> ResultBuilder:
     '''Execute a market order at a given side.'''
 
     result = ResultBuilder.new_market(order.id())
 
-    if fill_whole_limits(side, order, result):
-        result.set_success(True); return result
+    if not fill_whole_limits(side, order, result) and not fill_whole_orders(side, order, result):
+        fill_last_order(side, order, result)
 
-    if fill_whole_orders(side, order, result):
-        result.set_success(True); return result
-
-    fill_last_order(side, order, result)
+    side.refresh_top() # only the best limits are consumed, look the new best one up once at the end
 
     result.set_success(True); return result
 
@@ -29,7 +27,7 @@ def fill_whole_limits(side: Side, order: Order, result: ResultBuilder) -> bool:
         lim = side.best()
 
         if oop(order, lim.price()): # if out of price break
-            result.add_message(mk_oop_msg(lim.price(), order.quantity()))
+            result.add_message(ResultCode.OUT_OF_PRICE, *oop_args(side, lim.price(), order.quantity()))
             return True
 
         if order.quantity() < lim.volume(): return False # if can not match whole limits anymore, break
@@ -39,8 +37,13 @@ def fill_whole_limits(side: Side, order: Order, result: ResultBuilder) -> bool:
         result.inc_execprices(lim.price(), lim.volume())
 
         order.fill(lim.volume()) # partially fill order with limit volume
-        side.update_volume(-lim.volume()) # substract limit volume from side volume before filling all orders in limit
-        lim.fill_all() # set all orders to filled
+        side.update_volume(-lim.volume(), lim.price()) # substract limit volume from side volume before filling orders
+
+        while lim.valid_orders() > 0: # fill all orders (and the external volume), reporting each trade
+            quantity = lim.next_quantity()
+            maker = lim.pop_next()
+            result.add_fill(None if maker is None else maker.id(), lim.price(), quantity)
+
         side.pop_limit(lim.price()) # remove limit from side
 
     return False
@@ -53,20 +56,21 @@ def fill_whole_orders(side: Side, order: Order, result: ResultBuilder) -> bool:
     lim = side.best()
 
     if oop(order, lim.price()):
-        result.add_message(mk_oop_msg(lim.price(), order.quantity()))
+        result.add_message(ResultCode.OUT_OF_PRICE, *oop_args(side, lim.price(), order.quantity()))
         return True
 
     while order.quantity() > 0:
-        next_order = lim.next_order()
+        quantity = lim.next_quantity() # of the next order, or of the external volume
 
-        if order.quantity() < next_order.quantity(): return False
+        if order.quantity() < quantity: return False
 
         result.inc_orders_matched(1)
-        result.inc_execprices(next_order.price(), next_order.quantity())
+        result.inc_execprices(lim.price(), quantity)
 
-        order.fill(next_order.quantity())
-        side.update_volume(-next_order.quantity())
-        lim.pop_next_order()
+        order.fill(quantity)
+        side.update_volume(-quantity, lim.price())
+        maker = lim.pop_next()
+        result.add_fill(None if maker is None else maker.id(), lim.price(), quantity)
 
     return False
 
@@ -76,21 +80,26 @@ def fill_last_order(side: Side, order: Order, result: ResultBuilder):
     if side.empty(): return
 
     lim = side.best()
-    lim_order = lim.next_order()
 
     if order.valid():
-        result.inc_execprices(lim_order.price(), order.quantity())
+        result.inc_execprices(lim.price(), order.quantity())
+        maker = lim.next_maker()
+        result.add_fill(None if maker is None else maker.id(), lim.price(), order.quantity())
 
         lim.fill_next(order.quantity())
-        side.update_volume(-order.quantity())
+        side.update_volume(-order.quantity(), lim.price())
 
         order.fill(order.quantity())
 
-def oop(order: Order, lim_price: Decimal) -> bool:
+def oop(order: Order, lim_price: Decimal | int) -> bool:
     '''True if order is out of price.'''
 
     match order.side():
         case OrderSide.BID: return order.price() < lim_price
         case OrderSide.ASK: return order.price() > lim_price
 
-def mk_oop_msg(p, q): return f'<matching engine>: order out-of-price at ({p}), quantity left: ({q})'
+def oop_args(side: Side, p, q) -> tuple:
+    '''Arguments of the out-of-price message, in decimal units.'''
+
+    if side.ticks(): return fromticks_price(p), fromticks_quantity(q)
+    return p, q
@@ -1,3 +1,3 @@
 '''All the project enumerations are grouped here for simplicity.'''
 
-from .enums import OrderSide, OrderType, OrderStatus, ResultType
+from .enums import OrderSide, OrderType, OrderStatus, ResultType, ResultCode
@@ -30,8 +30,6 @@ class OrderType(Enum):
     '''A Good-Til-Day (GTD) order is a type of order that is active until its specified date (UTC seconds timestamp), 
     unless it has already been fulfilled or cancelled.
     '''
-    FAKE = 4
-    '''Used when running lob with historical data.'''
 
 class OrderStatus(Enum):
     '''The status of an order.'''
@@ -54,6 +52,41 @@ class OrderStatus(Enum):
         '''Returns the set of states in which an order is considered valid.'''
         return {OrderStatus.CREATED, OrderStatus.PENDING, OrderStatus.PARTIAL}
 
+class ResultCode(Enum):
+    '''Compact code of an information message attached to a result. The message itself is only rendered (from the
+    code and its arguments) when `ExecutionResult.messages` is called.'''
+
+    NOT_RUNNING = 1
+    '''The lob is not running.'''
+    INVALID_PARAMS = 2
+    '''The object provided is not an instance of `OrderParams`.'''
+    GTD_EXPIRED = 3
+    '''The GTD order expiry is not in the future.'''
+    OUT_OF_LADDER = 4
+    '''The order price is out of the lob price ladder.'''
+    FOK_NOT_MATCHABLE = 5
+    '''The FOK order can not be entirely and immediately matched.'''
+    OUT_OF_PRICE = 6
+    '''The market order could not be entirely matched because the next limit price is out of the order price.'''
+    PARTIAL_FILLED = 7
+    '''The order was partially filled, what is left was placed in a limit.'''
+    PARTIAL_PLACED = 8
+    '''What is left of a partially executed order was placed as a limit order.'''
+    INVALID_QUANTITY = 9
+    '''The quantity provided could not be converted to a valid decimal quantity.'''
+    QUANTITY_NOT_POSITIVE = 10
+    '''The quantity provided is not strictly positive.'''
+    ORDER_NOT_FOUND = 11
+    '''The order identifier is unknown.'''
+    NOT_UPDATABLE = 12
+    '''The order can not be updated anymore.'''
+    NOT_CANCELABLE = 13
+    '''The order can not be canceled anymore.'''
+    UPDATED = 14
+    '''The order was updated.'''
+    CANCELED = 15
+    '''The order was canceled.'''
+
 class ResultType(Enum):
     '''The type of execution result.'''
 
@@ -0,0 +1,3 @@
+'''Write-ahead journal of the commands received by a lob, to rebuild its state after a crash.'''
+
+from .journal import Journal, read_journal, KIND_PROCESS, KIND_CANCEL, KIND_UPDATE, KIND_STEP, KIND_ADVANCE
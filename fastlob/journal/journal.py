@@ -0,0 +1,273 @@
+'''
+Append-only journal of the commands received by a lob. All integers are little-endian, prices and quantities are 
+stored as integer ticks and lots.
+
+    file header : magic (4s) | version (u16) | price precision (u8) | quantity precision (u8)
+    record      : payload size (u32) | crc32 of the rest of the record (u32) | sequence number (u64) | kind (u8)
+                  | payload
+
+    payloads    : PROCESS  side (u8) | order type (u8) | price (i64) | quantity (i64) | expiry (f64, nan if none)
+                           | order id
+                  CANCEL   order id
+                  UPDATE   order id | quantity (i64)
+                  STEP     timestamp (f64, nan if none) | #bids (u32) | #asks (u32) | #bids then #asks (i64, i64)
+                  ADVANCE  time (f64)
+
+    order id    : 0 (u8) | id (i64) for integer ids, 1 (u8) | length (u16) | utf-8 bytes for string ids
+
+A record that is cut or corrupted (e.g. the process died while writing it) ends the journal, it is truncated when 
+the journal is opened again.
+'''
+
+import os
+import math
+import mmap
+import zlib
+import struct
+import threading
+from typing import Optional, Iterator, BinaryIO
+
+from fastlob.enums import OrderSide, OrderType
+from fastlob.order import OrderId
+from fastlob.consts import DECIMAL_PRECISION_PRICE, DECIMAL_PRECISION_QTY
+
+MAGIC = b'FLJN'
+VERSION = 2
+
+KIND_PROCESS = 0
+KIND_CANCEL = 1
+KIND_UPDATE = 2
+KIND_STEP = 3
+KIND_ADVANCE = 4
+
+FILE_HEADER = struct.Struct('<4sHBB')
+RECORD_HEADER = struct.Struct('<IIQB')
+PROCESS = struct.Struct('<BBqqd')
+STEP = struct.Struct('<dII')
+QUANTITY = struct.Struct('<q')
+TIME = struct.Struct('<d')
+INT_ID = struct.Struct('<Bq')
+STR_ID = struct.Struct('<BH')
+
+_SIDES = list(OrderSide)
+_OTYPES = list(OrderType)
+
+class Journal:
+    '''
+    Journal opened for appending, commands are numbered with increasing sequence numbers (starting at 1).
+
+    Appends only go to an in-memory buffer. The buffer is written and flushed to disk (`fsync`) by a background
+    thread every `interval` seconds (group commit), so that durability does not cost a system call per command: at
+    most the commands of the last `interval` seconds are lost on a crash. With an interval of 0, every append is
+    synced before returning.
+    '''
+
+    _path: str
+    _file: BinaryIO
+    _buffer: bytearray
+    _seq: int
+    _interval: float
+    _lock: threading.Lock
+    _iolock: threading.Lock
+    _closed: threading.Event
+    _thread: Optional[threading.Thread]
+
+    def __init__(self, path: str, interval: float = 0.005):
+        '''
+        Args:
+            path (str): The journal file, created if it does not exist, otherwise appended to (after its last valid 
+                record).
+            interval (float, optional): The group commit interval, in seconds. Defaults to 0.005.
+        '''
+
+        if interval < 0: raise ValueError(f'interval must be >= 0 but is {interval}')
+
+        self._path     = path
+        self._buffer   = bytearray()
+        self._seq      = 0
+        self._interval = interval
+        self._lock     = threading.Lock()
+        self._iolock   = threading.Lock()
+        self._closed   = threading.Event()
+        self._thread   = None
+
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            end = FILE_HEADER.size
+            for seq, _, _, end in _records(path): self._seq = seq
+            os.truncate(path, end) # drop a torn record at the end, if any
+            self._file = open(path, 'ab')
+        else:
+            self._file = open(path, 'wb')
+            self._file.write(FILE_HEADER.pack(MAGIC, VERSION, DECIMAL_PRECISION_PRICE, DECIMAL_PRECISION_QTY))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+        if interval > 0:
+            self._thread = threading.Thread(target=self._run, name='fastlob-journal', daemon=True)
+            self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, a, b, c):
+        self.close()
+
+    def path(self) -> str:
+        '''Getter for the journal file path.'''
+
+        return self._path
+
+    def last_seq(self) -> int:
+        '''Sequence number of the last command appended, 0 if there is none.'''
+
+        return self._seq
+
+    def append_process(self, side: OrderSide, otype: OrderType, price: int, quantity: int,
+                       expiry: Optional[float], orderid: OrderId) -> int:
+        '''Journal the processing of an order (price and quantity in ticks and lots) and the identifier it was 
+        given, returns its sequence number.'''
+
+        expiry = math.nan if expiry is None else expiry
+        payload = PROCESS.pack(_SIDES.index(side), _OTYPES.index(otype), price, quantity, expiry)
+        return self._append(KIND_PROCESS, payload + _pack_id(orderid))
+
+    def append_cancel(self, orderid: OrderId) -> int:
+        '''Journal the cancellation of an order, returns its sequence number.'''
+
+        return self._append(KIND_CANCEL, _pack_id(orderid))
+
+    def append_update(self, orderid: OrderId, quantity: int) -> int:
+        '''Journal the update of an order (to a quantity in lots), returns its sequence number.'''
+
+        return self._append(KIND_UPDATE, _pack_id(orderid) + QUANTITY.pack(quantity))
+
+    def append_step(self, bids: tuple[list[int], list[int]], asks: tuple[list[int], list[int]],
+                    timestamp: Optional[float]) -> int:
+        '''Journal L2 updates, given as (prices, volumes) in ticks and lots for each side, returns its sequence 
+        number.'''
+
+        (bprices, bvolumes), (aprices, avolumes) = bids, asks
+        levels = [x for pair in zip(bprices + aprices, bvolumes + avolumes) for x in pair]
+
+        timestamp = math.nan if timestamp is None else timestamp
+        payload = STEP.pack(timestamp, len(bprices), len(aprices)) + struct.pack(f'<{len(levels)}q', *levels)
+        return self._append(KIND_STEP, payload)
+
+    def append_advance(self, t: float) -> int:
+        '''Journal a move of the (simulated) clock, returns its sequence number.'''
+
+        return self._append(KIND_ADVANCE, TIME.pack(t))
+
+    def sync(self) -> None:
+        '''Write the buffered commands and flush them to disk.'''
+
+        with self._iolock:
+            with self._lock: data, self._buffer = self._buffer, bytearray()
+            if not data: return
+
+            self._file.write(data)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        '''Sync the buffered commands and close the journal.'''
+
+        if self._file.closed: return
+
+        self._closed.set()
+        if self._thread is not None: self._thread.join()
+
+        self.sync()
+        self._file.close()
+
+    def _append(self, kind: int, payload: bytes) -> int:
+        with self._lock:
+            if self._closed.is_set(): raise RuntimeError('the journal is closed')
+
+            self._seq += 1
+            body = struct.pack('<QB', self._seq, kind) + payload
+            self._buffer += struct.pack('<II', len(payload), zlib.crc32(body))
+            self._buffer += body
+            seq = self._seq
+
+        if self._interval == 0: self.sync()
+        return seq
+
+    def _run(self) -> None:
+        while not self._closed.wait(self._interval): self.sync()
+
+def read_journal(path: str) -> Iterator[tuple[int, int, tuple]]:
+    '''
+    Iterate over the commands of a journal, as (sequence number, kind, arguments) triplets. Arguments are:
+
+    - `KIND_PROCESS`: (side, order type, price, quantity, expiry, order id)
+    - `KIND_CANCEL`: (order id,)
+    - `KIND_UPDATE`: (order id, quantity)
+    - `KIND_STEP`: ((bid prices, bid volumes), (ask prices, ask volumes), timestamp)
+    - `KIND_ADVANCE`: (time,)
+
+    Prices and quantities being integer ticks and lots.
+    '''
+
+    for seq, kind, args, _ in _records(path): yield seq, kind, args
+
+def _pack_id(orderid: OrderId) -> bytes:
+    if isinstance(orderid, int): return INT_ID.pack(0, orderid)
+    encoded = str(orderid).encode()
+    return STR_ID.pack(1, len(encoded)) + encoded
+
+def _unpack_id(view: memoryview, offset: int) -> tuple[OrderId, int]:
+    '''Decode the order id at `offset`, returns (order id, offset after it).'''
+
+    if view[offset] == 0: return INT_ID.unpack_from(view, offset)[1], offset + INT_ID.size
+    _, n = STR_ID.unpack_from(view, offset)
+    start = offset + STR_ID.size
+    return bytes(view[start:start + n]).decode(), start + n
+
+def _records(path: str) -> Iterator[tuple[int, int, tuple, int]]:
+    '''Iterate over the valid records of a journal, as (seq, kind, args, offset of the next record).'''
+
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size < FILE_HEADER.size: raise ValueError(f'{path} is not a journal file')
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try: yield from _decode(path, view)
+            finally: view.release()
+
+def _decode(path: str, view: memoryview) -> Iterator[tuple[int, int, tuple, int]]:
+    magic, version, pprec, qprec = FILE_HEADER.unpack_from(view, 0)
+
+    if magic != MAGIC: raise ValueError(f'{path} is not a journal file')
+    if version != VERSION: raise ValueError(f'unsupported journal version {version}')
+    if (pprec, qprec) != (DECIMAL_PRECISION_PRICE, DECIMAL_PRECISION_QTY):
+        raise ValueError(f'journal precision ({pprec}, {qprec}) does not match decimal precision '
+                         f'({DECIMAL_PRECISION_PRICE}, {DECIMAL_PRECISION_QTY})')
+
+    offset, end = FILE_HEADER.size, len(view)
+    while offset + RECORD_HEADER.size <= end:
+        size, crc, seq, kind = RECORD_HEADER.unpack_from(view, offset)
+        start, stop = offset + RECORD_HEADER.size, offset + RECORD_HEADER.size + size
+
+        if stop > end or zlib.crc32(view[offset + 8:stop]) != crc: return # torn or corrupted record
+
+        args: tuple
+        if kind == KIND_PROCESS:
+            side, otype, price, quantity, expiry = PROCESS.unpack_from(view, start)
+            orderid = _unpack_id(view, start + PROCESS.size)[0]
+            args = (_SIDES[side], _OTYPES[otype], price, quantity, None if math.isnan(expiry) else expiry, orderid)
+        elif kind == KIND_CANCEL: args = (_unpack_id(view, start)[0],)
+        elif kind == KIND_UPDATE:
+            orderid, at = _unpack_id(view, start)
+            args = (orderid, QUANTITY.unpack_from(view, at)[0])
+        elif kind == KIND_STEP:
+            timestamp, nbids, nasks = STEP.unpack_from(view, start)
+            levels = struct.unpack_from(f'<{2 * (nbids + nasks)}q', view, start + STEP.size)
+            bids = (list(levels[0:2 * nbids:2]), list(levels[1:2 * nbids:2]))
+            asks = (list(levels[2 * nbids::2]), list(levels[2 * nbids + 1::2]))
+            args = (bids, asks, None if math.isnan(timestamp) else timestamp)
+        elif kind == KIND_ADVANCE: args = TIME.unpack_from(view, start)
+        else: return
+
+        offset = stop
+        yield seq, kind, args, offset
@@ -0,0 +1,3 @@
+'''Compact binary format for L2 market data (snapshots and depth updates), replayed through `mmap`.'''
+
+from .format import L2Writer, L2File, LevelsView, convert
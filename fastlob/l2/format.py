@@ -0,0 +1,228 @@
+'''
+Binary L2 format. All integers are little-endian, prices and volumes are stored as integer ticks and lots.
+
+    file header   : magic (4s) | version (u16) | price precision (u8) | quantity precision (u8) | #records (u64)
+    record header : timestamp (f64, nan if none) | kind (u32) | #bids (u32) | #asks (u32) | padding (4x)
+    levels        : #bids then #asks (price, volume) pairs of (i64, i64)
+
+The first record may be a snapshot (kind = 1), all the others are updates (kind = 0).
+'''
+
+import io
+import os
+import math
+import sys
+import mmap
+import struct
+from array import array
+from numbers import Number
+from decimal import Decimal
+from typing import Optional, Iterable, Iterator
+
+from fastlob.utils import todecimal_price, todecimal_quantity, toticks_price, toticks_quantity, fromticks_price, \
+    fromticks_quantity
+from fastlob.consts import DECIMAL_PRECISION_PRICE, DECIMAL_PRECISION_QTY
+
+MAGIC = b'FLL2'
+VERSION = 1
+
+KIND_UPDATE = 0
+KIND_SNAPSHOT = 1
+
+FILE_HEADER = struct.Struct('<4sHBBQ')
+RECORD_HEADER = struct.Struct('<dIII4x')
+LEVEL = struct.Struct('<qq')
+
+class LevelsView:
+    '''
+    Read-only sequence of (price, volume) pairs backed by a slice of the mapped file, the integers are decoded in place
+    (`memoryview.cast`) and only converted to decimals when a pair is accessed.
+    '''
+
+    _values: memoryview | array
+
+    def __init__(self, buffer: memoryview):
+        if sys.byteorder == 'little': self._values = buffer.cast('q')
+        else: # the file is little-endian, big-endian platforms have to copy
+            self._values = array('q', buffer.tobytes())
+            self._values.byteswap()
+
+    def __len__(self) -> int:
+        return len(self._values) // 2
+
+    def __getitem__(self, i: int) -> tuple[Decimal, Decimal]:
+        if not -len(self) <= i < len(self): raise IndexError('level index out of range')
+        i %= len(self)
+        return fromticks_price(self._values[2 * i]), fromticks_quantity(self._values[2 * i + 1])
+
+    def __iter__(self) -> Iterator[tuple[Decimal, Decimal]]:
+        values = self._values
+        for i in range(0, len(values), 2): yield fromticks_price(values[i]), fromticks_quantity(values[i + 1])
+
+    def ticks(self) -> memoryview | array:
+        '''The raw (price, volume) integers, interleaved.'''
+
+        return self._values
+
+class L2Writer:
+    '''Write a snapshot and a stream of updates to a binary L2 file, to use as a context manager.'''
+
+    _file: io.BufferedWriter
+    _records: int
+
+    def __init__(self, path: str):
+        '''
+        Args:
+            path (str): The file to write.
+        '''
+
+        self._file = open(path, 'wb')
+        self._records = 0
+        self._file.write(FILE_HEADER.pack(MAGIC, VERSION, DECIMAL_PRECISION_PRICE, DECIMAL_PRECISION_QTY, 0))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, a, b, c):
+        self.close()
+
+    def __len__(self) -> int:
+        '''Number of records written so far.'''
+
+        return self._records
+
+    def write_snapshot(self, snapshot: dict, timestamp: Optional[float] = None) -> None:
+        '''Write the initial snapshot, must be the first record of the file.'''
+
+        if self._records > 0: raise ValueError('the snapshot must be the first record of the file')
+        self._write(KIND_SNAPSHOT, snapshot['bids'], snapshot['asks'], timestamp)
+
+    def write_update(self, updates: dict) -> None:
+        '''Write an update, of the form accepted by `Orderbook.step_updates`.'''
+
+        self._write(KIND_UPDATE, updates['bids'], updates['asks'], updates.get('timestamp'))
+
+    def close(self) -> None:
+        '''Write the number of records in the file header and close the file.'''
+
+        if self._file.closed: return
+        self._file.seek(0)
+        self._file.write(FILE_HEADER.pack(MAGIC, VERSION, DECIMAL_PRECISION_PRICE, DECIMAL_PRECISION_QTY,
+                                          self._records))
+        self._file.close()
+
+    def _write(self, kind: int, bids: Iterable[tuple[Number, Number]], asks: Iterable[tuple[Number, Number]],
+               timestamp: Optional[float]) -> None:
+        bids, asks = list(bids), list(asks)
+        t = math.nan if timestamp is None else float(timestamp)
+
+        buffer = bytearray(RECORD_HEADER.size + LEVEL.size * (len(bids) + len(asks)))
+        RECORD_HEADER.pack_into(buffer, 0, t, kind, len(bids), len(asks))
+
+        offset = RECORD_HEADER.size
+        for price, volume in bids + asks:
+            ticks, lots = toticks_price(todecimal_price(price)), toticks_quantity(todecimal_quantity(volume))
+            LEVEL.pack_into(buffer, offset, ticks, lots)
+            offset += LEVEL.size
+
+        self._file.write(buffer)
+        self._records += 1
+
+class L2File:
+    '''
+    A binary L2 file, mapped in memory. Iterating over it yields the updates (as accepted by `Orderbook.step_updates`)
+    one record at a time, so it can be passed to `Orderbook.load_updates` without loading the dataset in memory.
+    '''
+
+    _file: io.BufferedReader
+    _mmap: Optional[mmap.mmap]
+    _view: Optional[memoryview]
+    _records: int
+    _start: int
+
+    def __init__(self, path: str):
+        '''
+        Args:
+            path (str): The file to read.
+        '''
+
+        self._file = open(path, 'rb')
+        self._mmap, self._view = None, None
+
+        try:
+            if os.fstat(self._file.fileno()).st_size < FILE_HEADER.size:
+                raise ValueError(f'{path} is not a binary L2 file')
+
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._view = memoryview(self._mmap)
+            magic, version, pprec, qprec, self._records = FILE_HEADER.unpack_from(self._view, 0)
+
+            if magic != MAGIC: raise ValueError(f'{path} is not a binary L2 file')
+            if version != VERSION: raise ValueError(f'unsupported binary L2 version {version}')
+            if (pprec, qprec) != (DECIMAL_PRECISION_PRICE, DECIMAL_PRECISION_QTY):
+                raise ValueError(f'file precision ({pprec}, {qprec}) does not match decimal precision '
+                                 f'({DECIMAL_PRECISION_PRICE}, {DECIMAL_PRECISION_QTY})')
+        except BaseException:
+            self.close()
+            raise
+
+        self._start = FILE_HEADER.size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, a, b, c):
+        self.close()
+
+    def __len__(self) -> int:
+        '''Number of updates in the file (not counting the snapshot).'''
+
+        return self._records - int(self.snapshot() is not None)
+
+    def snapshot(self) -> Optional[dict]:
+        '''The snapshot of the file, None if it does not start with one.'''
+
+        if self._records == 0: return None
+        kind, record, _ = self._record(self._start)
+        return record if kind == KIND_SNAPSHOT else None
+
+    def __iter__(self) -> Iterator[dict]:
+        offset = self._start
+        for _ in range(self._records):
+            kind, record, offset = self._record(offset)
+            if kind == KIND_UPDATE: yield record
+
+    def close(self) -> None:
+        '''Close the file, it is unmapped once the views previously returned are garbage collected.'''
+
+        if self._view is not None: self._view.release()
+        self._view = None
+        if self._mmap is not None:
+            try: self._mmap.close()
+            except BufferError: pass # views still alive, the mapping is released with them
+        self._file.close()
+
+    def _record(self, offset: int) -> tuple[int, dict, int]:
+        '''Decode the record at `offset`, returns (kind, record, offset of the next record).'''
+
+        view = self._view
+        if view is None: raise ValueError('the L2 file is closed')
+
+        t, kind, nbids, nasks = RECORD_HEADER.unpack_from(view, offset)
+
+        start = offset + RECORD_HEADER.size
+        middle = start + nbids * LEVEL.size
+        end = middle + nasks * LEVEL.size
+
+        record = {'bids': LevelsView(view[start:middle]), 'asks': LevelsView(view[middle:end])}
+        if not math.isnan(t): record['timestamp'] = t
+        return kind, record, end
+
+def convert(path: str, updates: Iterable[dict], snapshot: Optional[dict] = None) -> int:
+    '''Write a snapshot and updates (as accepted by `Orderbook.from_snapshot` and `Orderbook.load_updates`) to a
+    binary L2 file, returns the number of records written.'''
+
+    with L2Writer(path) as writer:
+        if snapshot is not None: writer.write_snapshot(snapshot)
+        for update in updates: writer.write_update(update)
+        return len(writer)
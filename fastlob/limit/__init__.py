@@ -1,3 +1,4 @@
 '''A limit is a collection of limit orders sitting at a certain price.'''
 
 from .limit import Limit
+from .queue import OrderQueue
@@ -1,73 +1,102 @@
 '''A limit is a collection of limit orders sitting at a certain price.'''
 
+from typing import Optional, Iterator
 from decimal import Decimal
-from collections import deque
 
 from fastlob.order import Order
 from fastlob.enums import OrderStatus
-from fastlob.utils import zero
+from fastlob.utils import zero, fromticks_price, fromticks_quantity
+
+from .queue import OrderQueue
 
 class Limit:
-    '''A limit is a collection of limit orders sitting at a certain price.'''
+    '''
+    A limit is a collection of limit orders sitting at a certain price.
+
+    It can also hold external volume (the volume of the level set from market data, by L2 snapshots and updates),
+    which is an aggregate quantity sitting in the queue right behind the order `_external_after` (or at the front of
+    the queue if None), and is matched as if it was a single order at that position.
+    '''
 
-    _price: Decimal
-    _volume: Decimal
+    _price: Decimal | int
+    _volume: Decimal | int
     _valid_orders: int
-    _orderqueue: deque[Order]
-    _fakeorder: Order
+    _orderqueue: OrderQueue
+    _external: Decimal | int
+    _external_after: Optional[Order]
+    _ticks: bool
 
-    def __init__(self, price: Decimal):
+    def __init__(self, price: Decimal | int, ticks: bool = False):
         '''
         Args:
             price (num): The price at which the limit will sit.
+            ticks (bool, optional): If true, price and volume are integer ticks and lots. Defaults to False.
         '''
 
-        self._price        = price
-        self._volume       = zero()
-        self._valid_orders = 0
-        self._orderqueue   = deque()
-        self._fakeorder    = None
+        self._price          = price
+        self._volume         = 0 if ticks else zero()
+        self._valid_orders   = 0
+        self._orderqueue     = OrderQueue()
+        self._external       = self._volume
+        self._external_after = None
+        self._ticks          = ticks
 
-    def price(self) -> Decimal:
+    def price(self) -> Decimal | int:
         '''Getter for limit price.'''
 
         return self._price
 
-    def volume(self) -> Decimal:
+    def volume(self) -> Decimal | int:
         '''Getter for limit volume (sum of orders quantity).'''
 
         return self._volume
 
-    def notional(self) -> Decimal:
-        '''Notional = limit price * limit volume.'''
+    def notional(self) -> Decimal | int:
+        '''Notional = limit price * limit volume (in ticks * lots in ticks mode).'''
 
         return self.price() * self.volume()
 
     def valid_orders(self) -> int:
-        '''Getter for limit size (number of orders).'''
+        '''Getter for limit size (number of orders, the external volume counting as one).'''
 
-        return self._valid_orders
+        return self._valid_orders + int(self.external_exists())
 
     def real_orders(self) -> int:
-        '''Getter for number of orders placed by the user = (valid_orders - 1 if limit has a fake order).'''
+        '''Getter for number of orders placed by the user = (valid_orders - 1 if limit has external volume).'''
 
-        return self.valid_orders() - int(self.fakeorder_exists())
+        return self._valid_orders
 
     def empty(self) -> bool:
-        '''Check if limit contains zero **valid** orders, not if the limit queue is empty.'''
+        '''Check if limit contains zero **valid** orders.'''
 
         return self.valid_orders() == 0
 
     def deepempty(self):
         '''Check if limit contains zero orders.'''
 
-        return len(self._orderqueue) == 0
+        return len(self._orderqueue) == 0 and not self.external_exists()
 
     def next_order(self) -> Order:
-        '''Returns the next order to be matched by an incoming market order.'''
+        '''Returns the next (user) order in the queue, not taking the external volume into account.'''
+
+        return self._orderqueue.peek()
+
+    def orders(self) -> Iterator[Order]:
+        '''Iterate over the (user) orders of the limit, in priority order.'''
+
+        return iter(self._orderqueue)
 
-        self._prune_canceled()
-        return self._orderqueue[0]
+    def next_maker(self) -> Optional[Order]:
+        '''Returns the next order to be matched by an incoming market order, None if it is the external volume.'''
+
+        if self._external_first(): return None
+        return self._orderqueue.peek()
+
+    def next_quantity(self) -> Decimal | int:
+        '''Quantity of the next order (or external volume) to be matched by an incoming market order.'''
+
+        if self._external_first(): return self._external
+        return self._orderqueue.peek().quantity()
 
     def enqueue(self, order: Order):
         '''Add (enqueue) an order to the limit order queue.'''
@@ -77,75 +106,112 @@ class Limit:
         self._volume += order.quantity()
         self._valid_orders += 1
 
-    def fill_next(self, quantity: Decimal):
-        '''**Partially** fill the next order in the queue. Filling it entirely would lead to problems, to only use in 
-        last stage of order execution (`engine._partial_fill_order`).
+    def fill_next(self, quantity: Decimal | int):
+        '''**Partially** fill the next order (or external volume) in the queue. Filling it entirely would lead to 
+        problems, to only use in last stage of order execution (`engine.fill_last_order`).
         '''
 
-        order = self.next_order()
-        order.fill(quantity)
+        if self._external_first(): self._external -= quantity
+        else: self.next_order().fill(quantity)
         self._volume -= quantity
 
+    def pop_next(self) -> Optional[Order]:
+        '''Entirely fill and remove the next order (or external volume) in the queue. Returns the filled order, None if
+        it was the external volume.'''
+
+        if self._external_first():
+            self._volume -= self._external
+            self._external = 0 if self._ticks else zero()
+            return None
+
+        order = self.next_order()
+        self.pop_next_order()
+        order.fill(order.quantity()) # once out of the queue, so that the limit volume is updated properly
+        return order
+
     def fill_all(self):
-        '''Fill all orders in limit.'''
+        '''Fill all orders in limit, and its external volume.'''
 
-        while self.valid_orders() > 0:
-            order = self.next_order()
-            order.fill(order.quantity())
-            self.pop_next_order()
+        while self.valid_orders() > 0: self.pop_next()
 
     def pop_next_order(self) -> None:
         '''Pop from the queue the next order to be executed. Does not return it, only removes it.'''
 
-        self._prune_canceled()
         order = self._orderqueue.popleft()
+        if order is self._external_after: self._external_after = None
         self._valid_orders -= 1
         self._volume -= order.quantity()
 
-    def update_order(self, order: Order, new_qty: Decimal) -> None:
+    def update_order(self, order: Order, new_qty: Decimal | int) -> None:
         '''Update an order.'''
         diff = new_qty - order.quantity()
         self._volume += diff
         order.update(new_qty)
 
     def cancel_order(self, order: Order) -> None:
-        '''Cancel an order.'''
+        '''Cancel an order, it is unlinked from the queue in O(1).'''
 
+        if order is self._external_after: self._external_after = order._prev
+        self._orderqueue.remove(order)
         self._volume -= order.quantity()
         self._valid_orders -= 1
         order.set_status(OrderStatus.CANCELED)
 
-    def _prune_canceled(self) -> None:
-        '''Pop the next order while it is a canceled one.'''
-
-        while not self.deepempty() and self._orderqueue[0].status() == OrderStatus.CANCELED:
-            self._orderqueue.popleft()
-
     def view(self) -> str:
         '''Returns a pretty-print view of the limit.'''
 
-        return f'{self.price()} | {self.real_orders():03d} | {self.volume():0>8f} | {self.notional()}'
+        price, volume = self.price(), self.volume()
+        if isinstance(price, int): price = fromticks_price(price)
+        if isinstance(volume, int): volume = fromticks_quantity(volume)
+
+        return f'{price} | {self.real_orders():03d} | {volume:0>8f} | {price * volume}'
 
     def __repr__(self) -> str:
         return f'Limit(price={self.price()}, n_orders={self.valid_orders()}, notional={self.notional()})'
 
-    #### RELATED TO FAKE ORDERS
+    #### RELATED TO EXTERNAL VOLUME
+
+    def external_volume(self) -> Decimal | int:
+        '''Getter for the external volume of the limit.'''
+
+        return self._external
+
+    def external_exists(self) -> bool:
+        '''True if limit has (non-zero) external volume.'''
+
+        return self._external > 0
+
+    def set_external(self, volume: Decimal | int) -> None:
+        '''Overwrite the external volume, a volume of 0 removes it. As for an order being replaced, it loses its 
+        priority and goes to the back of the queue.'''
+
+        self._volume += volume - self._external
+        self._external = volume
+        self._external_after = self._orderqueue.tail() if volume else None
+
+    def external_ahead(self) -> int:
+        '''Number of orders queued ahead of the external volume.'''
+
+        if self._external_after is None: return 0
 
-    def fakeorder_exists(self) -> bool:
-        '''True if limit contains a fake order.'''
+        for i, order in enumerate(self._orderqueue, start=1):
+            if order is self._external_after: return i
+        return len(self._orderqueue)
 
-        return self._fakeorder is not None
+    def restore(self, orders: list[Order], external: Decimal | int, ahead: int) -> None:
+        '''Fill an empty limit back from its saved state: the queued `orders` (their status is kept), and the 
+        `external` volume queued behind the first `ahead` of them.'''
 
-    def set_fakeorder(self, order: Order) -> None:
-        '''Set `order` as the new limit fake order. This method first deletes the previous order.'''
+        for order in orders:
+            self._orderqueue.append(order)
+            self._volume += order.quantity()
 
-        self.delete_fakeorder()
-        self._fakeorder = order
-        self.enqueue(self._fakeorder)
+        self._valid_orders   = len(orders)
+        self._volume        += external
+        self._external       = external
+        self._external_after = orders[ahead - 1] if ahead > 0 and external else None
 
-    def delete_fakeorder(self) -> None:
-        '''Deletes the current fake order, if fake order is not set, it does nothing.'''
+    def _external_first(self) -> bool:
+        '''True if the external volume is the next to be matched.'''
 
-        if self._fakeorder is None: return
-        self.cancel_order(self._fakeorder)
-        self._fakeorder = None
+        return self._external_after is None and self._external > 0
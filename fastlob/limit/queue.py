@@ -0,0 +1,73 @@
+'''An intrusive doubly-linked FIFO queue of orders, used by limits.'''
+
+from typing import Optional, Iterator
+
+from fastlob.order import Order
+
+class OrderQueue:
+    '''
+    FIFO queue of orders where the links are stored in the orders themselves (`_prev` and `_next`), so that any order
+    can be unlinked in O(1) when it is canceled, instead of being left in the queue as a dead entry.
+    '''
+
+    _head: Optional[Order]
+    _tail: Optional[Order]
+    _size: int
+
+    def __init__(self):
+        self._head = None
+        self._tail = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Order]:
+        order = self._head
+        while order is not None:
+            yield order
+            order = order._next
+
+    def peek(self) -> Order:
+        '''Get the first order of the queue, raise `IndexError` if queue is empty.'''
+
+        if self._head is None: raise IndexError('peek from an empty queue')
+        return self._head
+
+    def tail(self) -> Optional[Order]:
+        '''Get the last order of the queue, None if queue is empty.'''
+
+        return self._tail
+
+    def append(self, order: Order) -> None:
+        '''Add an order at the end of the queue.'''
+
+        order._prev = self._tail
+        order._next = None
+
+        if self._tail is None: self._head = order
+        else: self._tail._next = order
+
+        self._tail = order
+        self._size += 1
+
+    def popleft(self) -> Order:
+        '''Remove and return the first order of the queue, raise `IndexError` if queue is empty.'''
+
+        order = self.peek()
+        self.remove(order)
+        return order
+
+    def remove(self, order: Order) -> None:
+        '''Unlink an order from the queue, the order must be in the queue.'''
+
+        prev, nxt = order._prev, order._next
+
+        if prev is None: self._head = nxt
+        else: prev._next = nxt
+
+        if nxt is None: self._tail = prev
+        else: nxt._prev = prev
+
+        order._prev = order._next = None
+        self._size -= 1
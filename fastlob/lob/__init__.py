@@ -1,3 +1,6 @@
 '''Main module containing the Orderbook class.'''
 
 from .orderbook import Orderbook
+from .diff import L2Diff
+from .view import BookView
+from .profiler import Profiler
@@ -0,0 +1,176 @@
+'''
+Binary checkpoints of the complete state of a lob. All integers are little-endian, prices and quantities are stored 
+as integer ticks and lots, and every table is written column by column.
+
+    header   : magic (4s) | version (u16) | price precision (u8) | quantity precision (u8) | flags (u8) | padding (3x)
+               | ladder lowest (i64) | ladder highest (i64) | next sequential id (i64, -1 if none) | compact at (i64)
+               | sequence number of the last journaled command applied (i64) | simulated clock time (f64, nan if the 
+               lob uses a wall clock)
+    name     : length (u16) | utf-8 bytes
+    orders   : the orders of `Orderbook._orders`, as an `OrderStore` (in insertion order)
+    history  : the compacted history `OrderStore`, only if the lob compacts its history
+    sides    : asks then bids, as the columns of their limits (best first): price, external volume, number of orders 
+               queued ahead of the external volume, number of orders; followed by the index (in the orders table) of 
+               each queued order, in priority order
+'''
+
+import os
+import math
+import struct
+import tempfile
+from array import array
+from typing import Optional, BinaryIO
+
+from fastlob.side import Side
+from fastlob.order import Order, OrderId, OrderStore, IdGenerator, SequentialIdGenerator
+from fastlob.enums import OrderType
+from fastlob.clock import Clock, SimulatedClock
+from fastlob.utils import todecimal_price, toticks_price, toticks_quantity, fromticks_price, fromticks_quantity, \
+    write_array, read_array
+from fastlob.consts import DECIMAL_PRECISION_PRICE, DECIMAL_PRECISION_QTY
+
+MAGIC = b'FLCK'
+VERSION = 2
+
+HEADER = struct.Struct('<4sHBBB3xqqqqqd')
+NAME = struct.Struct('<H')
+
+FLAG_TICKS = 1
+FLAG_LADDER = 2
+FLAG_DEPTH_INDEX = 4
+FLAG_COMPACT_HISTORY = 8
+FLAG_HOT = 16
+FLAG_SINGLE_WRITER = 32
+
+def save(lob, path: str) -> None:
+    '''
+    Write the complete state of `lob` to a checkpoint file, the sides must be locked by the caller. The checkpoint is 
+    written to a temporary file (in the same directory) which is synced and then renamed, so that `path` always holds 
+    a complete checkpoint, the previous one if the process dies while saving.
+    '''
+
+    ticks = lob._ticks
+    flags = FLAG_TICKS * ticks | FLAG_DEPTH_INDEX * lob._askside.depth_index() | FLAG_HOT * lob._hot \
+        | FLAG_COMPACT_HISTORY * (lob._history is not None) | FLAG_LADDER * (lob._ladder is not None) \
+        | FLAG_SINGLE_WRITER * lob._single_writer
+
+    lo, hi = (0, 0) if lob._ladder is None else (toticks_price(todecimal_price(p)) for p in lob._ladder)
+    nextid = lob._idgen.peek() if isinstance(lob._idgen, SequentialIdGenerator) else -1
+
+    orders = OrderStore()
+    handles = {orderid: orders.append(order, ticks) for orderid, order in lob._orders.items()}
+
+    now = lob._clock.now() if lob._clock.simulated() else math.nan
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix='.' + os.path.basename(path), suffix='.tmp', dir=directory)
+
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, VERSION, DECIMAL_PRECISION_PRICE, DECIMAL_PRECISION_QTY, flags, lo, hi,
+                                   nextid, lob._compact_at, lob._seq, now))
+
+            name = lob._name.encode()
+            file.write(NAME.pack(len(name)))
+            file.write(name)
+
+            orders.dump(file)
+            if lob._history is not None: lob._history.dump(file)
+
+            for side in (lob._askside, lob._bidside): _save_side(file, side, handles, ticks)
+
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp): os.remove(tmp)
+        raise
+
+    _fsync_directory(directory) # make the rename itself durable
+
+def load(cls: type, path: str, name: Optional[str] = None, start: Optional[bool] = False, clock: Optional[Clock] = None,
+         ids: Optional[IdGenerator] = None):
+    '''Create a new lob (of class `cls`) from a checkpoint file written by `save`.'''
+
+    with open(path, 'rb') as file:
+        header = file.read(HEADER.size)
+        if len(header) < HEADER.size: raise ValueError(f'{path} is not a checkpoint file')
+        magic, version, pprec, qprec, flags, lo, hi, nextid, compact_at, seq, now = HEADER.unpack(header)
+
+        if magic != MAGIC: raise ValueError(f'{path} is not a checkpoint file')
+        if version != VERSION: raise ValueError(f'unsupported checkpoint version {version}')
+        if (pprec, qprec) != (DECIMAL_PRECISION_PRICE, DECIMAL_PRECISION_QTY):
+            raise ValueError(f'checkpoint precision ({pprec}, {qprec}) does not match decimal precision '
+                             f'({DECIMAL_PRECISION_PRICE}, {DECIMAL_PRECISION_QTY})')
+
+        if ids is None:
+            if nextid < 0: raise ValueError('the checkpointed lob does not use sequential ids, `ids` must be provided')
+            ids = SequentialIdGenerator(nextid)
+
+        if clock is None and not math.isnan(now): clock = SimulatedClock(now)
+
+        size, = NAME.unpack(file.read(NAME.size))
+        saved_name = file.read(size).decode()
+
+        ticks = bool(flags & FLAG_TICKS)
+        ladder = (fromticks_price(lo), fromticks_price(hi)) if flags & FLAG_LADDER else None
+
+        lob = cls(saved_name if name is None else name, start=False, ticks=ticks, ladder=ladder,
+                  compact_history=bool(flags & FLAG_COMPACT_HISTORY), ids=ids, hot=bool(flags & FLAG_HOT),
+                  depth_index=bool(flags & FLAG_DEPTH_INDEX), clock=clock,
+                  single_writer=bool(flags & FLAG_SINGLE_WRITER))
+
+        orders = OrderStore.load(file).orders(ticks)
+        lob._orders = {order.id(): order for order in orders}
+        lob._compact_at = compact_at
+        lob._seq = seq
+        if lob._history is not None: lob._history = OrderStore.load(file)
+
+        for side in (lob._askside, lob._bidside): _load_side(file, side, orders, ticks)
+
+    for order in orders:
+        if order.otype() == OrderType.GTD and order.valid(): lob._expiries.schedule(order)
+    if lob._single_writer and not lob._clock.simulated(): lob._inline_expiry = len(lob._expiries) > 0
+
+    lob._logger.info('checkpoint loaded successfully')
+
+    if start: lob.start()
+    return lob
+
+def _fsync_directory(directory: str) -> None:
+    if not hasattr(os, 'O_DIRECTORY'): return # e.g. windows, where directories can not be opened
+
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try: os.fsync(fd)
+    finally: os.close(fd)
+
+def _save_side(file: BinaryIO, side: Side, handles: dict[OrderId, int], ticks: bool) -> None:
+    prices, externals, aheads, counts, queue = array('q'), array('q'), array('q'), array('q'), array('q')
+
+    for lim in side.limits():
+        price, external = lim.price(), lim.external_volume()
+        if not ticks: price, external = toticks_price(price), toticks_quantity(external)
+
+        prices.append(price)
+        externals.append(external)
+        aheads.append(lim.external_ahead())
+        counts.append(lim.real_orders())
+        queue.extend(handles[order.id()] for order in lim.orders())
+
+    for column in (prices, externals, aheads, counts, queue): write_array(file, column)
+
+def _load_side(file: BinaryIO, side: Side, orders: list[Order], ticks: bool) -> None:
+    prices, externals, aheads, counts = (read_array(file, 'q').tolist() for _ in range(4))
+    queue = read_array(file, 'q').tolist()
+
+    if not ticks:
+        prices = [fromticks_price(p) for p in prices]
+        externals = [fromticks_quantity(v) for v in externals]
+
+    offset = 0
+    for price, external, ahead, count in zip(prices, externals, aheads, counts):
+        side.restore_limit(price, [orders[i] for i in queue[offset:offset + count]], external, ahead)
+        offset += count
+
+    side.refresh_top()
@@ -0,0 +1,45 @@
+'''Incremental L2 updates published by the lob.'''
+
+from decimal import Decimal
+
+class L2Diff:
+    '''
+    The price levels that changed during one operation of the lob (processing, update or cancellation of an order, 
+    L2 updates, or GTD orders expiring), as (price, volume, #orders) triplets with the best levels first. A level 
+    with a volume of 0 was removed.
+
+    Diffs are numbered with consecutive sequence numbers, so that a consumer applying them to a mirror of the book 
+    can detect if it missed one.
+    '''
+
+    __slots__ = ('_seq', '_bids', '_asks')
+
+    _seq: int
+    _bids: list[tuple[Decimal, Decimal, int]]
+    _asks: list[tuple[Decimal, Decimal, int]]
+
+    def __init__(self, seq: int, bids: list[tuple[Decimal, Decimal, int]], asks: list[tuple[Decimal, Decimal, int]]):
+        self._seq  = seq
+        self._bids = bids
+        self._asks = asks
+
+    def seq(self) -> int:
+        '''Getter for the sequence number of the diff.'''
+
+        return self._seq
+
+    def bids(self) -> list[tuple[Decimal, Decimal, int]]:
+        '''The bid levels that changed.'''
+
+        return self._bids
+
+    def asks(self) -> list[tuple[Decimal, Decimal, int]]:
+        '''The ask levels that changed.'''
+
+        return self._asks
+
+    def __len__(self) -> int:
+        return len(self._bids) + len(self._asks)
+
+    def __repr__(self) -> str:
+        return f'L2Diff(seq={self._seq}, bids={self._bids}, asks={self._asks})'
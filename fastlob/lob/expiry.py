@@ -0,0 +1,98 @@
+'''Scheduler responsible for canceling GTD orders when they expire.'''
+
+import heapq
+import itertools
+import threading
+from typing import Callable, Optional
+
+from fastlob.order import Order
+from fastlob.clock import Clock
+
+class ExpiryScheduler:
+    '''
+    Min-heap of (expiry, order) entries, served by a background thread that sleeps on a condition variable until the
+    next deadline (or until an earlier one is scheduled), instead of polling. All the orders due at once are handed
+    over in bulk to the `expire` callback.
+
+    Orders that are filled or canceled before their expiry are not removed from the heap, they are simply skipped by
+    the callback when they come due.
+
+    With a simulated clock, the thread is not used: the owner calls `pop_due` itself as it advances the clock.
+    '''
+
+    _heap: list[tuple[float, int, Order]]
+    _seq: itertools.count
+    _cond: threading.Condition
+    _running: bool
+    _thread: Optional[threading.Thread]
+    _expire: Callable[[list[Order]], None]
+    _clock: Clock
+
+    def __init__(self, expire: Callable[[list[Order]], None], clock: Clock):
+        '''
+        Args:
+            expire (Callable[[list[Order]], None]): Called (from the scheduler thread) with the orders that expired.
+            clock (Clock): The clock giving the current time.
+        '''
+
+        self._heap    = list()
+        self._seq     = itertools.count() # tie-breaker, orders themselves are not comparable
+        self._cond    = threading.Condition()
+        self._running = False
+        self._thread  = None
+        self._expire  = expire
+        self._clock   = clock
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def start(self) -> None:
+        '''Start the background thread.'''
+
+        with self._cond:
+            if self._running: return
+            self._running = True
+
+        self._thread = threading.Thread(target=self._run, name='fastlob-gtd-expiry')
+        self._thread.start()
+
+    def stop(self) -> None:
+        '''Stop the background thread, pending orders are kept and served again once restarted.'''
+
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+
+        if self._thread is not None and self._thread is not threading.current_thread(): self._thread.join()
+        self._thread = None
+
+    def schedule(self, order: Order) -> None:
+        '''Schedule the expiration of a GTD order.'''
+
+        if (expiry := order.expiry()) is None: raise ValueError(f'order [{order.id()}] has no expiry')
+
+        with self._cond:
+            heapq.heappush(self._heap, (expiry, next(self._seq), order))
+            # only wake the thread up if its deadline changed
+            if self._heap[0][2] is order: self._cond.notify()
+
+    def pop_due(self, now: float) -> list[Order]:
+        '''Remove and return the orders whose expiry is <= `now`.'''
+
+        due = list()
+        with self._cond:
+            heap = self._heap
+            while heap and heap[0][0] <= now: due.append(heapq.heappop(heap)[2])
+        return due
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._running and (not self._heap or self._heap[0][0] > self._clock.now()):
+                    timeout = self._heap[0][0] - self._clock.now() if self._heap else None
+                    self._cond.wait(timeout)
+
+                if not self._running: return
+
+            due = self.pop_due(self._clock.now())
+            if due: self._expire(due)
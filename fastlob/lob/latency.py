@@ -0,0 +1,125 @@
+'''Fixed-memory latency histograms of the operations of the lob.'''
+
+from array import array
+
+from fastlob.enums import ResultType
+
+SUB_BUCKETS_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKETS_BITS
+N_BUCKETS = (64 - SUB_BUCKETS_BITS) * SUB_BUCKETS + 2 * SUB_BUCKETS
+PERCENTILES = (50, 90, 99, 99.9)
+
+def bucket(ns: int) -> int:
+    '''Index of the bucket of a duration (in ns): durations under 2 * SUB_BUCKETS have their own bucket, the others
+    share a bucket with the durations within 1 / SUB_BUCKETS of them (relative).'''
+
+    shift = ns.bit_length() - SUB_BUCKETS_BITS - 1
+    if shift <= 0: return ns
+    return (shift << SUB_BUCKETS_BITS) + (ns >> shift)
+
+def bucket_value(index: int) -> int:
+    '''Highest duration (in ns) of a bucket.'''
+
+    if index < 2 * SUB_BUCKETS: return index
+    shift = (index >> SUB_BUCKETS_BITS) - 1
+    return ((index - (shift << SUB_BUCKETS_BITS) + 1) << shift) - 1
+
+class LatencyHistogram:
+    '''
+    Histogram of durations in nanoseconds, with logarithmic buckets (each power of 2 being split in SUB_BUCKETS
+    linear buckets), so that percentiles are reported within 1 / SUB_BUCKETS (6.25%) of their exact value whatever
+    their magnitude, with a fixed memory (N_BUCKETS counters). The count, total and maximum are exact.
+    '''
+
+    __slots__ = ('_counts', '_count', '_total', '_max')
+
+    _counts: array
+    _count: int
+    _total: int
+    _max: int
+
+    def __init__(self):
+        self._counts = array('Q', bytes(8 * N_BUCKETS))
+        self._count  = 0
+        self._total  = 0
+        self._max    = 0
+
+    def record(self, ns: int) -> None:
+        '''Record a duration, in ns.'''
+
+        shift = ns.bit_length() - SUB_BUCKETS_BITS - 1
+        self._counts[ns if shift <= 0 else (shift << SUB_BUCKETS_BITS) + (ns >> shift)] += 1 # inlined `bucket`
+        self._count += 1
+        self._total += ns
+        if ns > self._max: self._max = ns
+
+    def count(self) -> int:
+        '''Number of durations recorded.'''
+
+        return self._count
+
+    def max(self) -> int:
+        '''Longest duration recorded (0 if none).'''
+
+        return self._max
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        '''Add the durations recorded by `other` to the histogram.'''
+
+        counts = self._counts
+        for i, n in enumerate(other._counts):
+            if n: counts[i] += n
+        self._count += other._count
+        self._total += other._total
+        self._max = max(self._max, other._max)
+
+    def percentile(self, q: float) -> int:
+        '''Duration (in ns) under which `q`% of the durations are (the maximum for the last bucket).'''
+
+        if not self._count: return 0
+
+        rank, seen = max(1, round(q / 100 * self._count)), 0
+        for i, n in enumerate(self._counts):
+            seen += n
+            if seen >= rank: return min(bucket_value(i), self._max)
+        return self._max
+
+    def summary(self) -> dict[str, int | float]:
+        '''The count, mean, percentiles (50, 90, 99 and 99.9) and maximum of the durations, in ns.'''
+
+        summary = {'count': self._count, 'mean': self._total / self._count if self._count else 0.0}
+        for q in PERCENTILES: summary[f'p{q:g}'] = self.percentile(q)
+        summary['max'] = self._max
+        return summary
+
+class LatencyRecorder:
+    '''The latency histograms of a lob: one per kind of result of processed orders, and one per other operation
+    (`cancel`, `update` and `step_updates`).'''
+
+    __slots__ = ('process', 'cancel', 'update', 'step_updates')
+
+    process: dict[ResultType, LatencyHistogram]
+    cancel: LatencyHistogram
+    update: LatencyHistogram
+    step_updates: LatencyHistogram
+
+    def __init__(self):
+        self.process = {kind: LatencyHistogram() for kind in
+                        (ResultType.LIMIT, ResultType.MARKET, ResultType.PARTIAL_MARKET, ResultType.ERROR)}
+        self.cancel       = LatencyHistogram()
+        self.update       = LatencyHistogram()
+        self.step_updates = LatencyHistogram()
+
+    def stats(self) -> dict[str, dict]:
+        '''Summaries of the histograms (see `LatencyHistogram.summary`), the one of `process` covering all the
+        orders, with the ones of each kind of result in its "by_kind" entry.'''
+
+        process = LatencyHistogram()
+        for histogram in self.process.values(): process.merge(histogram)
+
+        summary: dict = process.summary()
+        summary['by_kind'] = {kind.name: histogram.summary() for kind, histogram in self.process.items()}
+
+        stats = {'process': summary}
+        for name in ('cancel', 'update', 'step_updates'): stats[name] = getattr(self, name).summary()
+        return stats
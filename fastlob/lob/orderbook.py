@@ -4,21 +4,32 @@ import io
 import time
 import logging
 import threading
+import itertools
 from decimal import Decimal
-from typing import Optional, Iterable
+from typing import Optional, Iterable, Callable
 from numbers import Number
-from sortedcontainers import SortedDict
 from termcolor import colored
 
 from fastlob import engine
 from fastlob.side import AskSide, BidSide
-from fastlob.order import OrderParams, Order, AskOrder, BidOrder
-from fastlob.enums import OrderSide, OrderStatus, OrderType
-from fastlob.result import ResultBuilder, ExecutionResult
-from fastlob.utils import time_asint, todecimal_quantity
+from fastlob.side.locks import make_lock
+from fastlob.order import OrderParams, Order, AskOrder, BidOrder, OrderStore, OrderId, IdGenerator, \
+    SequentialIdGenerator
+from fastlob.enums import OrderSide, OrderStatus, OrderType, ResultCode
+from fastlob.result import ResultBuilder, ExecutionResult, Fill
+from fastlob.clock import Clock, WallClock
+from fastlob.journal import Journal, read_journal, KIND_PROCESS, KIND_CANCEL, KIND_UPDATE, KIND_STEP, KIND_ADVANCE
+from fastlob.utils import todecimal_price, todecimal_quantity, toticks_price, toticks_quantity, \
+    fromticks_price, fromticks_quantity
 from fastlob.consts import * 
 
-from .utils import not_running_error, check_limit_order
+from .utils import not_running_error, check_limit_order, report, NullLogger
+from .expiry import ExpiryScheduler
+from .diff import L2Diff
+from .view import BookView
+from .latency import LatencyRecorder
+from .profiler import Profiler
+from . import checkpoint
 
 class Orderbook:
     '''
@@ -33,41 +44,146 @@ class Orderbook:
     _name: str
     _askside: AskSide
     _bidside: BidSide
-    _orders: dict[str, Order]
-    _expirymap: SortedDict
-    _start_time: int
+    _orders: dict[OrderId, Order]
+    _expiries: ExpiryScheduler
+    _clock: Clock
+    _start_time: Optional[float]
     _alive: bool
     _logger: logging.Logger
     _updates: Iterable[dict]
-
-    def __init__(self, name: Optional[str] = 'LOB-1', start: Optional[bool] = False):
+    _ticks: bool
+    _ladder: Optional[tuple[Number, Number]]
+    _history: Optional[OrderStore]
+    _compact_at: int
+    _idgen: IdGenerator
+    _hot: bool
+    _journal: Optional[Journal]
+    _seq: int
+    _subscribers: list[Callable[[L2Diff], None]]
+    _diff_seq: int
+    _diff_lock: threading.RLock
+    _fill_subscribers: list[Callable[[list[Fill]], None]]
+    _fill_seq: int
+    _fill_lock: threading.Lock
+    _single_writer: bool
+    _check_affinity: bool
+    _inline_expiry: bool
+    # ^ True if GTD orders expiring on the wall clock are canceled by the writer thread instead of a background thread
+    # (single-writer mode) and some are scheduled, so that nothing is checked per command otherwise
+    _writers: list[None]
+    # ^ one entry per operation modifying the sides in progress, so that readers of `book_view` know the state of
+    # the book is being changed (appending and popping are atomic, whatever the number of writers)
+    _versions: itertools.count
+    _version: int
+    # ^ a new version is drawn (atomically) at the end of each operation modifying the sides, before it leaves
+    # `_writers`, so that the version changes if a reader overlaps with an operation
+    _cached_view: Optional[tuple[int, int, BookView]]
+    # ^ the last (version, n, view) built by `book_view`, shared by the readers until the version changes
+    _latency: Optional[LatencyRecorder]
+    _profiler: Optional[Profiler]
+
+    def __init__(self, name: Optional[str] = 'LOB-1', start: Optional[bool] = False, ticks: bool = False,
+                 ladder: Optional[tuple[Number, Number]] = None, compact_history: bool = False,
+                 ids: Optional[IdGenerator] = None, hot: bool = False,
+                 depth_index: bool = False, clock: Optional[Clock] = None,
+                 journal: Optional[Journal] = None, single_writer: bool = False,
+                 check_affinity: bool = False, latency: bool = False):
         '''
         Args:
             name (str, optional): Name. Defaults to 'LOB-1'.
             start (bool, optional): Whether the LOB should be started after it's creation. Defaults to False.
+            ticks (bool, optional): Whether prices and quantities should be stored internally as integer ticks and 
+                lots (fixed-point mode). Decimals are then only used at the API boundary. Defaults to False.
+            ladder (tuple[Number, Number], optional): If set, the (lowest, highest) prices the book can trade at. 
+                Limits are then stored in a dense price ladder instead of a sorted dict. Requires `ticks`. 
+                Defaults to None.
+            compact_history (bool, optional): Whether orders that can not be matched anymore should be moved out of 
+                the orders history into a compact columnar store. Defaults to False.
+            ids (IdGenerator, optional): The strategy used to generate order identifiers. Defaults to sequential 
+                integers (`SequentialIdGenerator`).
+            hot (bool, optional): Whether the lob should run in "hot mode", where nothing is logged. Result messages 
+                are always stored as codes and only rendered when `ExecutionResult.messages` is called. 
+                Defaults to False.
+            depth_index (bool, optional): Whether each side should maintain a cumulative depth index, answering depth 
+                queries (`depth`, `volume_upto`, `price_to_fill`, `imbalance` and FOK checks) in logarithmic time 
+                instead of walking the limits. Defaults to False.
+            clock (Clock, optional): The source of time of the lob, used for GTD orders expiry. With a 
+                `SimulatedClock`, time only moves with `advance_to` (or the timestamps of updates), and GTD orders 
+                expire synchronously as it does. Defaults to the system clock (`WallClock`).
+            journal (Journal, optional): If set, every command received by the lob (orders, updates, cancellations,
+                L2 updates and clock moves) is appended to the journal before being applied, so that the state of the
+                lob can be rebuilt with `replay` (or `recover`). Defaults to None.
+            single_writer (bool, optional): Whether the lob is driven by exactly one thread. The sides then use no-op 
+                locks instead of mutexes, and GTD orders expiring on the wall clock are canceled by that thread at the 
+                start of the next command, instead of by a background thread. Defaults to False.
+            check_affinity (bool, optional): In single-writer mode, whether to check that the lob is always modified 
+                by the same thread (the first one to do it), a `RuntimeError` being raised otherwise. The check is 
+                skipped when Python runs with -O. Defaults to False.
+            latency (bool, optional): Whether to record the duration of each operation (`process`, `cancel`, 
+                `update` and `step_updates`) in latency histograms, see `stats`. Can be changed with 
+                `record_latency`. Defaults to False.
         '''
+
+        bounds = None
+        if ladder is not None:
+            lo, hi = (toticks_price(todecimal_price(p)) for p in ladder)
+            bounds = lo, hi
+
         self._name       = name
-        self._askside    = AskSide()
-        self._bidside    = BidSide()
+        self._ticks      = ticks
+        self._ladder     = ladder
+        self._askside    = AskSide(ticks, bounds, depth_index, single_writer, check_affinity)
+        self._bidside    = BidSide(ticks, bounds, depth_index, single_writer, check_affinity)
         self._orders     = dict()
-        self._expirymap  = SortedDict()
+        self._clock      = WallClock() if clock is None else clock
+        self._expiries   = ExpiryScheduler(self._cancel_expired_orders, self._clock)
         self._start_time = None
         self._alive      = False
         self._updates    = None
-
-        self._logger = logging.getLogger(f'[{name}]')
+        self._history    = OrderStore() if compact_history else None
+        self._compact_at = COMPACT_HISTORY_MIN
+        self._idgen      = SequentialIdGenerator() if ids is None else ids
+        self._journal    = journal
+        self._seq        = 0
+
+        self._subscribers = list()
+        self._diff_seq    = 0
+        self._diff_lock   = threading.RLock()
+
+        self._fill_subscribers = list()
+        self._fill_seq         = 0
+        self._fill_lock        = make_lock(single_writer)
+
+        self._single_writer  = single_writer
+        self._check_affinity = check_affinity
+        self._inline_expiry  = False
+
+        self._writers     = list()
+        self._versions    = itertools.count(1)
+        self._version     = 0
+        self._cached_view = None
+
+        self._latency = LatencyRecorder() if latency else None
+        self._profiler = None
+
+        self._hot    = hot
+        self._logger = NullLogger() if hot else logging.getLogger(f'[{name}]')
         self._logger.info('lob initialized, ready to be started using <ob.start>')
 
         if start: self.start()
 
     @staticmethod
-    def from_snapshot(snapshot: dict, name: Optional[str] = 'LOB', start: Optional[bool] = False):
+    def from_snapshot(snapshot: dict, name: Optional[str] = 'LOB', start: Optional[bool] = False,
+                      ticks: bool = False, ladder: Optional[tuple[Number, Number]] = None,
+                      depth_index: bool = False, clock: Optional[Clock] = None):
         '''
         Instantiate a new LOB from a given snapshot. A "snapshot" is a dictionary of the following 
-        form `{"bids": <list_of_(price, volume)_pairs>, "asks": <list_of_(price, volume)_pairs>}`.
+        form `{"bids": <list_of_(price, volume)_pairs>, "asks": <list_of_(price, volume)_pairs>}`. Each side may 
+        also be given as a numpy array of shape (n, 2) or a (prices, volumes) tuple of numpy arrays, in which case the 
+        levels are validated and rounded to ticks in bulk.
 
-        It does so by placing a "fake" order. These orders are also not added to the history. 
-        They are simply added to each price level.
+        The volume of each level is set as external volume of the limit (it is not an order, and is not added 
+        to the history), matched as if it was one order queued at the level.
 
         Returns:
             Orderbook: A new LOB initialized with `snapshot`.
@@ -79,7 +195,7 @@ class Orderbook:
         if not isinstance(snapshot['bids'], Iterable) or not isinstance(snapshot['asks'], Iterable):
             raise ValueError('snapshot[bids|asks] must be an iterable of (price, volume) pairs')
 
-        lob = Orderbook(name=name, start=False)
+        lob = Orderbook(name=name, start=False, ticks=ticks, ladder=ladder, depth_index=depth_index, clock=clock)
 
         asks, bids = snapshot['asks'], snapshot['bids']
 
@@ -91,18 +207,51 @@ class Orderbook:
         if start: lob.start()
         return lob
 
+    def save_checkpoint(self, path: str) -> None:
+        '''
+        Save the complete state of the lob (resting orders and their priority in each limit, partial fills, external 
+        volumes, orders history, GTD expiries and the time of a simulated clock) to a compact binary file, to 
+        restore with `load_checkpoint`. The file is replaced atomically, a crash while saving leaves the previous 
+        checkpoint intact.
+
+        Args:
+            path (str): The file to write.
+        '''
+
+        with self._askside.lock(), self._bidside.lock(): checkpoint.save(self, path)
+        self._logger.info('checkpoint saved to %s', path)
+
+    @staticmethod
+    def load_checkpoint(path: str, name: Optional[str] = None, start: Optional[bool] = False,
+                        clock: Optional[Clock] = None, ids: Optional[IdGenerator] = None):
+        '''
+        Instantiate a new LOB from a checkpoint file written by `save_checkpoint`. The lob is configured as the one 
+        that was saved (ticks, ladder, depth index, history compaction, hot mode).
+
+        Args:
+            path (str): The file to read.
+            name (str, optional): Name of the new lob. Defaults to the name of the saved lob.
+            start (bool, optional): Whether the LOB should be started. Defaults to False.
+            clock (Clock, optional): The clock of the new lob. Defaults to a `SimulatedClock` at the saved time if 
+                the saved lob used a simulated clock, to the system clock (`WallClock`) otherwise.
+            ids (IdGenerator, optional): The order identifiers generator of the new lob, required if the saved lob 
+                did not use sequential ids (which are otherwise resumed where they stopped).
+
+        Returns:
+            Orderbook: A new LOB in the state that was saved.
+        '''
+
+        return checkpoint.load(Orderbook, path, name, start, clock, ids)
+
     def start(self) -> None:
         '''Start the lob. Required before orders can be placed.'''
 
-        def clean_expired_orders():
-            while self._alive:
-                self._cancel_expired_orders()
-                time.sleep(0.1) # what value to set here ? maybe it should depend on the size of the book
-
         self._alive = True
-        self._start_time = time_asint()
-        self._logger.info('starting background GTD orders manager..')
-        threading.Thread(target=clean_expired_orders).start()
+        self._start_time = self._clock.now()
+
+        if not self._clock.simulated() and not self._single_writer:
+            self._logger.info('starting background GTD orders manager..')
+            self._expiries.start()
         self._logger.info('lob started properly, ready to receive orders')
 
     def stop(self) -> None:
@@ -114,6 +263,8 @@ class Orderbook:
 
         self._alive = False
         self._start_time = None
+        self._expiries.stop()
+        if self._journal is not None: self._journal.sync()
         self._logger.info('lob stopped properly')
 
     def reset(self) -> None:
@@ -123,10 +274,17 @@ class Orderbook:
             self._logger.error('lob must be stopped (using <ob.stop>) before reset can be called')
             return
 
-        self.__init__(self._name)
+        self.__init__(self._name, ticks=self._ticks, ladder=self._ladder, compact_history=self._history is not None,
+                      ids=self._idgen, hot=self._hot, depth_index=self._askside.depth_index(),
+                      clock=self._clock, journal=self._journal, single_writer=self._single_writer,
+                      check_affinity=self._check_affinity, latency=self._latency is not None)
 
     def is_running(self) -> bool: return self._alive
 
+    def single_writer(self) -> bool: return self._single_writer
+
+    def clock(self) -> Clock: return self._clock
+
     # CONTEXT MANAGERS #########################################################
 
     def __enter__(self): 
@@ -167,7 +325,9 @@ class Orderbook:
 
         if not self._alive:
             return [not_running_error(self._logger).build() for _ in ordersparams]
-        return [self.process(params) for params in ordersparams]
+        results = (self.process(params) for params in ordersparams)
+        if self._profiler is not None: return self._profiled(list, results, 'process_many') # orders run in <list>
+        return list(results)
 
     def process(self, orderparams: OrderParams) -> ExecutionResult:
         '''Process one order params instance.
@@ -184,171 +344,227 @@ class Orderbook:
 
         if not isinstance(orderparams, OrderParams):
             result = ResultBuilder.new_error()
-            errmsg = 'orderparams is not an instance of fastlob.OrderParams'
-            result.add_message(errmsg); self._logger.error(errmsg)
+            report(self._logger, result, logging.ERROR, ResultCode.INVALID_PARAMS)
             return result.build()
 
-        #                                         (params const already checks that expiry is set)
-        if orderparams.otype == OrderType.GTD and orderparams.expiry <= (t := time_asint()):
-            result = ResultBuilder.new_error()
-            errmsg = f'GTD order must expire in the future (but {orderparams.expiry} <= {t})'
-            result.add_message(errmsg); self._logger.error(errmsg)
-            return result.build()
-
-        self._logger.info('processing order params')
+        if self._profiler is not None: return self._profiled(self._process_timed, orderparams, 'process')
+        return self._process_timed(orderparams)
 
-        match orderparams.side:
-            case OrderSide.BID:
-                order = BidOrder(orderparams)
-                result = self._process_bid_order(order)
+    def _process_timed(self, orderparams: OrderParams) -> ExecutionResult:
+        if self._latency is None: return self._process(orderparams, None)
 
-            case OrderSide.ASK:
-                order = AskOrder(orderparams)
-                result = self._process_ask_order(order)
-
-        if result.success():
-            self._logger.info('order [%s] was processed successfully', order.id())
-            self._save_order(order, result)
-
-        else: self._logger.warning('order was not successfully processed')
-
-        if order.status() == OrderStatus.PARTIAL:
-            msg = f'order [{order.id()}] partially filled by engine, {order.quantity()} placed at {order.price()}'
-            self._logger.info(msg)
-            result.add_message(msg)
-
-        return result.build()
+        t0 = time.perf_counter_ns()
+        result = self._process(orderparams, None)
+        self._latency.process[result.kind()].record(time.perf_counter_ns() - t0)
+        return result
 
-    def update(self, orderid: str, new_qty: Number) -> ExecutionResult:
+    def update(self, orderid: OrderId, new_qty: Number) -> ExecutionResult:
         '''Update the quantity of an order sitting in the lob, given its id.
 
         Args:
-            orderid (str): Identifier of the order to cancel.
+            orderid (OrderId): Identifier of the order to update.
             new_qty (Number): New quantity of the order. Must be > 0, otherwise you should call `lob.cancel` instead.
 
         Returns:
             ExecutionResult: The result of the update.
         '''
+
+        if self._latency is None: return self._update(orderid, new_qty)
+
+        t0 = time.perf_counter_ns()
+        result = self._update(orderid, new_qty)
+        self._latency.update.record(time.perf_counter_ns() - t0)
+        return result
+
+    def _update(self, orderid: OrderId, new_qty: Number) -> ExecutionResult:
         if not self._alive:
             return not_running_error(self._logger).build()
 
         self._logger.info('attempting to update order with id [%s] with new qty [%f]', orderid, new_qty)
+        if self._inline_expiry: self._expire_due()
 
         result = ResultBuilder.new_update(orderid)
 
         try: new_qty_decimal = todecimal_quantity(new_qty)
         except:
             result.set_success(False)
-            errmsg = f'new_qty [{new_qty}] could not be converted to valid decimal quantity'
-            result.add_message(errmsg)
-            self._logger.warning(errmsg)
+            report(self._logger, result, logging.WARNING, ResultCode.INVALID_QUANTITY, new_qty)
             return result.build()
 
         if new_qty_decimal <= 0:
             result.set_success(False)
-            errmsg = f'new_qty [{new_qty}] or new_qty_decimal [{new_qty_decimal}] must be > 0'
-            result.add_message(errmsg)
-            self._logger.warning(errmsg)
+            report(self._logger, result, logging.WARNING, ResultCode.QUANTITY_NOT_POSITIVE, new_qty, new_qty_decimal)
             return result.build()
 
+        qty = toticks_quantity(new_qty_decimal) if self._ticks else new_qty_decimal
+
+        if self._journal is not None:
+            self._seq = self._journal.append_update(orderid, toticks_quantity(new_qty_decimal))
+
         try: order = self._orders[orderid]
         except KeyError:
             result.set_success(False)
-            errmsg = f'order [{orderid}] not found in lob'
-            result.add_message(errmsg)
-            self._logger.warning(errmsg)
+            report(self._logger, result, logging.WARNING, *self._notfound(orderid, ResultCode.NOT_UPDATABLE))
             return result.build()
 
-        match order.side():
-            case OrderSide.BID:
-                with self._bidside.lock():
-
-                    if not order.valid():
-                        result.set_success(False)
-                        errmsg = f'order [{orderid}] can not be update (status={order.status()})'
-                        result.add_message(errmsg)
-                        self._logger.warning(errmsg)
-                        return result.build()
-
-                    self._logger.info('updating bid order [%s] to qty [%f]', orderid, new_qty_decimal)
-                    self._bidside.update_order(order, new_qty_decimal)
-
-            case OrderSide.ASK:
-                with self._askside.lock():
-
-                    if not order.valid():
-                        result.set_success(False)
-                        errmsg = f'order [{orderid}] can not be updated (status={order.status()})'
-                        result.add_message(errmsg)
-                        self._logger.warning(errmsg)
-                        return result.build()
-
-                    self._logger.info('updating ask order [%s] to qty [%f]', orderid, new_qty_decimal)
-                    self._askside.update_order(order, new_qty_decimal)
+        self._writers.append(None) # see `book_view`
+        try:
+            match order.side():
+                case OrderSide.BID:
+                    with self._bidside.lock():
+
+                        if not order.valid():
+                            result.set_success(False)
+                            code = ResultCode.NOT_UPDATABLE
+                            report(self._logger, result, logging.WARNING, code, orderid, order.status())
+                            return result.build()
+
+                        self._logger.info('updating bid order [%s] to qty [%f]', orderid, new_qty_decimal)
+                        self._bidside.update_order(order, qty)
+
+                case OrderSide.ASK:
+                    with self._askside.lock():
+
+                        if not order.valid():
+                            result.set_success(False)
+                            code = ResultCode.NOT_UPDATABLE
+                            report(self._logger, result, logging.WARNING, code, orderid, order.status())
+                            return result.build()
+
+                        self._logger.info('updating ask order [%s] to qty [%f]', orderid, new_qty_decimal)
+                        self._askside.update_order(order, qty)
+        finally:
+            self._version = next(self._versions)
+            self._writers.pop()
 
-        msg = f'order [{order.id()}] updated properly to [{new_qty_decimal}]'
         result.set_success(True)
-        result.add_message(msg)
-        self._logger.info(msg)
+        report(self._logger, result, logging.INFO, ResultCode.UPDATED, order.id(), new_qty_decimal)
+        if self._subscribers: self._publish_diff()
         return result.build()
 
-    def cancel(self, orderid: str) -> ExecutionResult:
+    def cancel(self, orderid: OrderId) -> ExecutionResult:
         '''Cancel an order sitting in the lob, given its id.
 
         Args:
-            orderid (str): Identifier of the order to cancel.
+            orderid (OrderId): Identifier of the order to cancel.
 
         Returns:
             ExecutionResult: The result of the cancellation.
         '''
 
+        if self._latency is None: return self._cancel(orderid)
+
+        t0 = time.perf_counter_ns()
+        result = self._cancel(orderid)
+        self._latency.cancel.record(time.perf_counter_ns() - t0)
+        return result
+
+    def _cancel(self, orderid: OrderId) -> ExecutionResult:
         if not self._alive:
             return not_running_error(self._logger).build()
 
         self._logger.info('attempting to cancel order with id [%s]', orderid)
+        if self._inline_expiry: self._expire_due()
 
         result = ResultBuilder.new_cancel(orderid)
 
+        if self._journal is not None: self._seq = self._journal.append_cancel(orderid)
+
         try: order = self._orders[orderid]
         except KeyError:
             result.set_success(False)
-            errmsg = f'order [{orderid}] not found in lob'
-            result.add_message(errmsg)
-            self._logger.warning(errmsg)
+            report(self._logger, result, logging.WARNING, *self._notfound(orderid, ResultCode.NOT_CANCELABLE))
             return result.build()
 
-        match order.side():
-            case OrderSide.BID:
-                with self._bidside.lock():
+        self._writers.append(None) # see `book_view`
+        try:
+            match order.side():
+                case OrderSide.BID:
+                    with self._bidside.lock():
+
+                        if not order.valid():
+                            result.set_success(False)
+                            code = ResultCode.NOT_CANCELABLE
+                            report(self._logger, result, logging.WARNING, code, orderid, order.status())
+                            return result.build()
+
+                        self._logger.info('cancelling bid order [%s]', orderid)
+                        self._bidside.cancel_order(order)
+
+                case OrderSide.ASK:
+                    with self._askside.lock():
+
+                        if not order.valid():
+                            result.set_success(False)
+                            code = ResultCode.NOT_CANCELABLE
+                            report(self._logger, result, logging.WARNING, code, orderid, order.status())
+                            return result.build()
+
+                        self._logger.info('cancelling ask order [%s]', orderid)
+                        self._askside.cancel_order(order)
+        finally:
+            self._version = next(self._versions)
+            self._writers.pop()
 
-                    if not order.valid():
-                        result.set_success(False)
-                        errmsg = f'order [{orderid}] can not be canceled (status={order.status()})'
-                        result.add_message(errmsg)
-                        self._logger.warning(errmsg)
-                        return result.build()
+        result.set_success(True)
+        report(self._logger, result, logging.INFO, ResultCode.CANCELED, order.id())
+        if self._subscribers: self._publish_diff()
+        return result.build()
 
-                    self._logger.info('cancelling bid order [%s]', orderid)
-                    self._bidside.cancel_order(order)
+    # L2 DIFFS #################################################################
 
-            case OrderSide.ASK:
-                with self._askside.lock():
+    def subscribe(self, callback: Callable[[L2Diff], None]) -> None:
+        '''
+        Call `callback` with the price levels that changed (as an `L2Diff`) after each operation that modifies the 
+        lob, so that a mirror of the book can be maintained in O(changes) instead of polling `best_bids` and 
+        `best_asks`. Callbacks are called synchronously, from the thread that performed the operation (the GTD 
+        expiry thread for orders expiring on the wall clock).
+
+        Changed levels are only recorded while there is at least one subscriber. To consume diffs as an iterator,
+        subscribe e.g. the `append` method of a `collections.deque`.
+        '''
 
-                    if not order.valid():
-                        result.set_success(False)
-                        errmsg = f'order [{orderid}] can not be canceled (status={order.status()})'
-                        result.add_message(errmsg)
-                        self._logger.warning(errmsg)
-                        return result.build()
+        with self._diff_lock:
+            if not self._subscribers:
+                self._askside.track_changes(True)
+                self._bidside.track_changes(True)
+            self._subscribers.append(callback)
 
-                    self._logger.info('cancelling ask order [%s]', orderid)
-                    self._askside.cancel_order(order)
+    def unsubscribe(self, callback: Callable[[L2Diff], None]) -> None:
+        '''Stop sending diffs to `callback`.'''
 
-        msg = f'order [{order.id()}] canceled properly'
-        result.set_success(True)
-        result.add_message(msg)
-        self._logger.info(msg)
-        return result.build()
+        with self._diff_lock:
+            self._subscribers.remove(callback)
+            if not self._subscribers:
+                self._askside.track_changes(False)
+                self._bidside.track_changes(False)
+
+    def diff_seq(self) -> int:
+        '''Sequence number of the last diff published, a mirror built from `best_bids` and `best_asks` is up to date 
+        with it.'''
+
+        return self._diff_seq
+
+    # FILLS ####################################################################
+
+    def subscribe_fills(self, callback: Callable[[list[Fill]], None]) -> None:
+        '''
+        Call `callback` with the trades (as a list of `Fill`, in execution order) of each order that matched resting 
+        orders, so that the owners of the resting orders are notified without polling `get_status`. Callbacks are 
+        called synchronously, from the thread that processed the incoming order.
+        '''
+
+        with self._fill_lock: self._fill_subscribers.append(callback)
+
+    def unsubscribe_fills(self, callback: Callable[[list[Fill]], None]) -> None:
+        '''Stop sending fills to `callback`.'''
+
+        with self._fill_lock: self._fill_subscribers.remove(callback)
+
+    def fill_seq(self) -> int:
+        '''Sequence number of the last fill.'''
+
+        return self._fill_seq
 
     # DATA-COLLECTION ########################################################## 
 
@@ -359,8 +575,8 @@ class Orderbook:
             int: Time in seconds since the lob has been started.
         '''
 
-        if not self._alive: return 0
-        return time_asint() - self._start_time
+        if not self._alive or self._start_time is None: return 0
+        return int(self._clock.now() - self._start_time)
 
     def best_asks(self, n: int) -> list[tuple[Decimal, Decimal, int]]:
         '''
@@ -371,7 +587,7 @@ class Orderbook:
         if (nasks := self.n_asks()) < n:
             self._logger.warning('asking for %s limits in <ob.best_asks> but lob only contains %s', n, nasks)
 
-        return self._askside.best_limits(n)
+        return [self._outlimit(lim) for lim in self._askside.best_limits(n)]
 
     def best_bids(self, n: int) -> list[tuple[Decimal, Decimal, int]]:
         '''
@@ -382,27 +598,144 @@ class Orderbook:
         if (nbids := self.n_bids()) < n:
             self._logger.warning('asking for %s limits in <ob.best_bids> but lob only contains %s', n, nbids)
 
-        return self._bidside.best_limits(n)
+        return [self._outlimit(lim) for lim in self._bidside.best_limits(n)]
 
     def best_ask(self) -> Optional[tuple[Decimal, Decimal, int]]:
         '''Get the best ask limit=(price, volume, #orders) in the lob.'''
 
-        if self._askside.empty():
+        if (top := self._askside.top()) is None:
             self._logger.warning('calling <ob.best_ask> but lob does not contain ask limits')
             return None
 
-        lim = self._askside.best()
-        return lim.price(), lim.volume(), lim.valid_orders()
+        return self._outlimit(top)
 
     def best_bid(self) -> Optional[tuple[Decimal, Decimal, int]]:
         '''Get the best bid limit=(price, volume, #orders) in the lob.'''
 
-        if self._bidside.empty():
+        if (top := self._bidside.top()) is None:
             self._logger.warning('calling <ob.best_bid> but lob does not contain ask limits')
             return None
 
-        lim = self._bidside.best()
-        return lim.price(), lim.volume(), lim.valid_orders()
+        return self._outlimit(top)
+
+    def bbo(self) -> tuple[Optional[tuple[Decimal, Decimal, int]], Optional[tuple[Decimal, Decimal, int]]]:
+        '''Get the (best bid, best ask) limits=(price, volume, #orders) in the lob, a side is None if it is empty. 
+        The best limits are cached and kept up to date as orders are processed, so this does not look the sides up.'''
+
+        bid, ask = self._bidside.top(), self._askside.top()
+        return (None if bid is None else self._outlimit(bid)), (None if ask is None else self._outlimit(ask))
+
+    def bbo_version(self) -> int:
+        '''Version of the best bid and offer, it is incremented each time one of them changes (price, volume or 
+        number of orders). Callers can compare it to the last version they saw to skip work when nothing changed.'''
+
+        return self._bidside.top_version() + self._askside.top_version()
+
+    def record_latency(self, enabled: bool) -> None:
+        '''Start recording the duration of the operations in new latency histograms, or stop recording them.'''
+
+        self._latency = LatencyRecorder() if enabled else None
+
+    def stats(self) -> Optional[dict[str, dict]]:
+        '''
+        Latency statistics of the operations of the lob since latencies are recorded, None if they are not: for each 
+        of "process", "cancel", "update" and "step_updates", the number of operations ("count"), and the mean, 
+        percentiles ("p50", "p90", "p99", "p99.9") and maximum durations, in nanoseconds. The statistics of "process" 
+        are also given for each kind of result (LIMIT, MARKET, PARTIAL_MARKET, ERROR) in its "by_kind" entry. 
+
+        Durations are recorded in fixed-memory log-bucketed histograms, percentiles are exact within 6.25%.
+        '''
+
+        if self._latency is None:
+            self._logger.warning('calling <ob.stats> but latencies are not recorded (see <ob.record_latency>)')
+            return None
+        return self._latency.stats()
+
+    def start_profile(self, n: Optional[int] = None, seconds: Optional[float] = None, output: str = 'pstats',
+                      path: Optional[str] = None) -> Profiler:
+        '''
+        Attach a profiler to the matching path of the lob: the bodies of `process`, `process_many` and `step_updates` 
+        (so `step`) are profiled for the next `n` orders or updates, or for `seconds`, whichever comes first, or 
+        until `stop_profile` is called. Only the functions of the engine, side and limit packages are reported, so 
+        that the lob can be profiled live without profiling (nor slowing down) the rest of the process.
+
+        Args:
+            n (int, optional): Number of orders (and L2 updates) to profile. Defaults to None (no limit).
+            seconds (float, optional): For how long to profile, checked after each operation. Defaults to None 
+                (no limit).
+            output (str, optional): "pstats" (`cProfile` statistics) or "collapsed" (time spent per stack, in the 
+                collapsed stacks format of flamegraphs). Defaults to "pstats".
+            path (str, optional): If given, where the output is written once profiling is done. Defaults to None.
+
+        Returns:
+            Profiler: The profiler, whose output can be read (or dumped) once it is `done`.
+        '''
+
+        if self._profiler is not None:
+            self._logger.warning('calling <ob.start_profile> while profiling, the previous profiler is stopped')
+            self.stop_profile()
+
+        self._profiler = profiler = Profiler(n, seconds, output, path)
+        return profiler
+
+    def stop_profile(self) -> Optional[Profiler]:
+        '''Stop profiling (once the operation being profiled is over) and detach the profiler, that is returned (None 
+        if the lob is not being profiled).'''
+
+        if (profiler := self._profiler) is None: return None
+
+        profiler.stop()
+        self._profiler = None
+        return profiler
+
+    def _profiled(self, operation: Callable, arg, root: str):
+        '''Run `operation(arg)` under the attached profiler, the profiler is detached once it is done.'''
+
+        profiler = self._profiler
+        if profiler is None or not profiler.begin(root): return operation(arg)
+
+        n = 1
+        try:
+            result = operation(arg)
+            if isinstance(result, list): n = len(result)
+            return result
+        finally:
+            if profiler.end(n) and self._profiler is profiler: self._profiler = None
+
+    def version(self) -> int:
+        '''Version of the book, a new one is drawn by each operation that modifies the sides (processing, update or 
+        cancellation of an order, L2 updates, or GTD orders expiring), whatever its outcome.'''
+
+        return self._version
+
+    def book_view(self, n: int = DEFAULT_LIMITS_VIEW) -> BookView:
+        '''
+        Get a consistent view of the `n` best levels of each side, safe to call from any thread while other threads 
+        modify the lob. Other readers (`best_bids`, `imbalance`, `view`, ...) read the sides while they may be 
+        modified, and can see e.g. a sweep half applied.
+
+        The view is taken seqlock-style: the levels are read without locking, and read again if an operation 
+        modifying the sides was in progress or completed meanwhile, so that readers never block (nor slow down) the 
+        threads modifying the lob. The last view built is shared by all readers until the version of the book 
+        changes, so that it is only copied once per version.
+        '''
+
+        while True:
+            version = self._version
+            if (cached := self._cached_view) is not None and cached[0] == version and cached[1] == n: return cached[2]
+
+            if not self._writers:
+                try:
+                    bids, asks = self._bidside.best_limits(n), self._askside.best_limits(n)
+                    if not self._writers and self._version == version: break
+                except Exception: # the sides changed while being read
+                    if not self._writers and self._version == version: raise
+
+            time.sleep(0) # let the writer complete its operation
+
+        view = BookView(version, tuple(self._outlimit(lim) for lim in bids), tuple(self._outlimit(lim) for lim in asks))
+        self._cached_view = (version, n, view)
+        return view
 
     def n_bids(self) -> int:
         '''Get the number of bid limits.'''
@@ -422,12 +755,12 @@ class Orderbook:
     def bids_volume(self) -> Decimal:
         '''Total volume on the bid side.'''
 
-        return self._bidside.volume()
+        return self._outqty(self._bidside.volume())
 
     def asks_volume(self) -> Decimal:
         '''Total volume on the ask side.'''
 
-        return self._askside.volume()
+        return self._outqty(self._askside.volume())
 
     def total_volume(self) -> Decimal:
         '''Total volume on ask and bid side.'''
@@ -437,33 +770,39 @@ class Orderbook:
     def midprice(self) -> Optional[Decimal]:
         '''Get the lob midprice.'''
 
-        if self._askside.empty() or self._bidside.empty():
+        ask, bid = self._askside.top(), self._bidside.top()
+
+        if ask is None or bid is None:
             self._logger.warning('calling <ob.midprice> but lob does not contain limits on both sides')
             return None
 
-        askprice, bidprice = self.best_ask()[0], self.best_bid()[0]
+        askprice, bidprice = self._outprice(ask[0]), self._outprice(bid[0])
         return Decimal(0.5) * (askprice + bidprice)
 
     def weighted_midprice(self) -> Optional[Decimal]:
         '''Get the lob weighted midprice.'''
 
-        if self._askside.empty() or self._bidside.empty():
+        ask, bid = self._askside.top(), self._bidside.top()
+
+        if ask is None or bid is None:
             self._logger.warning('calling <ob.weighted_midprice> but lob does not contain limits on both sides')
             return None
 
-        ask_price, ask_volume, _ = self.best_ask()
-        bid_price, bid_volume, _ = self.best_bid()
+        ask_price, ask_volume, _ = self._outlimit(ask)
+        bid_price, bid_volume, _ = self._outlimit(bid)
 
         return (ask_volume * ask_price + bid_volume * bid_price) / (ask_volume + bid_volume)
 
     def spread(self) -> Decimal:
         '''Get the lob spread.'''
 
-        if self._askside.empty() or self._bidside.empty():
+        ask, bid = self._askside.top(), self._bidside.top()
+
+        if ask is None or bid is None:
             self._logger.warning('calling <ob.spread> but lob does not contain limits on both sides')
             return None
 
-        askprice, bidprice = self.best_ask()[0], self.best_bid()[0]
+        askprice, bidprice = self._outprice(ask[0]), self._outprice(bid[0])
         return askprice - bidprice
 
     def imbalance(self, n: Optional[int] = None) -> Decimal:
@@ -479,18 +818,45 @@ class Orderbook:
             self._logger.error('calling ob.imbalance with n = %s, but max(nasks, nbids) = %s', n, max_prices)
             return None
 
-        bidvol = sum([lim[1] for lim in self.best_bids(n)])
-        askvol = sum([lim[1] for lim in self.best_asks(n)])
+        bidvol = self._outqty(self._bidside.depth(n))
+        askvol = self._outqty(self._askside.depth(n))
         return (bidvol / (askvol + bidvol))
 
-    def get_status(self, orderid: str) -> Optional[tuple[OrderStatus, Decimal]]:
+    def depth(self, side: OrderSide, n: int) -> Decimal:
+        '''Cumulative volume of the `n` best limits of a side.'''
+
+        return self._outqty(self._side(side).depth(n))
+
+    def volume_upto(self, side: OrderSide, price: Number) -> Decimal:
+        '''Cumulative volume of the limits of a side, from the best one down to `price` (included).'''
+
+        return self._outqty(self._side(side).volume_upto(self._inprice(todecimal_price(price))))
+
+    def price_to_fill(self, side: OrderSide, quantity: Number) -> Optional[Decimal]:
+        '''Price of the worst limit of a side that a market order of size `quantity` would reach to be entirely 
+        filled (the ask side being consumed by bid orders and vice versa), None if the side volume is not enough.'''
+
+        qty = todecimal_quantity(quantity)
+        price = self._side(side).price_to_fill(toticks_quantity(qty) if self._ticks else qty)
+        return None if price is None else self._outprice(price)
+
+    def tombstones_avoided(self) -> int:
+        '''Number of canceled orders that were unlinked from their limit queue instead of being left as dead entries.'''
+
+        return self._askside.tombstones_avoided() + self._bidside.tombstones_avoided()
+
+    def get_status(self, orderid: OrderId) -> Optional[tuple[OrderStatus, Decimal]]:
         '''Get the status and the quantity left for a given order or None if order was not accepted by the lob.'''
 
         try:
             order = self._orders[orderid]
             self._logger.info('order [%s] found in lob', orderid)
-            return order.status(), order.quantity()
+            return order.status(), self._outqty(order.quantity())
         except KeyError:
+            if self._history is not None and (handle := self._history.handle(orderid)) is not None:
+                self._logger.info('order [%s] found in lob history', orderid)
+                return self._history.status(handle), self._history.quantity(handle)
+
             self._logger.warning('order [%s] not found in lob', orderid)
             return None
 
@@ -540,7 +906,8 @@ class Orderbook:
     # RUNNING ON HISTORICAL DATA ###############################################
 
     def load_updates(self, updates: Iterable[dict]):
-        '''Load `updates` so that every time `step` is called, the lob gets updated (using fake orders).'''
+        '''Load `updates` so that every time `step` is called, the lob gets updated (setting the external volume of 
+        the limits).'''
 
         if not isinstance(updates, Iterable):
             raise ValueError(
@@ -550,24 +917,106 @@ class Orderbook:
         self._updates = iter(updates)
         self._logger.info('updates iterator loaded')
 
-    def step_updates(self, updates: dict):
-        '''Apply the updates directly to the lob.'''
+    def advance_to(self, t: float) -> None:
+        '''Advance the simulated clock of the lob to `t`, the GTD orders expiring until then are canceled.'''
 
-        if not isinstance(updates, dict) or updates.keys() != {'bids', 'asks'}:
-            raise ValueError('updates must be a dictionary containing "bids" and "asks" keys')
+        if not self._clock.simulated():
+            self._logger.error('<ob.advance_to> can only be called on a lob using a simulated clock')
+            return
 
-        bids, asks = updates['bids'], updates['asks']
+        self._advance_to(t) # journaled once applied, since the clock refuses to go backwards
+        if self._journal is not None: self._seq = self._journal.append_advance(t)
 
-        # lock all to aply updates
-        with self._askside.lock(), self._bidside.lock():
+    def step_updates(self, updates: dict) -> None:
+        '''Apply the updates directly to the lob. If `updates` contains a `"timestamp"` key and the lob uses a 
+        simulated clock, the clock is first advanced to it. The levels of each side are given in the same forms as 
+        in `from_snapshot` (pairs or numpy arrays), a volume of 0 deleting the level.'''
 
-            # apply updates to ask side
-            self._askside.apply_updates(asks)
+        if self._profiler is not None: self._profiled(self._step_updates_timed, updates, 'step_updates')
+        else: self._step_updates_timed(updates)
 
-            # apply updates to bid side
-            self._bidside.apply_updates(bids)
+    def _step_updates_timed(self, updates: dict) -> None:
+        if self._latency is None:
+            self._step_updates(updates)
+            return
 
-        self._logger.info('updates applied successfully')
+        t0 = time.perf_counter_ns()
+        self._step_updates(updates)
+        self._latency.step_updates.record(time.perf_counter_ns() - t0)
+
+    def _step_updates(self, updates: dict) -> None:
+        if not isinstance(updates, dict) or not {'bids', 'asks'} <= updates.keys() <= {'bids', 'asks', 'timestamp'}:
+            raise ValueError('updates must be a dictionary containing "bids" and "asks" keys (and optionally '
+                             '"timestamp")')
+
+        # validate and convert the levels to the sides units first, so that invalid updates are not applied at all
+        bids, asks = self._bidside.levels(updates['bids']), self._askside.levels(updates['asks'])
+        timestamp = updates.get('timestamp')
+        if self._inline_expiry: self._expire_due()
+
+        self._step_levels(bids, asks, timestamp) # journaled once applied, as `advance_to`
+
+        if self._journal is not None:
+            self._seq = self._journal.append_step(self._toticks_levels(bids), self._toticks_levels(asks), timestamp)
+
+    def replay(self, path: str) -> int:
+        '''
+        Apply the commands of a journal that come after the last command applied to the lob (all of them for a new 
+        lob, those following the checkpoint for a lob created with `load_checkpoint`). Replayed commands are not 
+        journaled again. The lob must be running.
+
+        Replayed orders get back the identifiers they were given when journaled (so that journaled updates and 
+        cancellations find them, whatever the id generator). Replay is deterministic as long as the commands were 
+        received from a single thread and the lob uses a `SimulatedClock` (GTD orders expiring on the wall clock 
+        are not journaled).
+
+        Args:
+            path (str): The journal file.
+
+        Returns:
+            int: The number of commands applied.
+        '''
+
+        if not self._alive:
+            self._logger.error('lob must be started (using <ob.start>) before replay can be called')
+            return 0
+
+        journal, self._journal = self._journal, None
+        applied = 0
+
+        try:
+            for seq, kind, args in read_journal(path):
+                if seq <= self._seq: continue
+                self._apply_command(kind, args)
+                self._seq = seq
+                applied += 1
+        finally: self._journal = journal
+
+        self._logger.info('replayed %s commands from journal %s', applied, path)
+        return applied
+
+    @staticmethod
+    def recover(checkpoint_path: str, journal_path: str, clock: Optional[Clock] = None,
+                ids: Optional[IdGenerator] = None, journal: Optional[Journal] = None):
+        '''
+        Rebuild a lob from a checkpoint and the tail of its journal (the commands received after the checkpoint).
+
+        Args:
+            checkpoint_path (str): The checkpoint file, written by `save_checkpoint`.
+            journal_path (str): The journal file.
+            clock (Clock, optional): The clock of the lob, see `load_checkpoint`. Defaults to None.
+            ids (IdGenerator, optional): The ids generator of the lob, see `load_checkpoint`. Defaults to None.
+            journal (Journal, optional): The journal to attach to the lob once recovered, to keep journaling the 
+                commands it receives. Defaults to None.
+
+        Returns:
+            Orderbook: The recovered (and running) LOB.
+        '''
+
+        lob = Orderbook.load_checkpoint(checkpoint_path, start=True, clock=clock, ids=ids)
+        lob.replay(journal_path)
+        lob._journal = journal
+        return lob
 
     def step(self):
         '''Apply the updates in `next(updates)` to the lob.'''
@@ -585,25 +1034,84 @@ class Orderbook:
 
     # AUXILIARY FUNCS (where most of the work happens) #########################
 
+    def _process(self, orderparams: OrderParams, orderid: Optional[OrderId]) -> ExecutionResult:
+        '''Process valid order params, the order gets the identifier `orderid` (when replayed from a journal) or a 
+        new one from the generator if None.'''
+
+        #                                         (params const already checks that expiry is set)
+        if orderparams.otype == OrderType.GTD and orderparams.expiry <= (t := self._clock.now()):
+            result = ResultBuilder.new_error()
+            report(self._logger, result, logging.ERROR, ResultCode.GTD_EXPIRED, orderparams.expiry, t)
+            return result.build()
+
+        if orderid is None: orderid = self._idgen.next_id()
+        if self._inline_expiry: self._expire_due()
+
+        if self._journal is not None:
+            ticks, lots = toticks_price(orderparams.price), toticks_quantity(orderparams.quantity)
+            self._seq = self._journal.append_process(orderparams.side, orderparams.otype, ticks, lots,
+                                                     orderparams.expiry, orderid)
+
+        if not self._hot: self._logger.info('processing order params')
+
+        match orderparams.side:
+            case OrderSide.BID: order = BidOrder(orderparams, self._ticks, orderid)
+            case OrderSide.ASK: order = AskOrder(orderparams, self._ticks, orderid)
+
+        if not self._bidside.in_range(order.price()):
+            result = ResultBuilder.new_error()
+            report(self._logger, result, logging.ERROR, ResultCode.OUT_OF_LADDER, orderparams.price, self._ladder)
+            return result.build()
+
+        self._writers.append(None) # see `book_view`
+        try:
+            match orderparams.side:
+                case OrderSide.BID: result = self._process_bid_order(order)
+                case OrderSide.ASK: result = self._process_ask_order(order)
+        finally:
+            self._version = next(self._versions)
+            self._writers.pop()
+
+        if result.success():
+            if not self._hot: self._logger.info('order [%s] was processed successfully', order.id())
+            self._save_order(order, result)
+
+        elif not self._hot: self._logger.warning('order was not successfully processed')
+
+        if order.status() == OrderStatus.PARTIAL:
+            qty, price = self._outqty(order.quantity()), self._outprice(order.price())
+            report(self._logger, result, logging.INFO, ResultCode.PARTIAL_FILLED, order.id(), qty, price)
+
+        if self._subscribers: self._publish_diff()
+        if result.n_fills(): return self._publish_fills(result)
+        return result.build()
+
     def _process_bid_order(self, order: BidOrder) -> ResultBuilder:
-        self._logger.info('processing bid order [%s]', order.id())
+        if not self._hot: self._logger.info('processing bid order [%s]', order.id())
 
-        if self._askside.is_market(order):
-            self._logger.info('bid order [%s] is market', order.id())
+        # the order is classified, checked and executed under the same lock, so that the side can not change between
+        with self._askside.lock():
+            if (market := self._askside.is_market(order)):
+                if (error := self._askside.check_market_order(order)) is None:
+                    result = engine.execute(order, self._askside)
 
-            if (error := self._askside.check_market_order(order)) is not None:
+        if market:
+            if not self._hot: self._logger.info('bid order [%s] is market', order.id())
+
+            if error is not None:
                 order.set_status(OrderStatus.ERROR)
                 result = ResultBuilder.new_market(order.id())
                 result.set_success(False)
-                result.add_message(error)
+                report(self._logger, result, logging.WARNING, error)
                 return result
 
-            # execute the order
-            with self._askside.lock():
-                result = engine.execute(order, self._askside)
+            if self._ticks:
+                result.execprices_fromticks()
+                result.fills_fromticks()
 
             if not result.success():
-                self._logger.error('bid market order [%s] could not be executed by engine', order.id())
+                if not self._hot:
+                    self._logger.error('bid market order [%s] could not be executed by engine', order.id())
                 return result
 
             if order.status() == OrderStatus.PARTIAL:
@@ -612,51 +1120,56 @@ class Orderbook:
 
                 with self._bidside.lock():
                     self._bidside.place(order)
-                    msg = f'order [{order.id()}] partially executed, {order.quantity()} was placed as a bid limit order'
-                    self._logger.info(msg)
-                    result.add_message(msg)
+                    qty = self._outqty(order.quantity())
+                    report(self._logger, result, logging.INFO, ResultCode.PARTIAL_PLACED, order.id(), qty, 'bid')
 
-            self._logger.info('executed bid market order [%s]', order.id())
+            if not self._hot: self._logger.info('executed bid market order [%s]', order.id())
             return result
 
         # else: is limit order
-        self._logger.info('bid order [%s] is limit', order.id())
+        if not self._hot: self._logger.info('bid order [%s] is limit', order.id())
 
         result = ResultBuilder.new_limit(order.id())
 
         if (error := check_limit_order(order)) is not None:
             order.set_status(OrderStatus.ERROR)
             result.set_success(False)
-            result.add_message(error)
-            self._logger.warning(error)
+            report(self._logger, result, logging.WARNING, error)
             return result
 
         # place the order in the side
         with self._bidside.lock(): self._bidside.place(order)
 
         result.set_success(True)
-        self._logger.info('order [%s] successfully placed', order.id())
+        if not self._hot: self._logger.info('order [%s] successfully placed', order.id())
         return result
 
     def _process_ask_order(self, order: AskOrder) -> ResultBuilder:
-        self._logger.info('processing ask order [%s]', order.id())
+        if not self._hot: self._logger.info('processing ask order [%s]', order.id())
+
+        # the order is classified, checked and executed under the same lock, so that the side can not change between
+        with self._bidside.lock():
+            if (market := self._bidside.is_market(order)):
+                if (error := self._bidside.check_market_order(order)) is None:
+                    result = engine.execute(order, self._bidside)
 
-        if self._bidside.is_market(order):
-            self._logger.info('ask order [%s] is market', order.id())
+        if market:
+            if not self._hot: self._logger.info('ask order [%s] is market', order.id())
 
-            if (error := self._bidside.check_market_order(order)) is not None:
+            if error is not None:
                 order.set_status(OrderStatus.ERROR)
                 result = ResultBuilder.new_market(order.id())
                 result.set_success(False)
-                result.add_message(error)
+                report(self._logger, result, logging.WARNING, error)
                 return result
 
-            # execute the order
-            with self._bidside.lock():
-                result = engine.execute(order, self._bidside)
+            if self._ticks:
+                result.execprices_fromticks()
+                result.fills_fromticks()
 
             if not result.success():
-                self._logger.error('ask market order [%s] could not be executed by engine', order.id())
+                if not self._hot:
+                    self._logger.error('ask market order [%s] could not be executed by engine', order.id())
                 return result
 
             if order.status() == OrderStatus.PARTIAL:
@@ -665,64 +1178,187 @@ class Orderbook:
 
                 with self._askside.lock():
                     self._askside.place(order)
-                    msg = f'order {order.id()} partially executed, {order.quantity()} was placed as an ask limit order'
-                    self._logger.info(msg)
-                    result.add_message(msg)
+                    qty = self._outqty(order.quantity())
+                    report(self._logger, result, logging.INFO, ResultCode.PARTIAL_PLACED, order.id(), qty, 'ask')
 
-            self._logger.info('executed ask market order [%s]', order.id())
+            if not self._hot: self._logger.info('executed ask market order [%s]', order.id())
             return result
 
         # else is limit order
-        self._logger.info('ask order [%s] is limit', order.id())
+        if not self._hot: self._logger.info('ask order [%s] is limit', order.id())
 
         result = ResultBuilder.new_limit(order.id())
 
         if (error := check_limit_order(order)) is not None:
             order.set_status(OrderStatus.ERROR)
             result.set_success(False)
-            result.add_message(error)
-            self._logger.warning(error)
+            report(self._logger, result, logging.WARNING, error)
             return result
 
         # place the order in the side
         with self._askside.lock(): self._askside.place(order)
 
         result.set_success(True)
-        self._logger.info('order [%s] successfully placed', order.id())
+        if not self._hot: self._logger.info('order [%s] successfully placed', order.id())
         return result
 
-    def _save_order(self, order: Order, result: ResultBuilder):
-        self._logger.info('adding order to history')
-        self._orders[order.id()] = order
+    def _advance_to(self, t: float) -> None:
+        self._clock.advance_to(t)
+        if (due := self._expiries.pop_due(t)): self._cancel_expired_orders(due)
 
-        if order.otype() == OrderType.GTD and result._kind.in_limit():
+    def _step_levels(self, bids: tuple[list, list], asks: tuple[list, list], timestamp: Optional[float]) -> None:
+        '''Apply L2 updates already converted to the sides units.'''
+
+        if timestamp is not None and self._clock.simulated(): self._advance_to(timestamp)
 
-            self._logger.info('order is a limit GTD order, adding order to expiry map')
-            if order.expiry() not in self._expirymap.keys(): self._expirymap[order.expiry()] = list()
-            self._expirymap[order.expiry()].append(order)
+        # lock all to aply updates
+        self._writers.append(None) # see `book_view`
+        try:
+            with self._askside.lock(), self._bidside.lock():
+                self._askside.apply_levels(*asks)
+                self._bidside.apply_levels(*bids)
+        finally:
+            self._version = next(self._versions)
+            self._writers.pop()
+
+        if self._subscribers: self._publish_diff()
+        self._logger.info('updates applied successfully')
+
+    def _apply_command(self, kind: int, args: tuple) -> None:
+        '''Apply a command read from a journal.'''
+
+        if kind == KIND_PROCESS:
+            side, otype, price, quantity, expiry, orderid = args
+            self._idgen.next_id() # keep the generator in step with the journaled ids
+            orderparams = OrderParams.restore(side, fromticks_price(price), fromticks_quantity(quantity), otype, expiry)
+            self._process(orderparams, orderid)
+        elif kind == KIND_CANCEL: self.cancel(args[0])
+        elif kind == KIND_UPDATE: self.update(args[0], fromticks_quantity(args[1]))
+        elif kind == KIND_STEP:
+            bids, asks, timestamp = args
+            self._step_levels(self._fromticks_levels(bids), self._fromticks_levels(asks), timestamp)
+        elif kind == KIND_ADVANCE: self._advance_to(args[0])
+
+    def _toticks_levels(self, levels: tuple[list, list]) -> tuple[list[int], list[int]]:
+        '''Convert (prices, volumes) from the book units to ticks and lots.'''
+
+        if self._ticks: return levels
+        prices, volumes = levels
+        return [toticks_price(p) for p in prices], [toticks_quantity(v) for v in volumes]
+
+    def _fromticks_levels(self, levels: tuple[list[int], list[int]]) -> tuple[list, list]:
+        '''Convert (prices, volumes) from ticks and lots to the book units.'''
+
+        if self._ticks: return levels
+        prices, volumes = levels
+        return [fromticks_price(p) for p in prices], [fromticks_quantity(v) for v in volumes]
+
+    def _side(self, side: OrderSide) -> AskSide | BidSide:
+        return self._askside if side == OrderSide.ASK else self._bidside
+
+    def _inprice(self, price: Decimal) -> Decimal | int:
+        '''Convert a decimal price to the book units.'''
+
+        return toticks_price(price) if self._ticks else price
+
+    def _outprice(self, price: Decimal | int) -> Decimal:
+        '''Convert a price from the book units to decimal.'''
+
+        return fromticks_price(price) if isinstance(price, int) else price
 
-    def _cancel_expired_orders(self):
-        '''Background expired orders cleaner.'''
+    def _outqty(self, qty: Decimal | int) -> Decimal:
+        '''Convert a quantity from the book units to decimal.'''
 
-        timestamps = self._expirymap.keys()
-        if not timestamps: return
+        return fromticks_quantity(qty) if isinstance(qty, int) else qty
 
-        now = time_asint()
-        keys_outdated = filter(lambda timestamp: timestamp < now, timestamps)
+    def _outlimit(self, lim: tuple) -> tuple[Decimal, Decimal, int]:
+        '''Convert a (price, volume, #orders) triplet from the book units to decimal.'''
 
-        for key in keys_outdated:
-            expired_orders = self._expirymap[key]
+        if not self._ticks: return lim
+        price, volume, n = lim
+        return fromticks_price(price), fromticks_quantity(volume), n
 
-            self._logger.info('GTD orders: cancelling %s with t=%s', len(expired_orders), key)
+    def _notfound(self, orderid: OrderId, code: ResultCode) -> tuple:
+        '''Error code (and its arguments) for an order that is not in `_orders`, `code` is used if the order is in 
+        the history store.'''
 
-            for order in expired_orders:
-                if not order.valid(): continue
+        if self._history is not None and (handle := self._history.handle(orderid)) is not None:
+            return code, orderid, self._history.status(handle)
+        return ResultCode.ORDER_NOT_FOUND, orderid
 
-                match order.side():
-                    case OrderSide.ASK:
-                        with self._askside.lock(): self._askside.cancel_order(order)
+    def _compact_history(self):
+        '''Move the orders that can not be matched anymore from `_orders` to the columnar history store.'''
 
-                    case OrderSide.BID:
-                        with self._bidside.lock(): self._bidside.cancel_order(order)
+        done = [order for order in self._orders.values() if not order.valid()]
+        for order in done:
+            self._history.append(order, self._ticks)
+            del self._orders[order.id()]
 
-            del self._expirymap[key]
+        # amortized: compact again only once the number of orders in `_orders` has doubled
+        self._compact_at = max(COMPACT_HISTORY_MIN, 2 * len(self._orders))
+        self._logger.info('moved %s orders to history store', len(done))
+
+    def _save_order(self, order: Order, result: ResultBuilder):
+        if not self._hot: self._logger.info('adding order to history')
+        self._orders[order.id()] = order
+
+        if self._history is not None and len(self._orders) >= self._compact_at: self._compact_history()
+
+        if order.otype() == OrderType.GTD and result._kind.in_limit():
+
+            if not self._hot: self._logger.info('order is a limit GTD order, scheduling its expiry')
+            self._expiries.schedule(order)
+            if self._single_writer and not self._clock.simulated(): self._inline_expiry = True
+
+    def _expire_due(self) -> None:
+        '''Cancel the GTD orders that expired on the wall clock, from the writer thread (single-writer mode).'''
+
+        if (due := self._expiries.pop_due(self._clock.now())): self._cancel_expired_orders(due)
+        self._inline_expiry = len(self._expiries) > 0
+
+    def _cancel_expired_orders(self, orders: list[Order]):
+        '''Cancel GTD orders that expired (called by the expiry scheduler), under one lock acquisition per side.'''
+
+        asks = [order for order in orders if order.side() == OrderSide.ASK]
+        bids = [order for order in orders if order.side() == OrderSide.BID]
+
+        self._writers.append(None) # see `book_view`
+        try:
+            for side, expired in ((self._askside, asks), (self._bidside, bids)):
+                if not expired: continue
+
+                with side.lock():
+                    for order in expired:
+                        if order.valid(): side.cancel_order(order)
+        finally:
+            self._version = next(self._versions)
+            self._writers.pop()
+
+        if self._subscribers: self._publish_diff()
+        self._logger.info('GTD orders: %s orders expired', len(orders))
+
+    def _publish_fills(self, result: ResultBuilder) -> ExecutionResult:
+        '''Number the fills of a result, build it and send its fills to the subscribers.'''
+
+        with self._fill_lock:
+            result.set_first_fill(self._fill_seq + 1)
+            self._fill_seq += result.n_fills()
+            subscribers = list(self._fill_subscribers)
+
+        built = result.build()
+        if subscribers:
+            fills = built.fills()
+            for callback in subscribers: callback(fills)
+        return built
+
+    def _publish_diff(self):
+        '''Send the levels that changed since the last diff to the subscribers, if any changed.'''
+
+        with self._diff_lock:
+            with self._askside.lock(): asks = self._askside.pop_changes()
+            with self._bidside.lock(): bids = self._bidside.pop_changes()
+            if not asks and not bids: return
+
+            self._diff_seq += 1
+            diff = L2Diff(self._diff_seq, [self._outlimit(lim) for lim in bids], [self._outlimit(lim) for lim in asks])
+            for callback in self._subscribers: callback(diff)
@@ -0,0 +1,230 @@
+'''Scoped profiling of the matching path of the lob.'''
+
+import os
+import sys
+import time
+import marshal
+import cProfile
+import pstats
+import threading
+import importlib
+from typing import Optional, Iterable
+
+PACKAGES = ('fastlob.engine', 'fastlob.side', 'fastlob.limit')
+OUTPUTS = ('pstats', 'collapsed')
+
+class _Snapshot(cProfile.Profile):
+    '''What `pstats.Stats` loads its statistics from.'''
+
+    def __init__(self, stats: dict):
+        super().__init__()
+        self.stats = stats
+
+    def create_stats(self): pass
+
+class Profiler:
+    '''
+    A profiler attached to a lob by `Orderbook.start_profile`, enabled only while the lob runs the bodies of
+    `process`, `process_many` and `step_updates` (so `step`) in the thread calling them, and detached once it has
+    profiled `n` orders or updates, or `seconds` have passed since it was attached (checked after each operation),
+    whichever comes first.
+
+    Only the functions of the engine, side and limit packages (by default, see `packages`) are reported.
+
+    - With the "pstats" output, the operations run under `cProfile`, and `stats` returns the `pstats.Stats` of the
+      reported functions. The time they spend in other functions (e.g. decimal arithmetic) is only counted in their
+      cumulative time.
+    - With the "collapsed" output, the calls are traced to record the time spent in each stack of reported functions
+      (rooted at the name of the operation, that gets the time spent out of them), and `collapsed` returns them in
+      the collapsed stacks format of flamegraph.pl (one "root;caller;callee nanoseconds" line per stack). The time
+      spent in other functions counts in the stack calling them. Tracing costs more than `cProfile`.
+
+    Both replace the profile function of the thread (see `sys.setprofile`) while an operation is profiled.
+    '''
+
+    _output: str
+    _limit: Optional[int]
+    _deadline: Optional[float]
+    _path: Optional[str]
+    _prefixes: tuple[str, ...]
+    # ^ the directories of the reported packages
+    _busy: threading.Lock
+    # ^ held while an operation is profiled, nested (or concurrent) operations are run unprofiled
+    _owner: Optional[int]
+    # ^ the thread profiling an operation, if any
+    _done: bool
+    _ops: int
+    _profile: Optional[cProfile.Profile]
+    _stacks: dict[str, int]
+    _names: dict[tuple[str, str], str]
+    # ^ qualified name of the functions, by code file and name
+    _frames: list
+    _stack: list[str]
+    _last: int
+
+    def __init__(self, n: Optional[int] = None, seconds: Optional[float] = None, output: str = 'pstats',
+                 path: Optional[str] = None, packages: Iterable[str] = PACKAGES):
+        '''
+        Args:
+            n (int, optional): Number of orders (and L2 updates) to profile. Defaults to None (no limit).
+            seconds (float, optional): For how long (wall clock) to profile. Defaults to None (no limit).
+            output (str, optional): "pstats" or "collapsed". Defaults to "pstats".
+            path (str, optional): If given, where the output is dumped (see `dump`) once profiling is done. Defaults
+                to None.
+            packages (Iterable[str], optional): The packages whose functions are reported. Defaults to the engine,
+                side and limit packages.
+        '''
+
+        if output not in OUTPUTS: raise ValueError(f'output must be one of {OUTPUTS} but is {output}')
+        if n is not None and n <= 0: raise ValueError('n must be > 0')
+        if seconds is not None and seconds <= 0: raise ValueError('seconds must be > 0')
+
+        self._output   = output
+        self._limit    = n
+        self._deadline = None if seconds is None else time.perf_counter() + seconds
+        self._path     = path
+        self._prefixes = tuple(os.path.dirname(str(importlib.import_module(p).__file__)) + os.sep for p in packages)
+        self._busy     = threading.Lock()
+        self._owner    = None
+        self._done     = False
+        self._ops      = 0
+        self._profile  = cProfile.Profile() if output == 'pstats' else None
+        self._stacks   = dict()
+        self._names    = dict()
+        self._frames   = list()
+        self._stack    = list()
+        self._last     = 0
+
+    def output(self) -> str:
+        '''"pstats" or "collapsed".'''
+
+        return self._output
+
+    def n_ops(self) -> int:
+        '''Number of orders and updates profiled so far.'''
+
+        return self._ops
+
+    def done(self) -> bool:
+        '''Whether profiling is over.'''
+
+        return self._done
+
+    def begin(self, root: str) -> bool:
+        '''Start profiling an operation named `root`, return False (and do nothing) if it can not be profiled:
+        profiling is over, or an operation is already being profiled.'''
+
+        if self._done or not self._busy.acquire(blocking=False): return False
+        if self._done: # finished by `stop` meanwhile
+            self._busy.release()
+            return False
+
+        self._owner = threading.get_ident()
+        if self._profile is not None: self._profile.enable()
+        else:
+            self._stack.append(root)
+            self._last = time.perf_counter_ns()
+            sys.setprofile(self._trace)
+        return True
+
+    def end(self, n: int) -> bool:
+        '''Stop profiling the operation started by `begin`, that applied `n` orders or updates. Return whether
+        profiling is over.'''
+
+        if self._profile is not None: self._profile.disable()
+        else:
+            sys.setprofile(None)
+            self._charge(time.perf_counter_ns())
+            self._frames.clear()
+            self._stack.clear()
+
+        self._ops += n
+        if (self._limit is not None and self._ops >= self._limit) or \
+           (self._deadline is not None and time.perf_counter() >= self._deadline): self._finish()
+
+        self._owner = None
+        self._busy.release()
+        return self._done
+
+    def stop(self) -> None:
+        '''Stop profiling, once the operation being profiled (if any) is over.'''
+
+        if self._owner == threading.get_ident(): # called while profiling (e.g. by a fills subscriber)
+            self._limit = 0
+            return
+
+        with self._busy:
+            if not self._done: self._finish()
+
+    def _finish(self) -> None:
+        self._done = True
+        if self._path is not None: self.dump(self._path)
+
+    def stats(self) -> pstats.Stats:
+        '''The statistics of the reported functions (with the "pstats" output), the time they spend in functions that
+        are not reported being only counted in their cumulative time.'''
+
+        return pstats.Stats(_Snapshot(self._stats()))
+
+    def collapsed(self) -> str:
+        '''The time spent (in ns) in each stack of reported functions, in the collapsed stacks format (with the
+        "collapsed" output).'''
+
+        if self._profile is not None: raise ValueError('stacks are only available with the "collapsed" output')
+        return ''.join(f'{stack} {ns}\n' for stack, ns in self._stacks.items())
+
+    def dump(self, path: str) -> None:
+        '''Write the output to `path`: a pstats file (that `pstats.Stats(path)` or snakeviz load) or the collapsed
+        stacks.'''
+
+        if self._profile is not None:
+            with open(path, 'wb') as file: marshal.dump(self._stats(), file)
+        else:
+            with open(path, 'w', encoding='utf-8') as file: file.write(self.collapsed())
+
+    def _stats(self) -> dict:
+        '''The raw statistics of `cProfile`, restricted to the reported functions.'''
+
+        if self._profile is None: raise ValueError('stats are only available with the "pstats" output')
+
+        self._profile.create_stats()
+        stats = dict()
+        for function, (cc, nc, tt, ct, callers) in self._profile.stats.items():
+            if not self._reported(function[0]): continue
+            callers = {caller: timings for caller, timings in callers.items() if self._reported(caller[0])}
+            stats[function] = (cc, nc, tt, ct, callers)
+        return stats
+
+    def _reported(self, filename: str) -> bool:
+        return filename.startswith(self._prefixes)
+
+    def _charge(self, now: int) -> None:
+        '''Add the time since the last call or return to the current stack.'''
+
+        stack = ';'.join(self._stack)
+        self._stacks[stack] = self._stacks.get(stack, 0) + now - self._last
+        self._last = now
+
+    def _trace(self, frame, event: str, _) -> None:
+        '''Profile function tracing the calls and returns of the reported functions (see `sys.setprofile`).'''
+
+        if event == 'call':
+            code = frame.f_code
+            if not code.co_filename.startswith(self._prefixes): return
+            self._charge(time.perf_counter_ns())
+            self._frames.append(frame)
+            self._stack.append(self._name(code))
+
+        elif event == 'return' and self._frames and frame is self._frames[-1]:
+            self._charge(time.perf_counter_ns())
+            self._frames.pop()
+            self._stack.pop()
+
+    def _name(self, code) -> str:
+        qualname = getattr(code, 'co_qualname', code.co_name) # python >= 3.11 only
+        key = code.co_filename, qualname
+        if (name := self._names.get(key)) is None:
+            module = os.path.splitext(os.path.basename(code.co_filename))[0]
+            package = os.path.basename(os.path.dirname(code.co_filename))
+            name = self._names[key] = f'{package}.{module}:{qualname}'
+        return name
@@ -4,8 +4,27 @@ import logging
 from typing import Optional
 
 from fastlob.order import Order
-from fastlob.result import ResultBuilder
-from fastlob.enums import OrderType
+from fastlob.result import ResultBuilder, render_message
+from fastlob.enums import OrderType, ResultCode
+
+class NullLogger(logging.Logger):
+    '''A logger that does nothing, used by the lob in hot mode to keep logging off the matching path.'''
+
+    def __init__(self): super().__init__('null', logging.CRITICAL + 1)
+
+    def isEnabledFor(self, level: int) -> bool: return False
+
+    def debug(self, *args, **kwargs): pass
+    def info(self, *args, **kwargs): pass
+    def warning(self, *args, **kwargs): pass
+    def error(self, *args, **kwargs): pass
+    def log(self, *args, **kwargs): pass
+
+def report(logger: logging.Logger, result: ResultBuilder, level: int, code: ResultCode, *args) -> None:
+    '''Add a message code to `result`, the message is only rendered if it is going to be logged.'''
+
+    result.add_message(code, *args)
+    if logger.isEnabledFor(level): logger.log(level, render_message(code, args))
 
 # mostly safety checking
 
@@ -13,16 +32,15 @@ def not_running_error(logger: logging.Logger) -> ResultBuilder:
     '''Build the *not running error*.'''
 
     result = ResultBuilder.new_error()
-    errmsg = 'lob is not running (<ob.start> must be called before it can be used)'
-    result.add_message(errmsg); logger.error(errmsg)
+    report(logger, result, logging.ERROR, ResultCode.NOT_RUNNING)
     return result
 
-def check_limit_order(order: Order) -> Optional[str]:
-    '''Check if limit order can be processed.'''
+def check_limit_order(order: Order) -> Optional[ResultCode]:
+    '''Check if limit order can be processed, returns the error code if not.'''
 
     match order.otype():
 
         case OrderType.FOK: # FOK order can not be a limit order by definition
-            return 'FOK order is not immediately matchable'
+            return ResultCode.FOK_NOT_MATCHABLE
 
     return None
@@ -0,0 +1,78 @@
+'''Consistent read-only views of the best levels of the lob.'''
+
+from decimal import Decimal
+from typing import Optional
+
+class BookView:
+    '''
+    The `n` best levels of each side of the lob, as (price, volume, #orders) triplets with the best levels first,
+    taken between two operations of the lob (never in the middle of one, e.g. of a sweep). The view is immutable,
+    the lob is not read again once it is built.
+
+    Views are tagged with the version of the lob they were taken at, two views with the same version show the same
+    state of the book.
+    '''
+
+    __slots__ = ('_version', '_bids', '_asks')
+
+    _version: int
+    _bids: tuple[tuple[Decimal, Decimal, int], ...]
+    _asks: tuple[tuple[Decimal, Decimal, int], ...]
+
+    def __init__(self, version: int, bids: tuple[tuple[Decimal, Decimal, int], ...],
+                 asks: tuple[tuple[Decimal, Decimal, int], ...]):
+        self._version = version
+        self._bids    = bids
+        self._asks    = asks
+
+    def version(self) -> int:
+        '''Getter for the version of the lob the view was taken at.'''
+
+        return self._version
+
+    def bids(self) -> tuple[tuple[Decimal, Decimal, int], ...]:
+        '''The best bid levels.'''
+
+        return self._bids
+
+    def asks(self) -> tuple[tuple[Decimal, Decimal, int], ...]:
+        '''The best ask levels.'''
+
+        return self._asks
+
+    def best_bid(self) -> Optional[tuple[Decimal, Decimal, int]]:
+        '''The best bid level, None if there was none.'''
+
+        return self._bids[0] if self._bids else None
+
+    def best_ask(self) -> Optional[tuple[Decimal, Decimal, int]]:
+        '''The best ask level, None if there was none.'''
+
+        return self._asks[0] if self._asks else None
+
+    def midprice(self) -> Optional[Decimal]:
+        '''The midprice, None if a side was empty.'''
+
+        if not self._bids or not self._asks: return None
+        return Decimal(0.5) * (self._asks[0][0] + self._bids[0][0])
+
+    def spread(self) -> Optional[Decimal]:
+        '''The spread, None if a side was empty.'''
+
+        if not self._bids or not self._asks: return None
+        return self._asks[0][0] - self._bids[0][0]
+
+    def imbalance(self) -> Optional[Decimal]:
+        '''The imbalance of the levels of the view, None if both sides were empty.'''
+
+        bidvol = sum((level[1] for level in self._bids), Decimal(0))
+        askvol = sum((level[1] for level in self._asks), Decimal(0))
+        if not bidvol and not askvol: return None
+        return bidvol / (askvol + bidvol)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, BookView): return NotImplemented
+        return (self._bids, self._asks) == (other._bids, other._asks)
+
+    def __repr__(self) -> str:
+        return f'BookView(version={self._version}, bids={self._bids}, asks={self._asks})'
@@ -0,0 +1,3 @@
+'''Many books sharded across worker processes, with commands routed by symbol.'''
+
+from .manager import BookManager, Reply
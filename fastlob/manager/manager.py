@@ -0,0 +1,372 @@
+'''
+Many books, each owned by one of several worker processes (shards). Each shard runs its books on its own interpreter
+(and its own core when the platform allows pinning), so symbols are matched in parallel despite the GIL.
+'''
+
+import os
+import time
+import logging
+import threading
+import multiprocessing
+from numbers import Number
+from collections import deque
+from multiprocessing.connection import Connection
+from typing import Optional, Any
+
+from fastlob.lob import Orderbook
+from fastlob.order import OrderParams, OrderId
+from fastlob.enums import OrderSide, OrderType
+from fastlob.utils import toticks_price, toticks_quantity, fromticks_price, fromticks_quantity
+
+ADD = 0
+REMOVE = 1
+PROCESS = 2
+CANCEL = 3
+UPDATE = 4
+CALL = 5
+STATS = 6
+
+_SIDES = list(OrderSide)
+_OTYPES = list(OrderType)
+
+class Reply:
+    '''
+    The pending result of a command sent to a shard, resolved once the shard replied to the batch it was sent in.
+    A light alternative to `concurrent.futures.Future`: all the replies of a batch share one event.
+    '''
+
+    __slots__ = ('_batch', '_ok', '_value')
+
+    _batch: threading.Event
+    _ok: bool
+    _value: Any
+
+    def __init__(self, batch: threading.Event):
+        self._batch = batch
+        self._ok    = False
+        self._value = None
+
+    def done(self) -> bool:
+        '''True if the shard replied.'''
+
+        return self._batch.is_set()
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        '''Wait for the result of the command (at most `timeout` seconds) and return it, the exception raised by the
+        command is raised again.'''
+
+        if not self._batch.wait(timeout): raise TimeoutError('the shard did not reply in time')
+        if self._ok: return self._value
+        raise self._value
+
+    def exception(self, timeout: Optional[float] = None) -> Optional[BaseException]:
+        '''Wait for the command (at most `timeout` seconds), return the exception it raised or None.'''
+
+        if not self._batch.wait(timeout): raise TimeoutError('the shard did not reply in time')
+        return None if self._ok else self._value
+
+class BookManager:
+    '''
+    Route commands to books by symbol. Commands are buffered per shard and sent as one batch (one message per batch
+    instead of per command), either once `batch_size` commands are pending or every `linger` seconds. Every command
+    returns a `Reply`, resolved with its result once the shard replied.
+
+    Symbols are placed on the shard with the lowest total load when added, the load of a symbol being an estimate of
+    its traffic given by the caller (e.g. its number of commands per second, measured with `stats`).
+
+    Workers are started with the `spawn` method, so as for any `multiprocessing` program the manager must be created
+    under an `if __name__ == '__main__':` guard in the main script.
+    '''
+
+    _shards: list['_Shard']
+    _placement: dict[str, int]
+    _symbol_loads: dict[str, float]
+    _loads: list[float]
+    _batch_size: int
+    _linger: float
+    _lock: threading.Lock
+    _closed: threading.Event
+    _thread: threading.Thread
+
+    def __init__(self, shards: Optional[int] = None, batch_size: int = 256, linger: float = 0.001, **kwargs):
+        '''
+        Args:
+            shards (int, optional): The number of worker processes. Defaults to the number of cores.
+            batch_size (int, optional): The number of pending commands that triggers sending a batch. Defaults to
+                256.
+            linger (float, optional): The maximum time (in seconds) a command waits in a batch before it is sent.
+                Defaults to 0.001.
+            **kwargs: The arguments of the `Orderbook` constructor (e.g. `ticks`, `hot`), shared by all books.
+        '''
+
+        if shards is None: shards = os.cpu_count() or 1
+        if shards < 1: raise ValueError(f'shards must be >= 1 but is {shards}')
+        if batch_size < 1: raise ValueError(f'batch_size must be >= 1 but is {batch_size}')
+        if linger <= 0: raise ValueError(f'linger must be > 0 but is {linger}')
+
+        context = multiprocessing.get_context('spawn') # forking a process that runs threads is unsafe
+
+        self._shards       = [_Shard(context, i, kwargs) for i in range(shards)]
+        self._placement    = dict()
+        self._symbol_loads = dict()
+        self._loads        = [0.0] * shards
+        self._batch_size   = batch_size
+        self._linger       = linger
+        self._lock         = threading.Lock()
+        self._closed       = threading.Event()
+        self._thread       = threading.Thread(target=self._run, name='fastlob-manager', daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, a, b, c):
+        self.close()
+
+    def n_shards(self) -> int:
+        '''Getter for the number of shards.'''
+
+        return len(self._shards)
+
+    def symbols(self) -> list[str]:
+        '''The symbols of the books managed.'''
+
+        return list(self._placement)
+
+    def shard_of(self, symbol: str) -> int:
+        '''The shard that owns the book of `symbol`.'''
+
+        if symbol not in self._placement: raise KeyError(f'unknown symbol {symbol}')
+        return self._placement[symbol]
+
+    def loads(self) -> list[float]:
+        '''The total load of the symbols placed on each shard.'''
+
+        return list(self._loads)
+
+    def add(self, symbol: str, load: float = 1.0) -> Reply:
+        '''Create (and start) the book of `symbol` on the least loaded shard.'''
+
+        with self._lock:
+            if symbol in self._placement: raise ValueError(f'symbol {symbol} is already managed')
+            shard = min(range(len(self._shards)), key=self._loads.__getitem__)
+            self._placement[symbol] = shard
+            self._symbol_loads[symbol] = load
+            self._loads[shard] += load
+            return self._submit(shard, ADD, symbol, ())
+
+    def remove(self, symbol: str) -> Reply:
+        '''Stop and drop the book of `symbol`.'''
+
+        with self._lock:
+            shard = self.shard_of(symbol)
+            reply = self._submit(shard, REMOVE, symbol, ())
+            del self._placement[symbol]
+            self._loads[shard] -= self._symbol_loads.pop(symbol)
+            return reply
+
+    def process(self, symbol: str, orderparams: OrderParams) -> Reply:
+        '''Process an order in the book of `symbol`, the reply is resolved with its `ExecutionResult`.'''
+
+        if not isinstance(orderparams, OrderParams): raise TypeError('orderparams must be an instance of OrderParams')
+
+        # sent as plain integers (pickling decimals and enums is slow), params were already checked when created
+        args = (_SIDES.index(orderparams.side), _OTYPES.index(orderparams.otype), toticks_price(orderparams.price),
+                toticks_quantity(orderparams.quantity), orderparams.expiry)
+        return self._route(symbol, PROCESS, args)
+
+    def cancel(self, symbol: str, orderid: OrderId) -> Reply:
+        '''Cancel an order in the book of `symbol`, the reply is resolved with its `ExecutionResult`.'''
+
+        return self._route(symbol, CANCEL, (orderid,))
+
+    def update(self, symbol: str, orderid: OrderId, new_qty: Number) -> Reply:
+        '''Update an order in the book of `symbol`, the reply is resolved with its `ExecutionResult`.'''
+
+        return self._route(symbol, UPDATE, (orderid, new_qty))
+
+    def call(self, symbol: str, method: str, *args) -> Reply:
+        '''Call a public method of the book of `symbol` (e.g. `best_bids`), the reply is resolved with what it
+        returns.'''
+
+        if method.startswith('_'): raise ValueError(f'{method} is not a public method')
+        return self._route(symbol, CALL, (method, args))
+
+    def flush(self) -> None:
+        '''Send the pending commands of every shard now.'''
+
+        with self._lock:
+            for shard in self._shards: shard.flush()
+
+    def stats(self) -> dict[str, Any]:
+        '''
+        Throughput statistics, for each shard and aggregated: the number of commands processed, the time spent
+        processing them, and the commands processed per second of that time. Per-symbol command counts are reported
+        by `by_symbol`, to be used as loads when placing symbols.
+        '''
+
+        with self._lock: replies = [self._submit(i, STATS, None, ()) for i in range(len(self._shards))]
+        self.flush()
+        shards = [reply.result() for reply in replies]
+
+        commands, busy = sum(s['commands'] for s in shards), sum(s['busy'] for s in shards)
+        by_symbol = dict()
+        for s in shards: by_symbol.update(s['by_symbol'])
+
+        return {
+            'shards': shards,
+            'commands': commands,
+            'busy': busy,
+            'throughput': commands / busy if busy > 0 else 0.0,
+            # shards run in parallel, so the aggregated throughput is bounded by the busiest one
+            'parallel_throughput': commands / max(s['busy'] for s in shards) if busy > 0 else 0.0,
+            'by_symbol': by_symbol,
+        }
+
+    def close(self) -> None:
+        '''Send the pending commands, stop the books and the worker processes.'''
+
+        if self._closed.is_set(): return
+        self._closed.set()
+        self._thread.join()
+
+        with self._lock:
+            for shard in self._shards: shard.close()
+
+    def _route(self, symbol: str, kind: int, args: tuple) -> Reply:
+        with self._lock: return self._submit(self.shard_of(symbol), kind, symbol, args)
+
+    def _submit(self, shard: int, kind: int, symbol: Optional[str], args: tuple) -> Reply:
+        '''Buffer a command for `shard`, sending the batch if it is full. The lock must be held.'''
+
+        if self._closed.is_set(): raise RuntimeError('the manager is closed')
+
+        target = self._shards[shard]
+        reply = target.submit(kind, symbol, args)
+        if target.pending() >= self._batch_size: target.flush()
+        return reply
+
+    def _run(self) -> None:
+        while not self._closed.wait(self._linger): self.flush()
+        self.flush()
+
+class _Shard:
+    '''The manager side of a worker process: the pending batch, and the replies of the batches sent (in order).'''
+
+    _process: multiprocessing.Process
+    _commands: Connection
+    _results: Connection
+    _batch: list[tuple]
+    _replies: list[Reply]
+    _event: threading.Event
+    _inflight: deque[tuple[threading.Event, list[Reply]]]
+    _receiver: threading.Thread
+
+    def __init__(self, context, index: int, kwargs: dict):
+        commands_out, commands_in = context.Pipe(duplex=False)
+        results_out, results_in = context.Pipe(duplex=False)
+
+        self._process = context.Process(target=_work, args=(commands_out, results_in, index, kwargs),
+                                        name=f'fastlob-shard-{index}', daemon=True)
+        self._process.start()
+        commands_out.close(); results_in.close() # owned by the worker
+
+        self._commands = commands_in
+        self._results  = results_out
+        self._batch    = list()
+        self._replies  = list()
+        self._event    = threading.Event()
+        self._inflight = deque()
+        self._receiver = threading.Thread(target=self._receive, name=f'fastlob-shard-{index}-results', daemon=True)
+        self._receiver.start()
+
+    def pending(self) -> int:
+        return len(self._batch)
+
+    def submit(self, kind: int, symbol: Optional[str], args: tuple) -> Reply:
+        reply = Reply(self._event)
+        self._batch.append((kind, symbol, args))
+        self._replies.append(reply)
+        return reply
+
+    def flush(self) -> None:
+        if not self._batch: return
+
+        self._inflight.append((self._event, self._replies)) # before sending, the reply may come back right away
+        self._commands.send(self._batch)
+        self._batch, self._replies, self._event = list(), list(), threading.Event()
+
+    def close(self) -> None:
+        self.flush()
+        self._commands.send(None)
+        self._receiver.join()
+        self._process.join()
+        self._commands.close()
+        self._results.close()
+
+    def _receive(self) -> None:
+        while True:
+            try: values = self._results.recv()
+            except EOFError: values = None # the worker died
+            if values is None: break
+
+            event, replies = self._inflight.popleft()
+            for reply, (ok, value) in zip(replies, values): reply._ok, reply._value = ok, value
+            event.set()
+
+        while self._inflight: # batches that will never be replied to
+            event, replies = self._inflight.popleft()
+            for reply in replies: reply._value = RuntimeError('the shard worker exited')
+            event.set()
+
+def _work(commands: Connection, results: Connection, index: int, kwargs: dict) -> None:
+    '''Main loop of a shard worker process: apply the batches received, reply with their results.'''
+
+    logging.basicConfig(level=logging.FATAL) # the books of the shards are not meant to log to the console
+
+    if hasattr(os, 'sched_setaffinity'): # one core per shard
+        cores = sorted(os.sched_getaffinity(0))
+        os.sched_setaffinity(0, {cores[index % len(cores)]})
+
+    books: dict[str, Orderbook] = dict()
+    counts: dict[str, int] = dict()
+    stats = {'shard': index, 'pid': os.getpid(), 'commands': 0, 'batches': 0, 'busy': 0.0}
+
+    while (batch := commands.recv()) is not None:
+        t0 = time.perf_counter()
+        values: list[tuple[bool, object]] = list()
+        value: object
+
+        for kind, symbol, args in batch:
+            try:
+                if kind == PROCESS:
+                    side, otype, price, quantity, expiry = args
+                    params = OrderParams.restore(_SIDES[side], fromticks_price(price), fromticks_quantity(quantity),
+                                                 _OTYPES[otype], expiry)
+                    value = books[symbol].process(params)
+                elif kind == CANCEL: value = books[symbol].cancel(*args)
+                elif kind == UPDATE: value = books[symbol].update(*args)
+                elif kind == CALL:
+                    method, margs = args
+                    value = getattr(books[symbol], method)(*margs)
+                elif kind == ADD:
+                    books[symbol] = Orderbook(symbol, start=True, **kwargs)
+                    counts[symbol] = 0
+                    value = None
+                elif kind == REMOVE:
+                    books.pop(symbol).stop()
+                    del counts[symbol]
+                    value = None
+                else: value = dict(stats, by_symbol=dict(counts))
+
+                if symbol in counts: counts[symbol] += 1
+                values.append((True, value))
+            except Exception as e: values.append((False, e))
+
+        stats['commands'] += len(batch)
+        stats['batches'] += 1
+        stats['busy'] += time.perf_counter() - t0
+        results.send(values)
+
+    for book in books.values(): book.stop()
+    results.send(None)
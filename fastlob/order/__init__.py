@@ -1,3 +1,12 @@
 '''The order object manipulated by the lob and the OrderParams class used to create orders on the user side..'''
 
 from .order import OrderParams, Order, AskOrder, BidOrder
+from .store import OrderStore
+from .ids import (
+    OrderId,
+    IdGenerator,
+    SequentialIdGenerator,
+    PrefixedIdGenerator,
+    ShardedIdGenerator,
+    RandomIdGenerator,
+)
@@ -0,0 +1,73 @@
+'''Order identifiers generation strategies.'''
+
+import abc
+import secrets
+import itertools
+
+from fastlob.consts import ORDERS_ID_SIZE
+
+OrderId = int | str
+'''An order identifier, its type depends on the generator used by the lob.'''
+
+class IdGenerator(abc.ABC):
+    '''Base class for order identifiers generators, an instance is owned by each lob.'''
+
+    @abc.abstractmethod
+    def next_id(self) -> OrderId:
+        '''Get a new unique order identifier.'''
+
+class SequentialIdGenerator(IdGenerator):
+    '''Monotonic integer identifiers (the default), fast to generate and hash, and deterministic across replays.'''
+
+    def __init__(self, start: int = 1):
+        self._counter = itertools.count(start)
+
+    def next_id(self) -> int:
+        return next(self._counter)
+
+    def peek(self) -> int:
+        '''The next identifier that will be generated.'''
+
+        n = next(self._counter)
+        self._counter = itertools.count(n)
+        return n
+
+class PrefixedIdGenerator(IdGenerator):
+    '''Monotonic identifiers with a string prefix, e.g. `"BTCUSD-42"`, unique across books with distinct prefixes.'''
+
+    def __init__(self, prefix: str, start: int = 1):
+        self._prefix = prefix
+        self._counter = itertools.count(start)
+
+    def next_id(self) -> str:
+        return f'{self._prefix}{next(self._counter)}'
+
+class ShardedIdGenerator(IdGenerator):
+    '''Monotonic integer identifiers whose high bits hold a shard number, unique across books with distinct shards.'''
+
+    def __init__(self, shard: int, bits: int = 40, start: int = 1):
+        '''
+        Args:
+            shard (int): The shard number, must be >= 0.
+            bits (int, optional): The number of low bits used by the counter. Defaults to 40.
+            start (int, optional): The first value of the counter. Defaults to 1.
+        '''
+
+        if shard < 0: raise ValueError(f'shard must be >= 0 but is {shard}')
+        self._base = shard << bits
+        self._limit = 1 << bits
+        self._counter = itertools.count(start)
+
+    def next_id(self) -> int:
+        n = next(self._counter)
+        if n >= self._limit: raise OverflowError('sharded id counter exhausted')
+        return self._base | n
+
+class RandomIdGenerator(IdGenerator):
+    '''Random url-safe string identifiers (read from the OS CSPRNG), for when ids must not be guessable.'''
+
+    def __init__(self, nbytes: int = ORDERS_ID_SIZE):
+        self._nbytes = nbytes
+
+    def next_id(self) -> str:
+        return secrets.token_urlsafe(nbytes=self._nbytes)
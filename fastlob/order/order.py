@@ -1,36 +1,70 @@
 '''The order object manipulated by the lob.'''
 
-import abc
-import secrets
 from typing import Optional
 from decimal import Decimal
-from dataclasses import dataclass
 
 from fastlob.enums import OrderSide, OrderType, OrderStatus
-from fastlob.consts import ORDERS_ID_SIZE
+from fastlob.utils import toticks_price, toticks_quantity
 from .params import OrderParams
+from .ids import OrderId, IdGenerator, SequentialIdGenerator
 
-@dataclass
-class Order(abc.ABC):
-    '''Base abstract class for orders in the order-book. Extended by `BidOrder` and `AskOrder`.'''
+_DEFAULT_IDS: IdGenerator = SequentialIdGenerator()
+# ^ used for orders created outside of a lob (the lob provides ids from its own generator)
 
-    _id: str
+class Order:
+    '''Base class for orders in the order-book. Extended by `BidOrder` and `AskOrder`. 
+    Orders are slotted (no per-instance `__dict__`) since the book may hold millions of them.'''
+
+    __slots__ = ('_id', '_side', '_price', '_quantity', '_otype', '_expiry', '_status', '_prev', '_next')
+
+    _id: OrderId
     _side: OrderSide
-    _price: Decimal
-    _quantity: Decimal
+    _price: Decimal | int
+    _quantity: Decimal | int
     _otype: OrderType
     _expiry: Optional[float]
     _status: OrderStatus
+    _prev: Optional['Order']
+    _next: Optional['Order']
+    # ^ links used by the intrusive order queue of the limit the order sits in
 
-    def __init__(self, params: OrderParams):
-        self._id       = secrets.token_urlsafe(nbytes=ORDERS_ID_SIZE)
-        self._price    = params.price
-        self._quantity = params.quantity
+    def __init__(self, params: OrderParams, ticks: bool = False, orderid: Optional[OrderId] = None):
+        '''
+        Args:
+            params (OrderParams): The parameters of the order.
+            ticks (bool, optional): If true, price and quantity are stored as integer ticks and lots. 
+                Defaults to False.
+            orderid (OrderId, optional): The order identifier, a new sequential one is used if not provided.
+        '''
+        self._id       = _DEFAULT_IDS.next_id() if orderid is None else orderid
+        self._price    = toticks_price(params.price) if ticks else params.price
+        self._quantity = toticks_quantity(params.quantity) if ticks else params.quantity
         self._otype    = params.otype
         self._expiry   = params.expiry
         self._status   = OrderStatus.CREATED
-
-    def id(self) -> str:
+        self._prev     = None
+        self._next     = None
+
+    @staticmethod
+    def restore(orderid: OrderId, side: OrderSide, price: Decimal | int, quantity: Decimal | int, otype: OrderType,
+                expiry: Optional[float], status: OrderStatus) -> 'Order':
+        '''Create back an order from its saved state (e.g. from a checkpoint), without going through `OrderParams` 
+        since it was already validated when first created. The order is not linked to any queue.'''
+
+        cls = BidOrder if side == OrderSide.BID else AskOrder
+        order = cls.__new__(cls)
+        order._id       = orderid
+        order._side     = side
+        order._price    = price
+        order._quantity = quantity
+        order._otype    = otype
+        order._expiry   = expiry
+        order._status   = status
+        order._prev     = None
+        order._next     = None
+        return order
+
+    def id(self) -> OrderId:
         '''Getter for order identifier.'''
         return self._id
 
@@ -38,12 +72,12 @@ class Order(abc.ABC):
         '''Getter for order side.'''
         return self._side
 
-    def price(self) -> Decimal:
-        '''Getter for order price.'''
+    def price(self) -> Decimal | int:
+        '''Getter for order price (in ticks if the order was created in tick mode).'''
         return self._price
 
-    def quantity(self) -> Decimal:
-        '''Getter for order quantity.'''
+    def quantity(self) -> Decimal | int:
+        '''Getter for order quantity (in lots if the order was created in tick mode).'''
         return self._quantity
 
     def otype(self) -> OrderType:
@@ -62,7 +96,7 @@ class Order(abc.ABC):
         '''Set the order status.'''
         self._status = status
 
-    def fill(self, quantity: Decimal):
+    def fill(self, quantity: Decimal | int):
         '''Decrease the quantity of the order by some numerical value. If `quantity` is greater than the order qty, 
         we set it to 0.
         '''
@@ -70,7 +104,7 @@ class Order(abc.ABC):
         if self.quantity() == 0: self.set_status(OrderStatus.FILLED); return
         self.set_status(OrderStatus.PARTIAL)
 
-    def update(self, quantity: Decimal):
+    def update(self, quantity: Decimal | int):
         '''Update the quantity of the order to some numerical value'''
         self._quantity = quantity
 
@@ -86,18 +120,20 @@ class Order(abc.ABC):
         return f'{self._side.name}Order(id=[{self.id()}], status={self.status()}, price={self.price()}, ' + \
             f'quantity={self.quantity()}, type={self.otype()})'
 
-@dataclass
 class BidOrder(Order):
     '''A bid (buy) order.'''
 
-    def __init__(self, params: OrderParams):
-        super().__init__(params)
+    __slots__ = ()
+
+    def __init__(self, params: OrderParams, ticks: bool = False, orderid: Optional[OrderId] = None):
+        super().__init__(params, ticks, orderid)
         self._side = OrderSide.BID
 
-@dataclass
 class AskOrder(Order):
     '''An ask (sell) order.'''
 
-    def __init__(self, params: OrderParams):
-        super().__init__(params)
+    __slots__ = ()
+
+    def __init__(self, params: OrderParams, ticks: bool = False, orderid: Optional[OrderId] = None):
+        super().__init__(params, ticks, orderid)
         self._side = OrderSide.ASK
@@ -1,7 +1,5 @@
 '''Order params are used to create orders, they are created by the client.'''
 
-import time
-from math import ceil
 from decimal import Decimal
 from numbers import Number
 from typing import Optional
@@ -21,7 +19,7 @@ class OrderParams:
     price: Decimal
     quantity: Decimal
     otype: OrderType
-    expiry: Optional[int]
+    expiry: Optional[float]
 
     def __init__(self, side: OrderSide, price: Number, quantity: Number, otype: OrderType = OrderType.GTC,
                  expiry: Optional[Number] = None):
@@ -32,7 +30,7 @@ class OrderParams:
         self.price    = todecimal_price(price)
         self.quantity = todecimal_quantity(quantity)
         self.otype    = otype
-        self.expiry   = int(expiry) if expiry is not None else None
+        self.expiry   = float(expiry) if expiry is not None else None
 
     @staticmethod
     def check_args(side: OrderSide, price: Number, quantity: Number, otype: OrderType, expiry: Optional[Number]):
@@ -58,13 +56,9 @@ class OrderParams:
             raise TypeError(f'expiry should be of type Number but is {type(expiry)}')
 
         if otype == OrderType.GTD:
+            # whether the expiry is in the future is checked by the lob, against its own clock
             if expiry is None: raise ValueError('order is GTD but expiry is None')
 
-            expiry = int(expiry)
-            now = ceil(time.time())
-            if expiry <= now:
-                raise ValueError(f'order expiry ({expiry}) is less than current timestamp ({now}), or too close')
-
         price_decimal = todecimal_price(price)
         quantity_decimal = todecimal_quantity(quantity)
 
@@ -80,7 +74,21 @@ class OrderParams:
         if quantity_decimal > MAX_VALUE:
             raise ValueError(f'quantity ({quantity}) is too large')
 
-    def unwrap(self) -> tuple[Decimal, Decimal, OrderType, Optional[int]]:
+    @staticmethod
+    def restore(side: OrderSide, price: Decimal, quantity: Decimal, otype: OrderType,
+                expiry: Optional[float]) -> 'OrderParams':
+        '''Create back params that were already checked (e.g. sent by another process), without checking them 
+        again. `price` and `quantity` must be properly rounded decimals.'''
+
+        params = OrderParams.__new__(OrderParams)
+        params.side     = side
+        params.price    = price
+        params.quantity = quantity
+        params.otype    = otype
+        params.expiry   = expiry
+        return params
+
+    def unwrap(self) -> tuple[Decimal, Decimal, OrderType, Optional[float]]:
         return self.price, self.quantity, self.otype, self.expiry
 
     def __repr__(self) -> str:
@@ -0,0 +1,183 @@
+'''Columnar storage for historical orders.'''
+
+import math
+from array import array
+from typing import Optional, BinaryIO
+from decimal import Decimal
+
+from fastlob.enums import OrderSide, OrderType, OrderStatus
+from fastlob.utils import toticks_price, toticks_quantity, fromticks_price, fromticks_quantity, write_array, \
+    read_array
+from .order import Order
+from .ids import OrderId
+
+_SIDES = list(OrderSide)
+_OTYPES = list(OrderType)
+_STATUSES = list(OrderStatus)
+
+_INT_IDS = 0
+_STR_IDS = 1
+
+class OrderStore:
+    '''
+    Struct-of-arrays storage for orders that can not be matched anymore (filled, canceled, expired...).
+    Each order is stored as one row of parallel arrays, indexed by an integer handle, instead of being kept alive
+    as an `Order` object.
+    '''
+
+    _handles: dict[OrderId, int]
+    _ids: list[OrderId]
+    _sides: array
+    _otypes: array
+    _statuses: array
+    _prices: array
+    _quantities: array
+    _expiries: array
+
+    def __init__(self):
+        self._handles    = dict()
+        self._ids        = list()
+        self._sides      = array('b')
+        self._otypes     = array('b')
+        self._statuses   = array('b')
+        self._prices     = array('q')
+        self._quantities = array('q')
+        self._expiries   = array('d')
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, orderid: OrderId) -> bool:
+        return orderid in self._handles
+
+    def handle(self, orderid: OrderId) -> Optional[int]:
+        '''Get the handle of an order given its id, or None if the order is not stored.'''
+
+        return self._handles.get(orderid)
+
+    def append(self, order: Order, ticks: bool = False) -> int:
+        '''Store an order and return its handle.
+
+        Args:
+            order (Order): The order to store.
+            ticks (bool, optional): True if the order price and quantity are in ticks and lots. Defaults to False.
+
+        Returns:
+            int: The handle of the order in the store.
+        '''
+
+        price, quantity = order.price(), order.quantity()
+        if not ticks and isinstance(price, Decimal) and isinstance(quantity, Decimal):
+            price, quantity = toticks_price(price), toticks_quantity(quantity)
+
+        handle = len(self._ids)
+        self._handles[order.id()] = handle
+        self._ids.append(order.id())
+        self._sides.append(_SIDES.index(order.side()))
+        self._otypes.append(_OTYPES.index(order.otype()))
+        self._statuses.append(_STATUSES.index(order.status()))
+        self._prices.append(price)
+        self._quantities.append(quantity)
+        self._expiries.append(math.nan if order.expiry() is None else order.expiry())
+        return handle
+
+    def orders(self, ticks: bool = False) -> list[Order]:
+        '''Create back the `Order` objects of all the stored orders, in the order they were appended.
+
+        Args:
+            ticks (bool, optional): True if the orders price and quantity must be in ticks and lots. Defaults to False.
+        '''
+
+        prices, quantities = self._prices.tolist(), self._quantities.tolist()
+        if not ticks:
+            prices = [fromticks_price(p) for p in prices]
+            quantities = [fromticks_quantity(q) for q in quantities]
+
+        sides = [_SIDES[i] for i in self._sides]
+        otypes = [_OTYPES[i] for i in self._otypes]
+        statuses = [_STATUSES[i] for i in self._statuses]
+        expiries = [None if math.isnan(e) else e for e in self._expiries]
+
+        return list(map(Order.restore, self._ids, sides, prices, quantities, otypes, expiries, statuses))
+
+    def dump(self, file: BinaryIO) -> None:
+        '''Write the store to a binary file, each column being written as a whole.'''
+
+        if all(isinstance(i, int) for i in self._ids):
+            file.write(bytes([_INT_IDS]))
+            write_array(file, array('q', self._ids))
+        elif all(isinstance(i, str) for i in self._ids):
+            encoded = [str(i).encode() for i in self._ids]
+            file.write(bytes([_STR_IDS]))
+            write_array(file, array('I', map(len, encoded)))
+            write_array(file, array('B', b''.join(encoded)))
+        else: raise TypeError('order ids must be either all int or all str to be stored')
+
+        for column in (self._sides, self._otypes, self._statuses, self._prices, self._quantities, self._expiries):
+            write_array(file, column)
+
+    @classmethod
+    def load(cls, file: BinaryIO) -> 'OrderStore':
+        '''Read a store written by `dump`.'''
+
+        store = cls()
+
+        kind = file.read(1)[0]
+        if kind == _INT_IDS: store._ids = read_array(file, 'q').tolist()
+        elif kind == _STR_IDS:
+            lengths, blob = read_array(file, 'I'), read_array(file, 'B').tobytes()
+            offset = 0
+            for n in lengths:
+                store._ids.append(blob[offset:offset + n].decode())
+                offset += n
+        else: raise ValueError(f'unknown order ids encoding {kind}')
+
+        store._sides      = read_array(file, 'b')
+        store._otypes     = read_array(file, 'b')
+        store._statuses   = read_array(file, 'b')
+        store._prices     = read_array(file, 'q')
+        store._quantities = read_array(file, 'q')
+        store._expiries   = read_array(file, 'd')
+        store._handles    = {orderid: handle for handle, orderid in enumerate(store._ids)}
+
+        if len({len(store._ids), len(store._sides), len(store._otypes), len(store._statuses), len(store._prices),
+                len(store._quantities), len(store._expiries)}) != 1:
+            raise ValueError('corrupted order store, columns have different lengths')
+
+        return store
+
+    def orderid(self, handle: int) -> OrderId:
+        '''Get the id of a stored order.'''
+
+        return self._ids[handle]
+
+    def side(self, handle: int) -> OrderSide:
+        '''Get the side of a stored order.'''
+
+        return _SIDES[self._sides[handle]]
+
+    def otype(self, handle: int) -> OrderType:
+        '''Get the type of a stored order.'''
+
+        return _OTYPES[self._otypes[handle]]
+
+    def status(self, handle: int) -> OrderStatus:
+        '''Get the status of a stored order.'''
+
+        return _STATUSES[self._statuses[handle]]
+
+    def price(self, handle: int) -> Decimal:
+        '''Get the price of a stored order.'''
+
+        return fromticks_price(self._prices[handle])
+
+    def quantity(self, handle: int) -> Decimal:
+        '''Get the quantity left of a stored order.'''
+
+        return fromticks_quantity(self._quantities[handle])
+
+    def expiry(self, handle: int) -> Optional[float]:
+        '''Get the expiry of a stored order, if any.'''
+
+        expiry = self._expiries[handle]
+        return None if math.isnan(expiry) else expiry
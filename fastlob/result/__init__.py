@@ -1,3 +1,4 @@
 '''The result object is returned by the LOB after the client executes an operation.'''
 
-from .result import ResultBuilder, ExecutionResult
+from .result import ResultBuilder, ExecutionResult, render_message
+from .fill import Fill
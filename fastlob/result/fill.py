@@ -0,0 +1,62 @@
+'''Trades reported by the matching engine.'''
+
+from decimal import Decimal
+from typing import Optional
+
+from fastlob.order.ids import OrderId
+
+class Fill:
+    '''
+    One trade between an incoming (taker) order and a resting (maker) order, at the price of the maker's limit. The 
+    maker is None when the taker matched external volume (set from market data), which has no order identifier.
+
+    Fills are numbered by the lob with consecutive sequence numbers, in execution order.
+    '''
+
+    __slots__ = ('_seq', '_taker', '_maker', '_price', '_quantity')
+
+    _seq: int
+    _taker: OrderId
+    _maker: Optional[OrderId]
+    _price: Decimal
+    _quantity: Decimal
+
+    def __init__(self, seq: int, taker: OrderId, maker: Optional[OrderId], price: Decimal, quantity: Decimal):
+        self._seq      = seq
+        self._taker    = taker
+        self._maker    = maker
+        self._price    = price
+        self._quantity = quantity
+
+    def seq(self) -> int:
+        '''Getter for the sequence number of the fill.'''
+
+        return self._seq
+
+    def taker(self) -> OrderId:
+        '''Getter for the identifier of the incoming order.'''
+
+        return self._taker
+
+    def maker(self) -> Optional[OrderId]:
+        '''Getter for the identifier of the resting order, None for external volume.'''
+
+        return self._maker
+
+    def price(self) -> Decimal:
+        '''Getter for the execution price.'''
+
+        return self._price
+
+    def quantity(self) -> Decimal:
+        '''Getter for the quantity traded.'''
+
+        return self._quantity
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Fill) and (self._seq, self._taker, self._maker, self._price, self._quantity) == \
+            (other._seq, other._taker, other._maker, other._price, other._quantity)
+
+    def __repr__(self) -> str:
+        return f'Fill(seq={self._seq}, taker={self._taker}, maker={self._maker}, price={self._price}, ' + \
+            f'quantity={self._quantity})'
@@ -4,32 +4,66 @@ from decimal import Decimal
 from typing import Optional
 from collections import defaultdict
 
-from fastlob.enums import ResultType
+from fastlob.enums import ResultType, ResultCode
+from fastlob.order.ids import OrderId
+from fastlob.utils import fromticks_price, fromticks_quantity
+
+from .fill import Fill
+
+MESSAGES: dict[ResultCode, str] = {
+    ResultCode.NOT_RUNNING: 'lob is not running (<ob.start> must be called before it can be used)',
+    ResultCode.INVALID_PARAMS: 'orderparams is not an instance of fastlob.OrderParams',
+    ResultCode.GTD_EXPIRED: 'GTD order must expire in the future (but {} <= {})',
+    ResultCode.OUT_OF_LADDER: 'order price ({}) is out of the book price ladder {}',
+    ResultCode.FOK_NOT_MATCHABLE: 'FOK order is not immediately matchable',
+    ResultCode.OUT_OF_PRICE: '<matching engine>: order out-of-price at ({}), quantity left: ({})',
+    ResultCode.PARTIAL_FILLED: 'order [{}] partially filled by engine, {} placed at {}',
+    ResultCode.PARTIAL_PLACED: 'order [{}] partially executed, {} was placed as a {} limit order',
+    ResultCode.INVALID_QUANTITY: 'new_qty [{}] could not be converted to valid decimal quantity',
+    ResultCode.QUANTITY_NOT_POSITIVE: 'new_qty [{}] or new_qty_decimal [{}] must be > 0',
+    ResultCode.ORDER_NOT_FOUND: 'order [{}] not found in lob',
+    ResultCode.NOT_UPDATABLE: 'order [{}] can not be updated (status={})',
+    ResultCode.NOT_CANCELABLE: 'order [{}] can not be canceled (status={})',
+    ResultCode.UPDATED: 'order [{}] updated properly to [{}]',
+    ResultCode.CANCELED: 'order [{}] canceled properly',
+}
+'''Message template of each result code.'''
+
+def render_message(code: ResultCode, args: tuple) -> str:
+    '''Render the message corresponding to a result code and its arguments.'''
+
+    return MESSAGES[code].format(*args)
 
 class ResultBuilder:
     '''The object constructed by the lob during execution.'''
 
     _kind: ResultType
-    _orderid: str
+    _orderid: Optional[OrderId]
     _success: bool
-    _messages: list[str]
+    _messages: list[tuple[ResultCode, tuple]]
     _orders_matched: int
-    _execprices: Optional[defaultdict[Decimal, Decimal]]
+    _execprices: Optional[defaultdict]
+    # ^ quantity matched at each price, in the book units until converted by `execprices_fromticks`
+    _fills: Optional[list]
+    # ^ (maker id, price, quantity) of each trade, in the book units until converted by `fills_fromticks`
+    _first_fill: int
 
-    def __init__(self, kind: ResultType, orderid: str):
+    def __init__(self, kind: ResultType, orderid: OrderId):
         self._kind = kind
         self._orderid = orderid
         self._messages = list()
         self._orders_matched = 0
         self._execprices = defaultdict(Decimal) if kind == ResultType.MARKET else None
+        self._fills = list() if kind == ResultType.MARKET else None
+        self._first_fill = 0
 
     @staticmethod
-    def new_limit(orderid: str):
+    def new_limit(orderid: OrderId):
         '''Instantiate a new LIMIT result.'''
         return ResultBuilder(ResultType.LIMIT, orderid)
 
     @staticmethod
-    def new_market(orderid: str):
+    def new_market(orderid: OrderId):
         '''Instantiate a new MARKET result.'''
         return ResultBuilder(ResultType.MARKET, orderid)
 
@@ -40,12 +74,12 @@ class ResultBuilder:
         return result_market
 
     @staticmethod
-    def new_update(orderid: str):
+    def new_update(orderid: OrderId):
         '''Instantiate a new UPDATE result.'''
         return ResultBuilder(ResultType.UPDATE, orderid)
 
     @staticmethod
-    def new_cancel(orderid: str):
+    def new_cancel(orderid: OrderId):
         '''Instantiate a new CANCEL result.'''
         return ResultBuilder(ResultType.CANCEL, orderid)
 
@@ -64,14 +98,37 @@ class ResultBuilder:
         '''Setter for success attribute, this attribute should be true if the operation was properly executed.'''
         self._success = success
 
-    def add_message(self, message: str):
-        '''Add an information message destined to the user.'''
-        self._messages.append(message)
+    def add_message(self, code: ResultCode, *args):
+        '''Add an information message destined to the user, as a code and its arguments (rendered lazily).'''
+        self._messages.append((code, args))
 
-    def inc_execprices(self, price: Decimal, qty: Decimal):
+    def inc_execprices(self, price: Decimal | int, qty: Decimal | int):
         '''Increment the number of orders matched at a certain price.'''
         self._execprices[price] += qty
 
+    def execprices_fromticks(self):
+        '''Convert the execprices dict from (ticks, lots) to decimal (price, quantity).'''
+        execprices = defaultdict(Decimal)
+        for price, qty in self._execprices.items(): execprices[fromticks_price(price)] = fromticks_quantity(qty)
+        self._execprices = execprices
+
+    def add_fill(self, maker: Optional[OrderId], price: Decimal | int, qty: Decimal | int):
+        '''Record a trade against the resting order `maker` (None for external volume).'''
+        if self._fills is None: raise ValueError(f'{self._kind.name} results do not record fills')
+        self._fills.append((maker, price, qty))
+
+    def fills_fromticks(self):
+        '''Convert the fills from (ticks, lots) to decimal (price, quantity).'''
+        self._fills = [(maker, fromticks_price(p), fromticks_quantity(q)) for maker, p, q in self._fills]
+
+    def n_fills(self) -> int:
+        '''Number of trades recorded.'''
+        return len(self._fills) if self._fills is not None else 0
+
+    def set_first_fill(self, seq: int):
+        '''Set the sequence number of the first fill, the others following consecutively.'''
+        self._first_fill = seq
+
     def inc_orders_matched(self, orders_matched: int):
         '''Increment the total number of orders matched.'''
         self._orders_matched += orders_matched
@@ -83,11 +140,13 @@ class ResultBuilder:
 class ExecutionResult:
     '''The object returned to the client.'''
     _kind: ResultType
-    _orderid: str
+    _orderid: Optional[OrderId]
     _success: bool
-    _messages: list[str]
+    _messages: list[tuple[ResultCode, tuple]]
     _orders_matched: int
     _execprices: Optional[defaultdict[Decimal, Decimal]]
+    _fills: Optional[list[tuple[Optional[OrderId], Decimal, Decimal]]]
+    _first_fill: int
 
     def __init__(self, result: ResultBuilder):
         self._kind = result._kind
@@ -96,12 +155,35 @@ class ExecutionResult:
         self._messages = result._messages
         self._orders_matched = result._orders_matched
         self._execprices = result._execprices
+        self._fills = result._fills
+        self._first_fill = result._first_fill
+
+    @staticmethod
+    def restore(kind: int, orderid: Optional[OrderId], success: bool, messages: list[tuple[ResultCode, tuple]],
+                orders_matched: int, execprices: Optional[defaultdict[Decimal, Decimal]],
+                fills: Optional[list[tuple[Optional[OrderId], Decimal, Decimal]]], first_fill: int):
+        '''Create back a result from its fields, used to unpickle results (e.g. sent by another process).'''
+        result = ExecutionResult.__new__(ExecutionResult)
+        result._kind = ResultType(kind)
+        result._orderid = orderid
+        result._success = success
+        result._messages = messages
+        result._orders_matched = orders_matched
+        result._execprices = execprices
+        result._fills = fills
+        result._first_fill = first_fill
+        return result
+
+    def __reduce__(self):
+        # the fields only (the kind as an integer), pickling the instance dict is about twice slower
+        return ExecutionResult.restore, (self._kind.value, self._orderid, self._success, self._messages,
+                                         self._orders_matched, self._execprices, self._fills, self._first_fill)
 
     def kind(self) -> ResultType:
         '''Getter for the result kind, one of LIMIT, CANCEL, MARKET or ERROR.'''
         return self._kind
 
-    def orderid(self) -> str:
+    def orderid(self) -> Optional[OrderId]:
         '''Getter for identifier of order executed or canceled.'''
         return self._orderid
 
@@ -109,9 +191,13 @@ class ExecutionResult:
         '''Getter for success attribute, true if the operation was executed succesfully.'''
         return self._success
 
+    def codes(self) -> list[ResultCode]:
+        '''Getter for the codes of the info messages.'''
+        return [code for code, _ in self._messages]
+
     def messages(self) -> list[str]:
-        '''Getter for info messages.'''
-        return self._messages.copy()
+        '''Getter for info messages, rendered from their codes.'''
+        return [render_message(code, args) for code, args in self._messages]
 
     def n_orders_matched(self) -> int:
         '''Getter for number of orders matched during execution.'''
@@ -121,6 +207,13 @@ class ExecutionResult:
         '''Getter for execprices dict. This dictionary contains the quantity matched at each price level.'''
         return self._execprices.copy()
 
+    def fills(self) -> list[Fill]:
+        '''Getter for the trades of the execution against resting orders, in execution order (empty if the order did 
+        not match).'''
+        if not self._fills or self._orderid is None: return list()
+        return [Fill(self._first_fill + i, self._orderid, maker, price, qty)
+                for i, (maker, price, qty) in enumerate(self._fills)]
+
     def __repr__(self) -> str:
         if self._messages:
             return f'ExecutionResult(type={self.kind().name}, success={self.success()}, ' + \
@@ -0,0 +1,151 @@
+'''Cumulative depth index over the price levels of a side.'''
+
+from typing import Optional
+from decimal import Decimal
+
+INITIAL_SIZE = 1024
+
+class _SparseTree(dict):
+    '''The positions of a sparse tree, the missing ones being zero. Unlike a `defaultdict`, reading a missing position
+    does not insert it, so that queries do not make the tree dense.'''
+
+    __slots__ = ('_zero',)
+
+    def __init__(self, zero: Decimal | int):
+        super().__init__()
+        self._zero = zero
+
+    def __missing__(self, _):
+        return self._zero
+
+class DepthIndex:
+    '''
+    Two Fenwick (binary indexed) trees over integer price keys, one accumulating the volume of each level and one
+    counting the non-empty levels. Keys are ordered from the best level, so that prefix sums are the cumulative depth
+    of the side.
+
+    Keys are mapped to positions relative to a base key. If `bounds` is provided, the trees are preallocated lists
+    covering the whole range. Otherwise, the trees are sparse (dicts) and the covered range starts with `INITIAL_SIZE`
+    keys around the first key added, it is doubled each time a key falls out of it (the trees being rebuilt from the
+    non-empty levels), so that the cost of an operation is logarithmic in the spread of the prices seen.
+    '''
+
+    _base: Optional[int]
+    _size: int
+    _fixed: bool
+    _zero: Decimal | int
+    _points: dict[int, list]
+    _vtree: list[Decimal | int] | _SparseTree
+    _ltree: list[int] | _SparseTree
+
+    def __init__(self, zero: Decimal | int = 0, bounds: Optional[tuple[int, int]] = None):
+        '''
+        Args:
+            zero (Decimal | int, optional): The zero volume (`Decimal` or `int` depending on the side units).
+                Defaults to 0.
+            bounds (tuple[int, int], optional): The (lowest, highest) keys that will ever be added, in which case the
+                range is never grown. Defaults to None.
+        '''
+
+        self._zero   = zero
+        self._fixed  = bounds is not None
+        self._points = dict()
+
+        if bounds is None: self._alloc(None, INITIAL_SIZE)
+        else: self._alloc(bounds[0], bounds[1] - bounds[0] + 1)
+
+    def add(self, key: int, volume: Decimal | int, levels: int = 0) -> None:
+        '''Add `volume` to the level at `key`, and `levels` (+1 or -1) to the number of non-empty levels.'''
+
+        base = self._base
+        if base is None: base = self._base = key - self._size // 2
+        if not 0 <= key - base < self._size: base = self._grow(key, base)
+
+        if not self._fixed: # keep the point values, to rebuild the trees when growing
+            point = self._points.get(key)
+            if point is None: self._points[key] = [volume, levels]
+            else:
+                point[0] += volume
+                point[1] += levels
+                if not point[1] and not point[0]: del self._points[key]
+
+        self._update(key - base + 1, volume, levels)
+
+    def _update(self, i: int, volume: Decimal | int, levels: int) -> None:
+        '''Add `volume` and `levels` to the (1-based) position `i` in the trees.'''
+
+        vtree, ltree, size = self._vtree, self._ltree, self._size
+        while i <= size:
+            vtree[i] += volume
+            if levels: ltree[i] += levels
+            i += i & -i
+
+    def volume_upto(self, key: int) -> Decimal | int:
+        '''Cumulative volume of the levels from the best one down to `key` (included).'''
+
+        if self._base is None: return self._zero
+        return self._prefix(self._vtree, min(key - self._base + 1, self._size))
+
+    def volume_levels(self, n: int) -> Decimal | int:
+        '''Cumulative volume of the `n` best non-empty levels.'''
+
+        if self._base is None or n <= 0: return self._zero
+        return self._prefix(self._vtree, min(self._search(self._ltree, n), self._size))
+
+    def key_to_fill(self, quantity: Decimal | int) -> Optional[int]:
+        '''The key of the worst level needed to get a cumulative volume of at least `quantity`, None if the whole
+        volume is not enough.'''
+
+        if self._base is None: return None
+        i = self._search(self._vtree, quantity)
+        if i > self._size: return None
+        return self._base + i - 1
+
+    def _prefix(self, tree: list | dict, i: int) -> Decimal | int:
+        '''Sum of the first `i` positions.'''
+
+        total = self._zero
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def _search(self, tree: list | dict, target: Decimal | int) -> int:
+        '''Smallest `i` such that the sum of the first `i` positions is >= target, `size + 1` if there is none.'''
+
+        pos, step = 0, 1 << self._size.bit_length()
+        while step:
+            nxt = pos + step
+            if nxt <= self._size and tree[nxt] < target:
+                pos = nxt
+                target -= tree[nxt]
+            step >>= 1
+        return pos + 1
+
+    def _alloc(self, base: Optional[int], size: int) -> None:
+        zero = self._zero
+
+        self._base = base
+        self._size = size
+
+        if self._fixed:
+            self._vtree = [zero] * (size + 1)
+            self._ltree = [0] * (size + 1)
+        else:
+            self._vtree = _SparseTree(zero)
+            self._ltree = _SparseTree(0)
+
+    def _grow(self, key: int, base: int) -> int:
+        '''Double the covered range (starting at `base`) until it contains `key`, rebuild the trees and return the new 
+        base.'''
+
+        if self._fixed: raise ValueError(f'key {key} is out of the depth index range')
+
+        lo, hi = base, base + self._size - 1
+        while not lo <= key <= hi:
+            if key < lo: lo -= hi - lo + 1
+            else: hi += hi - lo + 1
+
+        self._alloc(lo, hi - lo + 1)
+        for k, (volume, levels) in self._points.items(): self._update(k - lo + 1, volume, levels)
+        return lo
@@ -0,0 +1,167 @@
+'''Dense array-backed price ladder, used as an alternative to the `SortedDict` of a side.'''
+
+from typing import Iterator
+
+from fastlob.limit import Limit
+
+WORD_SIZE = 64
+
+class PriceLadder:
+    '''
+    A preallocated array of limits indexed by tick offset, for instruments trading within a bounded tick range.
+    It exposes the subset of the `SortedDict` interface used by the sides, iterating from the best level.
+
+    Non-empty levels are tracked in a two-level bitmap (64-bit words + a summary of non-empty words), so that the
+    next best level is found without scanning empty levels one by one.
+    '''
+
+    _lo: int
+    _hi: int
+    _reverse: bool
+    _levels: list
+    # ^ the limit of each tick offset, None for the empty levels (the levels flagged in the bitmap are never None)
+    _words: list[int]
+    _summary: int
+    _size: int
+    _best: int
+
+    def __init__(self, lo: int, hi: int, reverse: bool = False):
+        '''
+        Args:
+            lo (int): Lowest price (in ticks) that can be stored.
+            hi (int): Highest price (in ticks) that can be stored.
+            reverse (bool, optional): If true, the best level is the highest (bid side). Defaults to False.
+        '''
+
+        if not isinstance(lo, int) or not isinstance(hi, int) or lo > hi:
+            raise ValueError(f'invalid ladder bounds ({lo}, {hi})')
+
+        self._lo       = lo
+        self._hi       = hi
+        self._reverse  = reverse
+        self._levels   = [None] * (hi - lo + 1)
+        self._words    = [0] * ((hi - lo) // WORD_SIZE + 1)
+        self._summary  = 0
+        self._size     = 0
+        self._best     = -1
+
+    def bounds(self) -> tuple[int, int]:
+        '''Get the (lowest, highest) prices that can be stored in the ladder.'''
+
+        return self._lo, self._hi
+
+    def in_range(self, price: int) -> bool:
+        '''True if `price` can be stored in the ladder.'''
+
+        return self._lo <= price <= self._hi
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, price: int) -> bool:
+        return self._lo <= price <= self._hi and self._levels[price - self._lo] is not None
+
+    def __getitem__(self, price: int) -> Limit:
+        lim = self._levels[price - self._lo] if self._lo <= price <= self._hi else None
+        if lim is None: raise KeyError(price)
+        return lim
+
+    def __setitem__(self, price: int, lim: Limit) -> None:
+        if not self._lo <= price <= self._hi:
+            raise ValueError(f'price {price} is out of the ladder range [{self._lo}, {self._hi}]')
+
+        i = price - self._lo
+        if self._levels[i] is None: self._set(i)
+        self._levels[i] = lim
+
+    def __delitem__(self, price: int) -> None:
+        self.pop(price)
+
+    def pop(self, price: int) -> Limit:
+        '''Remove the limit sitting at `price` and return it.'''
+
+        lim = self[price]
+        i = price - self._lo
+        self._levels[i] = None
+        self._clear(i)
+        return lim
+
+    def peekitem(self, index: int = 0) -> tuple[int, Limit]:
+        '''Get the (price, limit) pair of the best level, only `index=0` is supported.'''
+
+        if index != 0: raise IndexError('only the best level (index 0) can be peeked')
+        if self._best < 0: raise IndexError('ladder is empty')
+        return self._best + self._lo, self._levels[self._best]
+
+    def keys(self) -> Iterator[int]:
+        '''Iterate over prices, from the best one.'''
+
+        lo = self._lo
+        return (i + lo for i in self._indices())
+
+    def values(self) -> Iterator[Limit]:
+        '''Iterate over limits, from the best one.'''
+
+        levels = self._levels
+        return (levels[i] for i in self._indices())
+
+    def items(self) -> Iterator[tuple[int, Limit]]:
+        '''Iterate over (price, limit) pairs, from the best one.'''
+
+        lo, levels = self._lo, self._levels
+        return ((i + lo, levels[i]) for i in self._indices())
+
+    def _set(self, i: int) -> None:
+        w, b = divmod(i, WORD_SIZE)
+        if not self._words[w]: self._summary |= 1 << w
+        self._words[w] |= 1 << b
+        self._size += 1
+
+        if self._best < 0 or (i > self._best if self._reverse else i < self._best): self._best = i
+
+    def _clear(self, i: int) -> None:
+        w, b = divmod(i, WORD_SIZE)
+        self._words[w] &= ~(1 << b)
+        if not self._words[w]: self._summary &= ~(1 << w)
+        self._size -= 1
+
+        if i == self._best: self._best = self._find_best()
+
+    def _find_best(self) -> int:
+        summary = self._summary
+        if not summary: return -1
+
+        if self._reverse:
+            w = summary.bit_length() - 1
+            return w * WORD_SIZE + self._words[w].bit_length() - 1
+
+        w = (summary & -summary).bit_length() - 1
+        word = self._words[w]
+        return w * WORD_SIZE + (word & -word).bit_length() - 1
+
+    def _indices(self) -> Iterator[int]:
+        '''Iterate over the indices of non-empty levels, from the best one.'''
+
+        words = self._words
+        summary = self._summary
+
+        if self._reverse:
+            while summary:
+                w = summary.bit_length() - 1
+                summary ^= 1 << w
+                word = words[w]
+                while word:
+                    b = word.bit_length() - 1
+                    word ^= 1 << b
+                    yield w * WORD_SIZE + b
+            return
+
+        while summary:
+            low = summary & -summary
+            summary ^= low
+            w = low.bit_length() - 1
+            word = words[w]
+            while word:
+                bit = word & -word
+                word ^= bit
+                yield w * WORD_SIZE + bit.bit_length() - 1
@@ -0,0 +1,61 @@
+'''Locks used by the sides of a lob driven by a single thread, where the mutual exclusion is not needed.'''
+
+import threading
+from typing import Optional
+
+class NoLock:
+    '''A lock that does nothing, used in single-writer mode.'''
+
+    __slots__ = ()
+
+    # `with` looks these up on the type without binding them (a builtin method is not a descriptor), so they are 
+    # called with no argument and with the exception triple respectively. A builtin returning a falsy value, so that
+    # exceptions are not suppressed, makes the with statement more than twice as fast as with Python methods.
+    __enter__ = __exit__ = ''.format
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool: return True
+
+    def release(self) -> None: pass
+
+    def locked(self) -> bool: return False
+
+class AffinityLock:
+    '''A lock that does nothing but checking that it is always acquired by the same thread (the first one to acquire
+    it), used in single-writer mode to catch a lob driven by several threads.'''
+
+    __slots__ = ('_owner',)
+
+    _owner: Optional[int]
+
+    def __init__(self):
+        self._owner = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, a, b, c): return None
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        ident = threading.get_ident()
+        if self._owner is None: self._owner = ident
+        elif ident != self._owner:
+            raise RuntimeError(f'single-writer lob used by thread {ident}, but it is owned by thread {self._owner}')
+        return True
+
+    def release(self) -> None: pass
+
+    def locked(self) -> bool: return False
+
+    def owner(self) -> Optional[int]:
+        '''Identifier of the thread owning the lock, None if it was never acquired.'''
+
+        return self._owner
+
+def make_lock(single_writer: bool = False, check_affinity: bool = False):
+    '''Build the lock of a side: a mutex, or a no-op lock in single-writer mode (checking the thread affinity if
+    asked to, and if Python does not run with -O).'''
+
+    if not single_writer: return threading.Lock()
+    if check_affinity and __debug__: return AffinityLock()
+    return NoLock()
@@ -10,45 +10,169 @@ from collections.abc import Sequence
 from sortedcontainers import SortedDict
 
 from fastlob.limit import Limit
-from fastlob.order import Order, BidOrder, AskOrder, OrderParams
-from fastlob.utils import zero
-from fastlob.enums import OrderSide, OrderType
+from fastlob.order import Order, BidOrder, AskOrder
+from fastlob.utils import zero, toticks_price, toticks_quantity, fromticks_price, fromticks_quantity
+from fastlob.enums import OrderSide, OrderType, ResultCode
 
-from .utils import check_snapshot_pair, check_update_pair, todecimal_pair
+from fastlob.l2 import LevelsView
+
+from .utils import check_snapshot_pair, check_update_pair, todecimal_pair, check_level, check_ticks, is_columnar, \
+    columns_toticks
+from .ladder import PriceLadder
+from .depth import DepthIndex
+from .locks import make_lock, NoLock, AffinityLock
 
 class Side(abc.ABC):
     '''The Side is a collection of limits, whose ordering (by price) depends wether it is a bid or ask side.'''
 
     _side: OrderSide
-    _volume: Decimal
-    _price2limits: SortedDict[Decimal, Limit]
+    _volume: Decimal | int
+    _price2limits: SortedDict
+    # ^ maps prices to limits, a `PriceLadder` (that exposes the same interface) replacing it in tick mode when the 
+    # side has a ladder
+    _ticks: bool
+    _tombstones_avoided: int
+    _top: Optional[tuple[Decimal | int, Decimal | int, int]]
+    _top_version: int
+    _depth: Optional[DepthIndex]
+    _changes: Optional[set[Decimal | int]]
+    # ^ prices of the limits whose volume changed since the last `pop_changes`, None if changes are not tracked
+    _sign: int
+    # ^ +1 if the best price is the lowest one, -1 otherwise, used to order the keys of the depth index from the best
     _mutex: threading.Lock
     # ^ the role of this mutex is to prevent a limit order being canceled meanwhile we are matching a market order
-    # it must be locked by any other class before it can execute or cancel an order in the side
-
-    def __init__(self):
-        self._volume = zero()
-        self._mutex = threading.Lock()
+    # it must be locked by any other class before it can execute or cancel an order in the side (a no-op lock in 
+    # single-writer mode)
+
+    def __init__(self, ticks: bool = False, ladder: Optional[tuple[int, int]] = None, depth_index: bool = False,
+                 single_writer: bool = False, check_affinity: bool = False):
+        '''
+        Args:
+            ticks (bool, optional): If true, prices and volumes are integer ticks and lots. Defaults to False.
+            ladder (tuple[int, int], optional): If set, the (lowest, highest) prices in ticks of a dense price ladder 
+                used to store the limits instead of a `SortedDict`. Requires `ticks`. Defaults to None.
+            depth_index (bool, optional): If true, the side maintains a cumulative depth index, so that depth queries
+                run in logarithmic time instead of walking the limits. Defaults to False.
+            single_writer (bool, optional): If true, the side is only used by one thread and its lock does nothing. 
+                Defaults to False.
+            check_affinity (bool, optional): If true (and in single-writer mode), acquiring the lock raises a 
+                `RuntimeError` if done by another thread than the first one to acquire it. Ignored when Python runs 
+                with -O. Defaults to False.
+        '''
+
+        if ladder is not None and not ticks: raise ValueError('a price ladder can only be used in tick mode')
+
+        self._ticks = ticks
+        self._tombstones_avoided = 0
+        self._top = None
+        self._top_version = 0
+        self._volume = 0 if ticks else zero()
+        self._changes = None
+        self._mutex = make_lock(single_writer, check_affinity)
+
+        self._depth = None
+        if depth_index:
+            bounds = None
+            if ladder is not None:
+                lo, hi = self._sign * ladder[0], self._sign * ladder[1]
+                bounds = min(lo, hi), max(lo, hi)
+            self._depth = DepthIndex(0 if ticks else zero(), bounds)
 
     def lock(self):
         '''Returns the side mutex lock.'''
 
         return self._mutex
 
+    def single_writer(self) -> bool:
+        '''True if the side is in single-writer mode (its lock does nothing).'''
+
+        return isinstance(self._mutex, (NoLock, AffinityLock))
+
     def side(self) -> OrderSide:
         '''Get the side of the limit.'''
 
         return self._side
 
-    def volume(self) -> Decimal:
+    def ticks(self) -> bool:
+        '''True if prices and volumes are stored as integer ticks and lots.'''
+
+        return self._ticks
+
+    def volume(self) -> Decimal | int:
         '''Getter for side volume, that is the sum of the volume of all limits.'''
 
         return self._volume
 
-    def update_volume(self, update: Decimal) -> None:
-        '''Add `update` to current side volume.'''
+    def depth_index(self) -> bool:
+        '''True if the side maintains a cumulative depth index.'''
+
+        return self._depth is not None
+
+    def tombstones_avoided(self) -> int:
+        '''Number of orders unlinked from their limit queue on cancellation, instead of being left as dead entries.'''
+
+        return self._tombstones_avoided
+
+    def update_volume(self, update: Decimal | int, price: Decimal | int) -> None:
+        '''Add `update` to current side volume, `update` being the volume change of the limit sitting at `price`.'''
 
         self._volume += update
+        if self._depth is not None: self._depth.add(self._key(price), update)
+        if self._changes is not None: self._changes.add(price)
+
+    def track_changes(self, enabled: bool) -> None:
+        '''Start (or stop) recording the prices of the limits that change, see `pop_changes`.'''
+
+        if not enabled: self._changes = None
+        elif self._changes is None: self._changes = set()
+
+    def pop_changes(self) -> list[tuple[Decimal | int, Decimal | int, int]]:
+        '''The (price, volume, #orders) triplets of the limits that changed since the last call (best first), a 
+        removed limit having a volume of 0. Changes must be tracked (`track_changes`).'''
+
+        changes, self._changes = self._changes, set()
+        if not changes: return list()
+
+        empty, levels = self._zero(), list()
+        for price in sorted(changes, key=self._key):
+            if price in self._price2limits:
+                lim = self._price2limits[price]
+                levels.append((price, lim.volume(), lim.valid_orders()))
+            else: levels.append((price, empty, 0))
+        return levels
+
+    def depth(self, n: int) -> Decimal | int:
+        '''Cumulative volume of the `n` best limits.'''
+
+        if self._depth is not None: return self._depth.volume_levels(n)
+        return sum((lim[1] for lim in self.best_limits(n)), start=self._zero())
+
+    def volume_upto(self, price: Decimal | int) -> Decimal | int:
+        '''Cumulative volume of the limits from the best one down to `price` (included).'''
+
+        if self._depth is not None: return self._depth.volume_upto(self._key(price))
+
+        volume = self._zero()
+        for lim in self.limits():
+            if self._behind(lim.price(), price): break
+            volume += lim.volume()
+        return volume
+
+    def price_to_fill(self, quantity: Decimal | int) -> Optional[Decimal | int]:
+        '''Price of the worst limit a market order of size `quantity` would have to reach to be entirely filled, None
+        if the side volume is not enough.'''
+
+        if self._depth is not None:
+            key = self._depth.key_to_fill(quantity)
+            if key is None: return None
+            tick = self._sign * key
+            return tick if self._ticks else fromticks_price(tick)
+
+        volume = self._zero()
+        for lim in self.limits():
+            volume += lim.volume()
+            if volume >= quantity: return lim.price()
+        return None
 
     def size(self) -> int:
         '''Get number of limits in the side.'''
@@ -65,7 +189,34 @@ class Side(abc.ABC):
 
         return self._price2limits.peekitem(0)[1]
 
-    def best_limits(self, n: int) -> list[tuple[Decimal, Decimal, int]]:
+    def top(self) -> Optional[tuple[Decimal | int, Decimal | int, int]]:
+        '''Get the cached (price, volume, #orders) triplet of the best limit, None if the side is empty.'''
+
+        return self._top
+
+    def top_version(self) -> int:
+        '''Version of the cached top of the side, incremented each time the best (price, volume, #orders) changes.'''
+
+        return self._top_version
+
+    def refresh_top(self, price: Optional[Decimal | int] = None) -> None:
+        '''Update the cached top of the side after the limit at `price` was modified. Limits behind the best one can
+        not change the top, so the side is only looked up if `price` is at or better than the cached best price. If
+        `price` is None, the top is always looked up.'''
+
+        top = self._top
+        if price is not None and top is not None and self._behind(price, top[0]): return
+
+        if self._price2limits:
+            lim = self._price2limits.peekitem(0)[1]
+            new = (lim.price(), lim.volume(), lim.valid_orders())
+        else: new = None
+
+        if new != top:
+            self._top = new
+            self._top_version += 1
+
+    def best_limits(self, n: int) -> list[tuple[Decimal | int, Decimal | int, int]]:
         '''Returns a triplet (price, volume, #orders) for the best `n` price levels.'''
 
         result = list()
@@ -88,24 +239,44 @@ class Side(abc.ABC):
         price = order.price()
         self._new_price_if_not_exists(price)
         self.get_limit(price).enqueue(order)
-        self._volume += order.quantity()
+        self.update_volume(order.quantity(), price)
+        self.refresh_top(price)
 
-    def update_order(self, order: Order, new_qty: Decimal) -> None:
+    def update_order(self, order: Order, new_qty: Decimal | int) -> None:
         '''Update an order sitting in the side.'''
         diff = new_qty - order.quantity()
-        self._volume += diff
+        self.update_volume(diff, order.price())
         lim = self.get_limit(order.price())
         lim.update_order(order, new_qty)
+        self.refresh_top(order.price())
 
     def cancel_order(self, order: Order) -> None:
         '''Cancel an order sitting in the side.'''
 
-        self._volume -= order.quantity()
+        self.update_volume(-order.quantity(), order.price())
         lim = self.get_limit(order.price())
         lim.cancel_order(order)
-        if lim.empty(): del self._price2limits[lim.price()]
+        self._tombstones_avoided += 1
+        if lim.empty(): self.pop_limit(lim.price())
+        self.refresh_top(lim.price())
+
+    def restore_limit(self, price: Decimal | int, orders: list[Order], external: Decimal | int, ahead: int) -> None:
+        '''Create back the limit at `price` from its saved state (see `Limit.restore`). The cached top is not 
+        refreshed, `refresh_top` must be called once all the limits are restored.'''
+
+        self._new_price(price)
+        limit = self.get_limit(price)
+        limit.restore(orders, external, ahead)
+        self.update_volume(limit.volume(), price)
+
+    def in_range(self, price: Decimal | int) -> bool:
+        '''True if a limit can be created at `price` (always true unless the side is backed by a price ladder).'''
+
+        if isinstance(self._price2limits, PriceLadder) and isinstance(price, int):
+            return self._price2limits.in_range(price)
+        return True
 
-    def get_limit(self, price: Decimal) -> Limit:
+    def get_limit(self, price: Decimal | int) -> Limit:
         '''Get the limit sitting at a certain price.'''
 
         return self._price2limits[price]
@@ -114,27 +285,29 @@ class Side(abc.ABC):
         '''Delete a limit from the side.'''
 
         self._price2limits.pop(price) # remove limit from side
+        if self._depth is not None: self._depth.add(self._key(price), 0, -1)
 
-    def check_market_order(self, order: Order) -> Optional[str]:
-        '''Check if a market order is valid.'''
+    def check_market_order(self, order: Order) -> Optional[ResultCode]:
+        '''Check if a market order is valid, returns the error code if not.'''
 
         match order.otype():
             case OrderType.FOK: # check that order quantity can be filled
                 if not self.immediately_matched(order):
-                    return 'FOK bid order is not immediately matchable'
+                    return ResultCode.FOK_NOT_MATCHABLE
         return None
 
-    def _price_exists(self, price: Decimal) -> bool:
+    def _price_exists(self, price: Decimal | int) -> bool:
         '''Check there is a limit at a certain price.'''
 
-        return price in self._price2limits.keys()
+        return price in self._price2limits
 
-    def _new_price(self, price: Decimal) -> None:
+    def _new_price(self, price: Decimal | int) -> None:
         '''Create a new price level in the side.'''
 
-        self._price2limits[price] = Limit(price)
+        self._price2limits[price] = Limit(price, self._ticks)
+        if self._depth is not None: self._depth.add(self._key(price), 0, 1)
 
-    def _new_price_if_not_exists(self, price: Decimal) -> None:
+    def _new_price_if_not_exists(self, price: Decimal | int) -> None:
         '''Create new price level if doesn't exist.'''
 
         if not self._price_exists(price): self._new_price(price)
@@ -143,6 +316,10 @@ class Side(abc.ABC):
         if self.empty(): return f'{self.side().name}Side(size={self.size()}, volume={self.volume()})'
         return f'{self.side().name}Side(size={self.size()}, volume={self.volume()}, best={self.best()})'
 
+    @abc.abstractmethod
+    def _behind(self, price: Decimal | int, best: Decimal | int) -> bool:
+        '''True if a limit at `price` is strictly behind the best limit sitting at `best`.'''
+
     @abc.abstractmethod
     def is_market(self, order: Order) -> bool:
         '''Check if an order of the opposite side is market.'''
@@ -153,49 +330,98 @@ class Side(abc.ABC):
         when checking that a FOK order is valid.'''
 
     @abc.abstractmethod
+    def view(self, n : int) -> str:
+        '''Get a pretty-printed view of the side.'''
+
+    #### RELATED TO EXTERNAL VOLUME
+
     def apply_snapshot(self, snapshot: Iterable[tuple[Number, Number]]):
-        '''Initialize side with predefined volume for price levels.'''
+        '''Initialize side with predefined volume for price levels. The levels are either an iterable of (price, 
+        volume) pairs, a numpy array of shape (n, 2), or a (prices, volumes) tuple of numpy arrays.'''
+
+        self.apply_levels(*self.levels(snapshot, snapshot=True))
 
-    @abc.abstractmethod
     def apply_updates(self, updates: Iterable[tuple[Number, Number]]):
-        '''Apply price level updates to side.'''
+        '''Apply price level updates to side, a volume of 0 deletes the level. Accepts the same forms as 
+        `apply_snapshot`.'''
 
-    @abc.abstractmethod
-    def view(self, n : int) -> str:
-        '''Get a pretty-printed view of the side.'''
+        self.apply_levels(*self.levels(updates))
 
-    #### RELATED TO FAKE ORDERS
+    def apply_levels(self, prices: list[Decimal | int], volumes: list[Decimal | int]) -> None:
+        '''Set the external volume of each level, prices and volumes being validated and in the side units.'''
 
-    def place_fakeorder(self, order: Order):
-        '''Place a fake order in the side.'''
+        for price, volume in zip(prices, volumes): self.set_external(price, volume)
 
-        if not self._price_exists(order.price()):
-            self._new_price(order.price())
+    def levels(self, levels, snapshot: bool = False) -> tuple[list, list]:
+        '''Validate levels and convert them to (prices, volumes) lists in the side units.'''
 
-        limit = self.get_limit(order.price())
-        prev_limit_volume = limit.volume()
+        prices: list
+        volumes: list
+
+        if isinstance(levels, LevelsView): # already in ticks and lots, read from a binary L2 file
+            values = levels.ticks()
+            prices, volumes = values[0::2].tolist(), values[1::2].tolist()
+            check_ticks(prices, volumes, snapshot)
+            if self._ticks: return prices, volumes
+            return [fromticks_price(p) for p in prices], [fromticks_quantity(v) for v in volumes]
+
+        if is_columnar(levels):
+            prices, volumes = columns_toticks(levels, snapshot)
+            if self._ticks: return prices, volumes
+            return [fromticks_price(p) for p in prices], [fromticks_quantity(v) for v in volumes]
+
+        prices, volumes = list(), list()
+        for pair in levels:
+            if snapshot: check_snapshot_pair(pair)
+            else: check_update_pair(pair)
 
-        limit.set_fakeorder(order)
-        self.update_volume(limit.volume() - prev_limit_volume)
+            price, volume = todecimal_pair(pair)
+            if pair[1] != 0: check_level(price, volume) # volumes rounding to 0 are invalid, not deletions
+            prices.append(toticks_price(price) if self._ticks else price)
+            volumes.append(toticks_quantity(volume) if self._ticks else volume)
+
+        return prices, volumes
 
-    def delete_fakeorder(self, price: Decimal):
-        '''Delete a fake order at price level `price`.'''
+    def set_external(self, price: Decimal | int, volume: Decimal | int) -> None:
+        '''Overwrite the external volume of the limit at `price`, a volume of 0 removes it (and the limit if it has 
+        no orders left).'''
 
-        if not self._price_exists(price): return
+        if not self._price_exists(price):
+            if not volume: return
+            self._new_price(price)
 
         limit = self.get_limit(price)
-        if not limit.fakeorder_exists(): return
+        prev_limit_volume = limit.volume()
+
+        limit.set_external(volume)
+        self.update_volume(limit.volume() - prev_limit_volume, price)
+        if limit.empty(): self.pop_limit(price)
+        self.refresh_top(price)
+
+    def _zero(self) -> Decimal | int:
+        '''The zero volume in the side units.'''
 
-        limit.delete_fakeorder()
-        if limit.volume() == 0.0: self.pop_limit(price)
+        return 0 if self._ticks else zero()
+
+    def _key(self, price: Decimal | int) -> int:
+        '''Key of a price in the depth index.'''
+
+        return self._sign * (price if isinstance(price, int) else toticks_price(price))
 
 class BidSide(Side):
     '''The bid side, where **the best price level is the highest**.'''
 
-    def __init__(self):
-        super().__init__()
+    _sign = -1
+
+    def __init__(self, ticks: bool = False, ladder: Optional[tuple[int, int]] = None, depth_index: bool = False,
+                 single_writer: bool = False, check_affinity: bool = False):
+        super().__init__(ticks, ladder, depth_index, single_writer, check_affinity)
         self._side = OrderSide.BID
-        self._price2limits = SortedDict(lambda x: -x)
+        if ladder is None: self._price2limits = SortedDict(lambda x: -x)
+        else: self._price2limits = PriceLadder(*ladder, reverse=True)
+
+    def _behind(self, price, best):
+        return price < best
 
     def is_market(self, order: AskOrder) -> bool:
         if self.empty(): return False
@@ -204,7 +430,9 @@ class BidSide(Side):
 
     def immediately_matched(self, order: AskOrder) -> bool:
         # we want the limit volume down to the order price to be >= order quantity
-        volume = zero()
+        if self._depth is not None: return self._depth.volume_upto(self._key(order.price())) >= order.quantity()
+
+        volume: Decimal | int = 0
 
         lim : Limit
         for lim in self.limits():
@@ -215,30 +443,6 @@ class BidSide(Side):
         if volume < order.quantity(): return False
         return True
 
-    def apply_snapshot(self, bids):
-        # apply snapshot (init side) to askside
-        for pair in bids:
-            check_snapshot_pair(pair)
-            price, volume = pair
-
-            params = OrderParams(OrderSide.BID, price, volume, OrderType.FAKE)
-            order  = BidOrder(params)
-            self.place_fakeorder(order)
-
-    def apply_updates(self, bids):
-        # apply updates to bid side
-        for pair in bids:
-            check_update_pair(pair)
-            price, volume = todecimal_pair(pair)
-
-            if volume == 0:
-                self.delete_fakeorder(price)
-                continue
-
-            params = OrderParams(OrderSide.BID, price, volume, OrderType.FAKE)
-            order  = BidOrder(params)
-            self.place_fakeorder(order)
-
     def view(self, n : int = 10) -> str:
         if self.empty(): return str()
 
@@ -257,10 +461,17 @@ class BidSide(Side):
 class AskSide(Side):
     '''The bid side, where **the best price level is the lowest**.'''
 
-    def __init__(self):
-        super().__init__()
+    _sign = 1
+
+    def __init__(self, ticks: bool = False, ladder: Optional[tuple[int, int]] = None, depth_index: bool = False,
+                 single_writer: bool = False, check_affinity: bool = False):
+        super().__init__(ticks, ladder, depth_index, single_writer, check_affinity)
         self._side = OrderSide.ASK
-        self._price2limits = SortedDict()
+        if ladder is None: self._price2limits = SortedDict()
+        else: self._price2limits = PriceLadder(*ladder)
+
+    def _behind(self, price, best):
+        return price > best
 
     def is_market(self, order: BidOrder) -> bool:
         if self.empty(): return False
@@ -269,7 +480,9 @@ class AskSide(Side):
 
     def immediately_matched(self, order: BidOrder) -> bool:
         # we want the limit volume down to the order price to be >= order quantity
-        volume = zero()
+        if self._depth is not None: return self._depth.volume_upto(self._key(order.price())) >= order.quantity()
+
+        volume: Decimal | int = 0
         limits = self.limits()
 
         lim : Limit
@@ -281,30 +494,6 @@ class AskSide(Side):
         if volume < order.quantity(): return False
         return True
 
-    def apply_snapshot(self, asks):
-        # apply snapshot (init side) to askside
-        for pair in asks:
-            check_snapshot_pair(pair)
-            price, volume = pair
-
-            params = OrderParams(OrderSide.ASK, price, volume, OrderType.FAKE)
-            order  = AskOrder(params)
-            self.place_fakeorder(order)
-
-    def apply_updates(self, asks):
-        # apply updates to ask side
-        for pair in asks:
-            check_update_pair(pair)
-            price, volume = todecimal_pair(pair)
-
-            if volume == 0:
-                self.delete_fakeorder(price)
-                continue
-
-            params = OrderParams(OrderSide.ASK, price, volume, OrderType.FAKE)
-            order  = AskOrder(params)
-            self.place_fakeorder(order)
-
     def view(self, n : int = 10) -> str:
         if self.empty(): return str()
 
@@ -2,8 +2,13 @@
 
 from numbers import Number
 from decimal import Decimal
+from typing import Any
 
-from fastlob.utils import zero, todecimal_price, todecimal_quantity
+from fastlob.utils import zero, todecimal_price, todecimal_quantity, toticks_price, toticks_quantity
+from fastlob.consts import DECIMAL_PRECISION_PRICE, DECIMAL_PRECISION_QTY, TICK_SIZE_PRICE, TICK_SIZE_QTY, MAX_VALUE
+
+try: import numpy as np
+except ImportError: np = None # type: ignore[assignment] # numpy is optional, only needed for columnar updates
 
 def todecimal_pair(pair: tuple[Number, Number]) -> tuple[Decimal, Decimal]:
     price, volume = pair
@@ -29,3 +34,75 @@ def check_snapshot_pair(pair):
 
     _, volume = pair
     if volume <= 0: raise ValueError(f'volume must be strictly positive but is {volume}')
+
+def check_level(price: Decimal, volume: Decimal) -> None:
+    '''Raise an exception if a (rounded, non-deleting) level can not be placed in the side.'''
+
+    if price < TICK_SIZE_PRICE: raise ValueError(f'price ({price}) must be greater than {TICK_SIZE_PRICE}')
+    if volume < TICK_SIZE_QTY: raise ValueError(f'quantity ({volume}) must be greater than {TICK_SIZE_QTY}')
+    if price > MAX_VALUE: raise ValueError(f'price ({price}) is too large')
+    if volume > MAX_VALUE: raise ValueError(f'quantity ({volume}) is too large')
+
+def check_ticks(prices: list[int], volumes: list[int], snapshot: bool = False) -> None:
+    '''Raise an exception if levels already in integer ticks and lots can not be processed.'''
+
+    if not prices: return
+
+    if min(prices) < 1: raise ValueError(f'prices must be greater than {TICK_SIZE_PRICE}')
+    if max(prices) > int(MAX_VALUE) * 10 ** DECIMAL_PRECISION_PRICE: raise ValueError('prices are too large')
+    if min(volumes) < (1 if snapshot else 0): raise ValueError(f'volumes must be greater than {TICK_SIZE_QTY}')
+    if max(volumes) > int(MAX_VALUE) * 10 ** DECIMAL_PRECISION_QTY: raise ValueError('volumes are too large')
+
+def is_columnar(levels: Any) -> bool:
+    '''True if `levels` is a numpy array of (price, volume) rows, or a (prices, volumes) pair of numpy arrays.'''
+
+    if np is None: return False
+    if isinstance(levels, np.ndarray): return True
+    return isinstance(levels, tuple) and len(levels) == 2 and all(isinstance(a, np.ndarray) for a in levels)
+
+def columns_toticks(levels: Any, snapshot: bool = False) -> tuple[list[int], list[int]]:
+    '''
+    Validate columnar levels and convert them to integer ticks and lots (rounded as `todecimal_price` and 
+    `todecimal_quantity` do), vectorized over the whole batch. Raise an exception if one of the levels can not be 
+    processed.
+    '''
+
+    if isinstance(levels, np.ndarray):
+        if levels.ndim != 2 or levels.shape[1] != 2: raise ValueError('levels array must be of shape (n, 2)')
+        prices, volumes = levels[:, 0], levels[:, 1]
+    else:
+        prices, volumes = levels
+        if prices.ndim != 1 or prices.shape != volumes.shape:
+            raise ValueError('prices and volumes must be 1-d arrays of the same length')
+
+    prices, volumes = prices.astype(np.float64, copy=False), volumes.astype(np.float64, copy=False)
+
+    if not (np.isfinite(prices).all() and np.isfinite(volumes).all()):
+        raise ValueError('prices and volumes must be finite')
+
+    if snapshot and (volumes <= 0).any(): raise ValueError('volumes must be strictly positive')
+
+    ticks = _rint(prices, DECIMAL_PRECISION_PRICE, lambda x: toticks_price(todecimal_price(x)))
+    lots = _rint(volumes, DECIMAL_PRECISION_QTY, lambda x: toticks_quantity(todecimal_quantity(x)))
+    placed = volumes != 0 # zero volumes delete the level
+
+    if (ticks < 1).any(): raise ValueError(f'prices must be greater than {TICK_SIZE_PRICE}')
+    if (ticks > int(MAX_VALUE) * 10 ** DECIMAL_PRECISION_PRICE).any(): raise ValueError('prices are too large')
+    if (placed & (lots < 1)).any(): raise ValueError(f'volumes must be greater than {TICK_SIZE_QTY}')
+    if (lots > int(MAX_VALUE) * 10 ** DECIMAL_PRECISION_QTY).any(): raise ValueError('volumes are too large')
+
+    return ticks.astype(np.int64).tolist(), lots.astype(np.int64).tolist()
+
+def _rint(values: Any, precision: int, exact) -> Any:
+    '''
+    Round `values * 10**precision` to the nearest integer. The product is inexact (2.675 * 100 = 267.49999...), so 
+    the values that may be at a tie are rounded by `exact`, on their exact binary value as the pairs path does.
+    '''
+
+    scaled = values * 10 ** precision
+    rounded = np.rint(scaled)
+
+    ties = np.abs(scaled - np.floor(scaled) - 0.5) <= np.spacing(np.abs(scaled))
+    for i in np.flatnonzero(ties): rounded[i] = exact(float(values[i]))
+
+    return rounded
@@ -0,0 +1,4 @@
+'''Synthetic order flows drawn with numpy from a seed, streamed into a lob.'''
+
+from .flow import OrderFlow, Batch, LIMIT, MARKET, CANCEL, UPDATE
+from .runner import run
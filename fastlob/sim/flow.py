@@ -0,0 +1,191 @@
+'''Synthetic order flow, drawn in bulk with numpy from a seed.'''
+
+from typing import Optional, Iterator
+
+from fastlob.order import OrderParams
+from fastlob.enums import OrderSide, OrderType
+from fastlob.utils import fromticks_price, fromticks_quantity
+from fastlob.consts import DECIMAL_PRECISION_PRICE, DECIMAL_PRECISION_QTY
+
+try: import numpy as np
+except ImportError: np = None # type: ignore[assignment] # numpy is optional, only needed for the simulation
+
+LIMIT = 0
+MARKET = 1
+CANCEL = 2
+UPDATE = 3
+
+_SIDES = (OrderSide.BID, OrderSide.ASK)
+
+class Batch:
+    '''
+    A batch of consecutive events of an `OrderFlow`, as columns (numpy arrays) with one row per event:
+
+    - `kinds`: LIMIT, MARKET, CANCEL or UPDATE.
+    - `times`: arrival time of the event, in seconds of simulated time.
+    - `sides`: 0 for bids and 1 for asks (orders only).
+    - `prices`: price of the orders, in ticks (orders only).
+    - `quantities`: quantity of the orders, or new quantity of the updated orders, in lots.
+    - `targets`: for cancellations and updates, the index of the order they target in the flow (the first order of
+      the flow having index 0), -1 for orders or if no order was generated yet.
+    '''
+
+    __slots__ = ('kinds', 'times', 'sides', 'prices', 'quantities', 'targets', 'first_order')
+
+    kinds: 'np.ndarray'
+    times: 'np.ndarray'
+    sides: 'np.ndarray'
+    prices: 'np.ndarray'
+    quantities: 'np.ndarray'
+    targets: 'np.ndarray'
+    first_order: int
+    # ^ index in the flow of the first order of the batch
+
+    def __init__(self, kinds, times, sides, prices, quantities, targets, first_order: int):
+        self.kinds       = kinds
+        self.times       = times
+        self.sides       = sides
+        self.prices      = prices
+        self.quantities  = quantities
+        self.targets     = targets
+        self.first_order = first_order
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def n_orders(self) -> int:
+        '''Number of orders (limit and market) in the batch.'''
+
+        return int(np.count_nonzero(self.kinds <= MARKET))
+
+    def params(self) -> list[OrderParams]:
+        '''The params of the orders (limit and market) of the batch, in order, cancellations and updates being left
+        out. They are built without being checked again, since the flow only draws valid prices and quantities.'''
+
+        orders = self.kinds <= MARKET
+        restore = OrderParams.restore
+        prices = _decimals(self.prices[orders], fromticks_price)
+        quantities = _decimals(self.quantities[orders], fromticks_quantity)
+        return [restore(_SIDES[side], price, qty, OrderType.GTC, None)
+                for side, price, qty in zip(self.sides[orders].tolist(), prices, quantities)]
+
+def _decimals(values: 'np.ndarray', convert) -> list:
+    '''Convert integer ticks (or lots) to decimals, each distinct value being converted once.'''
+
+    unique, inverse = np.unique(values, return_inverse=True)
+    decimals = [convert(value) for value in unique.tolist()]
+    return [decimals[i] for i in inverse.tolist()]
+
+class OrderFlow:
+    '''
+    A stream of random orders, cancellations and updates, reproducible from its seed.
+
+    Events arrive as a Poisson process of rate `rate` (per second of simulated time). Limit orders are placed on
+    their side of the reference midprice, at an exponentially distributed offset from it, and market orders are
+    limit orders crossing the midprice by an exponentially distributed reach, so that they sweep a few levels.
+    Quantities are log-normal. Cancellations and updates target one of the `window` last orders of the flow, that
+    may have been filled or canceled already (they then fail, as late requests of a real client would).
+
+    All the draws of a batch are done at once with numpy, in columns (see `Batch`).
+    '''
+
+    _rng: 'np.random.Generator'
+    _midprice: float
+    _rate: float
+    _probabilities: list[float]
+    _offset: float
+    _reach: float
+    _quantity: float
+    _sigma: float
+    _window: int
+    _time: float
+    _orders: int
+
+    def __init__(self, seed: int = 0, midprice: float = 100, rate: float = 1000, p_market: float = 0.1,
+                 p_cancel: float = 0.2, p_update: float = 0.05, offset: float = 0.5, reach: float = 0.1,
+                 quantity: float = 10, sigma: float = 1, window: int = 1000):
+        '''
+        Args:
+            seed (int, optional): Seed of the random generator. Defaults to 0.
+            midprice (float, optional): Reference midprice, used when no current midprice is given to `batch` (e.g.
+                while a side of the book is empty). Defaults to 100.
+            rate (float, optional): Mean number of events per second of simulated time. Defaults to 1000.
+            p_market (float, optional): Probability of an event being a market order. Defaults to 0.1.
+            p_cancel (float, optional): Probability of an event being a cancellation. Defaults to 0.2.
+            p_update (float, optional): Probability of an event being an update. Defaults to 0.05.
+            offset (float, optional): Mean distance of limit orders to the midprice. Defaults to 0.5.
+            reach (float, optional): Mean distance market orders cross the midprice by. Defaults to 0.1.
+            quantity (float, optional): Median quantity of the orders. Defaults to 10.
+            sigma (float, optional): Standard deviation of the log of the quantities. Defaults to 1.
+            window (int, optional): Number of last orders that cancellations and updates can target. Defaults to
+                1000.
+        '''
+
+        if np is None: raise ImportError('numpy is required to generate order flows')
+
+        p_limit = 1 - p_market - p_cancel - p_update
+        if min(p_limit, p_market, p_cancel, p_update) < 0: raise ValueError('invalid events probabilities')
+        if rate <= 0 or offset <= 0 or reach <= 0 or quantity <= 0 or sigma < 0 or window <= 0 or midprice <= 0:
+            raise ValueError('rate, offset, reach, quantity, window and midprice must be > 0 (and sigma >= 0)')
+
+        self._rng           = np.random.default_rng(seed)
+        self._midprice      = midprice
+        self._rate          = rate
+        self._probabilities = [p_limit, p_market, p_cancel, p_update]
+        self._offset        = offset
+        self._reach         = reach
+        self._quantity      = quantity
+        self._sigma         = sigma
+        self._window        = window
+        self._time          = 0.0
+        self._orders        = 0
+
+    def window(self) -> int:
+        '''Number of last orders that cancellations and updates can target.'''
+
+        return self._window
+
+    def time(self) -> float:
+        '''Time of the last event drawn.'''
+
+        return self._time
+
+    def n_orders(self) -> int:
+        '''Number of orders drawn.'''
+
+        return self._orders
+
+    def batch(self, n: int, midprice: Optional[float] = None) -> Batch:
+        '''Draw the next `n` events, the prices being drawn around `midprice` (defaults to the reference one).'''
+
+        rng, mid = self._rng, self._midprice if midprice is None else float(midprice)
+
+        times = self._time + np.cumsum(rng.exponential(1 / self._rate, n))
+        kinds = rng.choice(4, n, p=self._probabilities).astype(np.int8)
+        sides = rng.integers(0, 2, n, dtype=np.int8)
+        sign = 2 * sides.astype(np.float64) - 1 # -1 for bids, +1 for asks
+
+        distance = np.where(kinds == MARKET, -rng.exponential(self._reach, n), rng.exponential(self._offset, n))
+        prices = np.rint((mid + sign * distance) * 10 ** DECIMAL_PRECISION_PRICE).astype(np.int64)
+        np.maximum(prices, 1, out=prices)
+
+        quantities = np.rint(rng.lognormal(np.log(self._quantity), self._sigma, n) * 10 ** DECIMAL_PRECISION_QTY)
+        quantities = np.maximum(quantities, 1).astype(np.int64)
+
+        # the targets are drawn among the `window` orders preceding each event
+        is_order = kinds <= MARKET
+        before = self._orders + np.cumsum(is_order) - is_order
+        back = np.floor(rng.random(n) * np.minimum(before, self._window)).astype(np.int64)
+        targets = np.where(is_order | (before == 0), -1, before - 1 - back)
+
+        batch = Batch(kinds, times, sides, prices, quantities, targets, self._orders)
+        self._time = float(times[-1]) if n else self._time
+        self._orders += int(np.count_nonzero(is_order))
+        return batch
+
+    def batches(self, n: int, size: int = 10_000) -> Iterator[Batch]:
+        '''Draw `n` events, in batches of `size` events (around the reference midprice).'''
+
+        while n > 0:
+            yield self.batch(min(n, size))
+            n -= size
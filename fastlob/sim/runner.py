@@ -0,0 +1,85 @@
+'''Stream an order flow into a lob.'''
+
+from typing import Optional
+
+from fastlob.lob import Orderbook
+from fastlob.utils import fromticks_quantity
+
+from .flow import OrderFlow, Batch, MARKET, CANCEL
+
+try: import numpy as np
+except ImportError: np = None # type: ignore[assignment] # numpy is optional, only needed for the simulation
+
+def run(lob: Orderbook, flow: OrderFlow, n: int, size: int = 10_000, follow: bool = True) -> dict[str, int]:
+    '''
+    Apply `n` events of `flow` to a running lob, in batches of `size` events: consecutive orders are processed with
+    one call to `process_many`, cancellations and updates are applied in between. Nothing is kept from one batch to
+    the next but the identifiers of the `flow.window()` last orders, so that any number of events can be streamed.
+
+    With a simulated clock, the lob is advanced to the time of the events before they are applied.
+
+    Args:
+        lob (Orderbook): The lob to apply the events to.
+        flow (OrderFlow): The order flow.
+        n (int): Number of events.
+        size (int, optional): Number of events per batch. Defaults to 10000.
+        follow (bool, optional): If true, the prices of each batch are drawn around the current midprice of the lob
+            (when both sides are not empty), instead of the reference midprice of the flow. Defaults to True.
+
+    Returns:
+        dict[str, int]: Counts of the events applied: "orders", "cancels", "updates" (the events whose target was
+            not drawn yet are skipped) and "failed" (the ones whose result is not successful).
+    '''
+
+    ids = [None] * flow.window() # ring buffer of the identifiers of the last orders
+    counts = {'orders': 0, 'cancels': 0, 'updates': 0, 'failed': 0}
+    simulated = lob.clock().simulated()
+
+    while n > 0:
+        midprice = _midprice(lob) if follow else None
+        batch = flow.batch(min(n, size), midprice)
+        _apply(lob, batch, ids, counts, simulated)
+        n -= size
+
+    return counts
+
+def _midprice(lob: Orderbook) -> Optional[float]:
+    bid, ask = lob.bbo()
+    if bid is None or ask is None: return None
+    return float(bid[0] + ask[0]) / 2
+
+def _apply(lob: Orderbook, batch: Batch, ids: list, counts: dict[str, int], simulated: bool) -> None:
+    '''Apply the events of a batch, run by run of orders and of cancellations / updates.'''
+
+    window, index = len(ids), batch.first_order
+    params = batch.params()
+    kinds, targets, quantities, times = batch.kinds.tolist(), batch.targets.tolist(), batch.quantities.tolist(), \
+        batch.times
+
+    is_order = batch.kinds <= MARKET
+    bounds = np.flatnonzero(np.diff(is_order.view(np.int8))) + 1
+    starts, ends = [0] + bounds.tolist(), bounds.tolist() + [len(batch)]
+
+    for start, end in zip(starts, ends):
+        if simulated: lob.advance_to(float(times[start]))
+
+        if is_order[start]:
+            offset = index - batch.first_order # params only holds the orders
+            for result in lob.process_many(params[offset:offset + end - start]):
+                ids[index % window] = result.orderid()
+                if not result.success(): counts['failed'] += 1
+                index += 1
+            counts['orders'] += end - start
+            continue
+
+        for i in range(start, end):
+            if (target := targets[i]) < 0: continue
+
+            if kinds[i] == CANCEL:
+                result = lob.cancel(ids[target % window])
+                counts['cancels'] += 1
+            else:
+                result = lob.update(ids[target % window], fromticks_quantity(quantities[i]))
+                counts['updates'] += 1
+
+            if not result.success(): counts['failed'] += 1
@@ -3,6 +3,12 @@
 from .utils import (
     todecimal_price,
     todecimal_quantity,
+    toticks_price,
+    toticks_quantity,
+    fromticks_price,
+    fromticks_quantity,
     time_asint,
+    write_array,
+    read_array,
     zero,
 )
@@ -1,8 +1,12 @@
 '''Global utility functions.'''
 
+import sys
 import time
+import struct
+from array import array
 from decimal import Decimal
 from numbers import Number
+from typing import BinaryIO
 
 from fastlob.consts import DECIMAL_PRECISION_PRICE, DECIMAL_PRECISION_QTY
 
@@ -26,11 +30,52 @@ def _todecimal(price: Number | str, precision: int) -> Decimal:
 
     return dec.quantize(exp)
 
+def toticks_price(price: Decimal) -> int:
+    '''Convert a (properly rounded) decimal price to an integer number of price ticks.'''
+
+    return int(price.scaleb(DECIMAL_PRECISION_PRICE))
+
+def toticks_quantity(quantity: Decimal) -> int:
+    '''Convert a (properly rounded) decimal quantity to an integer number of quantity lots.'''
+
+    return int(quantity.scaleb(DECIMAL_PRECISION_QTY))
+
+def fromticks_price(ticks: int) -> Decimal:
+    '''Convert an integer number of price ticks back to a decimal price.'''
+
+    return Decimal(ticks).scaleb(-DECIMAL_PRECISION_PRICE)
+
+def fromticks_quantity(lots: int) -> Decimal:
+    '''Convert an integer number of quantity lots back to a decimal quantity.'''
+
+    return Decimal(lots).scaleb(-DECIMAL_PRECISION_QTY)
+
 def zero():
     '''Decimal('0')'''
 
     return Decimal('0')
 
+def write_array(file: BinaryIO, values: array) -> None:
+    '''Write an array to a binary file, as its length (u64) followed by its items in little-endian order.'''
+
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+
+    file.write(struct.pack('<Q', len(values)))
+    file.write(values.tobytes())
+
+def read_array(file: BinaryIO, typecode: str) -> array:
+    '''Read an array of items of type `typecode` written by `write_array`.'''
+
+    values = array(typecode)
+    n, = struct.unpack('<Q', file.read(8))
+    values.frombytes(file.read(n * values.itemsize))
+
+    if len(values) != n: raise ValueError('unexpected end of file')
+    if sys.byteorder == 'big': values.byteswap()
+    return values
+
 def time_asint() -> int:
     '''int(time.time())'''
 
@@ -1,7 +1,7 @@
 import unittest, logging, time
 from hypothesis import given, strategies as st
 
-from fastlob import Orderbook, OrderStatus, OrderParams, OrderSide, OrderType
+from fastlob import Orderbook, OrderStatus, OrderParams, OrderSide, OrderType, ResultCode, SimulatedClock, WallClock
 from fastlob.consts import TICK_SIZE_PRICE, TICK_SIZE_QTY, MAX_VALUE
 
 valid_side = st.sampled_from(OrderSide)
@@ -11,6 +11,8 @@ valid_qty2 = st.decimals(min_value=TICK_SIZE_QTY, max_value=MAX_VALUE // 1000 -
 
 def valid_expiry(x:int = 5): return int(time.time()) + x
 
+T0 = 1_700_000_000.0 # start of the simulated clock
+
 class TestOrdersGTD(unittest.TestCase):
     def setUp(self): 
         logging.basicConfig(level=logging.ERROR)
@@ -20,11 +22,19 @@ class TestOrdersGTD(unittest.TestCase):
         with self.assertRaises(ValueError):
             OrderParams(side, price, qty, OrderType.GTD)
 
-        with self.assertRaises(ValueError):
-            OrderParams(side, price, qty, OrderType.GTD, expiry=time.time())
-
         OrderParams(side, price, qty, OrderType.GTD, expiry=valid_expiry())
 
+    def test_expiry_in_past(self):
+        with Orderbook('TestOrdersGTD') as lob:
+            r = lob(OrderParams(OrderSide.BID, 100, 1, OrderType.GTD, expiry=time.time()))
+            self.assertFalse(r.success())
+            self.assertListEqual(r.codes(), [ResultCode.GTD_EXPIRED])
+
+        lob = Orderbook('TestOrdersGTD', clock=SimulatedClock(T0)); lob.start()
+        self.assertFalse(lob(OrderParams(OrderSide.BID, 100, 1, OrderType.GTD, expiry=T0)).success())
+        self.assertTrue(lob(OrderParams(OrderSide.BID, 100, 1, OrderType.GTD, expiry=T0 + 0.5)).success())
+        lob.stop()
+
     @given(valid_side, valid_price, valid_qty)
     def test_place(self, side, price, qty):
         lob = Orderbook('TestOrdersGTD'); lob.start()
@@ -62,13 +72,13 @@ class TestOrdersGTD(unittest.TestCase):
         lob.stop()
 
     def test_place_fill(self):
-        lob = Orderbook('TestOrdersGTD'); lob.start()
+        lob = Orderbook('TestOrdersGTD', clock=SimulatedClock(T0)); lob.start()
 
         side = OrderSide.ASK
         price = 100
         qty = 10
 
-        p = OrderParams(side, price, qty, OrderType.GTD, expiry=valid_expiry(2))
+        p = OrderParams(side, price, qty, OrderType.GTD, expiry=T0 + 2)
         r = lob(p)
 
         self.assertTrue(r.success())
@@ -84,7 +94,7 @@ class TestOrdersGTD(unittest.TestCase):
         s, _ = lob.get_status(r.orderid())
         self.assertEqual(s, OrderStatus.FILLED)
 
-        time.sleep(3.11)
+        lob.advance_to(T0 + 3.11)
 
         # check that order is not canceled if it is filled
 
@@ -95,9 +105,9 @@ class TestOrdersGTD(unittest.TestCase):
 
     def test_expiration(self):
         self.setUp()
-        lob = Orderbook('TestOrdersGTD'); lob.start()
+        lob = Orderbook('TestOrdersGTD', clock=SimulatedClock(T0)); lob.start()
 
-        p = OrderParams(OrderSide.ASK, 100, 10, OrderType.GTD, expiry=valid_expiry(2))
+        p = OrderParams(OrderSide.ASK, 100, 10, OrderType.GTD, expiry=T0 + 2)
         r = lob(p)
 
         self.assertTrue(r.success())
@@ -106,7 +116,7 @@ class TestOrdersGTD(unittest.TestCase):
         s, _ = lob.get_status(r.orderid())
         self.assertEqual(s, OrderStatus.PENDING)
 
-        time.sleep(3.11)
+        lob.advance_to(T0 + 3.11)
 
         s, _ = lob.get_status(r.orderid())
         self.assertEqual(s, OrderStatus.CANCELED)
@@ -114,7 +124,7 @@ class TestOrdersGTD(unittest.TestCase):
         lob.stop()
 
     def test_market_is_not_canceled(self):
-        lob = Orderbook('TestOrdersGTD'); lob.start()
+        lob = Orderbook('TestOrdersGTD', clock=SimulatedClock(T0)); lob.start()
 
         p = OrderParams(OrderSide.ASK, 100, 10, OrderType.GTC)
         r = lob(p)
@@ -124,14 +134,14 @@ class TestOrdersGTD(unittest.TestCase):
         s, _ = lob.get_status(r.orderid())
         self.assertEqual(s, OrderStatus.PENDING)
 
-        gtd = OrderParams(OrderSide.BID, 100, 5, OrderType.GTD, expiry=valid_expiry(2))
+        gtd = OrderParams(OrderSide.BID, 100, 5, OrderType.GTD, expiry=T0 + 2)
         rgtd = lob(gtd)
         self.assertTrue(rgtd.success())
 
         s, _ = lob.get_status(rgtd.orderid())
         self.assertEqual(s, OrderStatus.FILLED)
 
-        time.sleep(3.11)
+        lob.advance_to(T0 + 3.11)
 
         s, _ = lob.get_status(rgtd.orderid())
         self.assertEqual(s, OrderStatus.FILLED)
@@ -139,7 +149,7 @@ class TestOrdersGTD(unittest.TestCase):
         lob.stop()
 
     def test_canceled_after_market_partial_fill(self):
-        lob = Orderbook('TestOrdersGTD'); lob.start()
+        lob = Orderbook('TestOrdersGTD', clock=SimulatedClock(T0)); lob.start()
 
         p = OrderParams(OrderSide.ASK, 100, 10, OrderType.GTC)
         r = lob(p)
@@ -149,14 +159,14 @@ class TestOrdersGTD(unittest.TestCase):
         s, _ = lob.get_status(r.orderid())
         self.assertEqual(s, OrderStatus.PENDING)
 
-        gtd = OrderParams(OrderSide.BID, 100, 15, OrderType.GTD, expiry=valid_expiry(2))
+        gtd = OrderParams(OrderSide.BID, 100, 15, OrderType.GTD, expiry=T0 + 2)
         rgtd = lob(gtd)
         self.assertTrue(rgtd.success())
 
         s, _ = lob.get_status(rgtd.orderid())
         self.assertEqual(s, OrderStatus.PENDING)
 
-        time.sleep(3.11)
+        lob.advance_to(T0 + 3.11)
 
         s, q = lob.get_status(rgtd.orderid())
         self.assertEqual(s, OrderStatus.CANCELED)
@@ -165,13 +175,13 @@ class TestOrdersGTD(unittest.TestCase):
         lob.stop()
 
     def test_partial_fill_then_cancel(self):
-        lob = Orderbook('TestOrdersGTD'); lob.start()
+        lob = Orderbook('TestOrdersGTD', clock=SimulatedClock(T0)); lob.start()
 
         side = OrderSide.ASK
         price = 100
         qty = 10
 
-        p = OrderParams(side, price, qty, OrderType.GTD, expiry=valid_expiry(2))
+        p = OrderParams(side, price, qty, OrderType.GTD, expiry=T0 + 2)
         r = lob(p)
 
         self.assertTrue(r.success())
@@ -187,7 +197,7 @@ class TestOrdersGTD(unittest.TestCase):
         s, _ = lob.get_status(r.orderid())
         self.assertEqual(s, OrderStatus.PARTIAL)
 
-        time.sleep(3.11)
+        lob.advance_to(T0 + 3.11)
 
         s, _ = lob.get_status(r.orderid())
         self.assertEqual(s, OrderStatus.CANCELED)
@@ -196,9 +206,9 @@ class TestOrdersGTD(unittest.TestCase):
 
     def test_update_after_expiry(self):
         self.setUp()
-        lob = Orderbook('TestOrdersGTD'); lob.start()
+        lob = Orderbook('TestOrdersGTD', clock=SimulatedClock(T0)); lob.start()
 
-        p = OrderParams(OrderSide.ASK, 100, 10, OrderType.GTD, expiry=valid_expiry(2))
+        p = OrderParams(OrderSide.ASK, 100, 10, OrderType.GTD, expiry=T0 + 2)
         r = lob(p)
 
         self.assertTrue(r.success())
@@ -212,7 +222,7 @@ class TestOrdersGTD(unittest.TestCase):
         self.assertTrue(u.success())
         self.assertEqual(lob.asks_volume(), 25)
 
-        time.sleep(3.11)
+        lob.advance_to(T0 + 3.11)
 
         s, _ = lob.get_status(r.orderid())
         self.assertEqual(s, OrderStatus.CANCELED)
@@ -221,4 +231,55 @@ class TestOrdersGTD(unittest.TestCase):
         self.assertFalse(u.success())
         self.assertEqual(lob.asks_volume(), 0)
 
-        lob.stop()
\ No newline at end of file
+        lob.stop()
+    def test_subsecond_expiry(self):
+        with Orderbook('TestOrdersGTD') as lob:
+            r = lob(OrderParams(OrderSide.ASK, 100, 10, OrderType.GTD, expiry=time.time() + 0.2))
+            later = lob(OrderParams(OrderSide.ASK, 101, 10, OrderType.GTD, expiry=valid_expiry(10)))
+
+            s, _ = lob.get_status(r.orderid())
+            self.assertEqual(s, OrderStatus.PENDING)
+
+            time.sleep(0.5)
+
+            s, _ = lob.get_status(r.orderid())
+            self.assertEqual(s, OrderStatus.CANCELED)
+            s, _ = lob.get_status(later.orderid())
+            self.assertEqual(s, OrderStatus.PENDING)
+            self.assertEqual(lob.n_asks(), 1)
+
+    def test_bulk_expiry(self):
+        with Orderbook('TestOrdersGTD') as lob:
+            expiry = time.time() + 0.3
+            N = 5000
+
+            results = lob([OrderParams(OrderSide.BID, 50 + i % 100, 1, OrderType.GTD, expiry=expiry) for i in range(N)])
+            self.assertEqual(lob.n_bids(), 100)
+
+            time.sleep(0.8)
+
+            self.assertEqual(lob.n_bids(), 0)
+            self.assertEqual(lob.bids_volume(), 0)
+            for r in results: self.assertEqual(lob.get_status(r.orderid())[0], OrderStatus.CANCELED)
+
+    def test_simulated_replay(self):
+        lob = Orderbook('TestOrdersGTD', clock=SimulatedClock(T0)); lob.start()
+
+        r = lob(OrderParams(OrderSide.BID, 99, 10, OrderType.GTD, expiry=T0 + 60))
+        lob.load_updates([
+            {'bids': [], 'asks': [(101, 5)], 'timestamp': T0 + 30},
+            {'bids': [], 'asks': [(101, 0)], 'timestamp': T0 + 90},
+        ])
+
+        lob.step()
+        self.assertEqual(lob.get_status(r.orderid())[0], OrderStatus.PENDING)
+        self.assertEqual(lob.running_time(), 30)
+
+        lob.step()
+        self.assertEqual(lob.get_status(r.orderid())[0], OrderStatus.CANCELED)
+        self.assertEqual(lob.n_prices(), 0)
+
+        with self.assertRaises(ValueError): lob.advance_to(T0)
+        lob.stop()
+
+        with self.assertRaises(NotImplementedError): WallClock().advance_to(T0)
@@ -0,0 +1,75 @@
+import unittest, logging, random, asyncio
+
+from fastlob import Orderbook, OrderParams, OrderSide, ResultType
+from fastlob.aio import AsyncOrderbook
+
+def random_orders(seed: int, n: int = 200) -> list[OrderParams]:
+    rng = random.Random(seed)
+    return [OrderParams(rng.choice((OrderSide.BID, OrderSide.ASK)), round(rng.uniform(97, 103), 2),
+                        round(rng.uniform(0.01, 50), 2)) for _ in range(n)]
+
+def summary(result) -> tuple:
+    return result.success(), result.orderid(), result.kind(), result.n_orders_matched(), result.fills()
+
+class TestAsyncOrderbook(unittest.IsolatedAsyncioTestCase):
+    def setUp(self): logging.basicConfig(level=logging.FATAL)
+
+    async def test_same_as_sync(self):
+        async with AsyncOrderbook(ticks=True) as book:
+            results = await asyncio.gather(*[book.submit(params) for params in random_orders(0)])
+            bids = await book.call('best_bids', 5)
+
+        with Orderbook(ticks=True, start=True) as lob:
+            self.assertListEqual([summary(r) for r in results], [summary(lob(p)) for p in random_orders(0)])
+            self.assertListEqual(bids, lob.best_bids(5))
+
+    async def test_batching(self):
+        async with AsyncOrderbook() as book:
+            await asyncio.gather(*[book.submit(params) for params in random_orders(1, 100)])
+            self.assertEqual(book.batches(), 1)
+
+            for params in random_orders(2, 10): await book.submit(params)
+            self.assertEqual(book.batches(), 11)
+
+    async def test_cancel_update(self):
+        async with AsyncOrderbook() as book:
+            result = await book.submit(OrderParams(OrderSide.BID, 100, 10))
+            orderid = result.orderid()
+
+            result = await book.update(orderid, 4)
+            self.assertTrue(result.success())
+            self.assertEqual(result.kind(), ResultType.UPDATE)
+            self.assertEqual(await book.call('best_bid'), (100, 4, 1))
+
+            result = await book.cancel(orderid)
+            self.assertTrue(result.success())
+            self.assertEqual(result.kind(), ResultType.CANCEL)
+            self.assertEqual(await book.call('n_bids'), 0)
+
+            result = await book.cancel(orderid)
+            self.assertFalse(result.success())
+
+    async def test_errors(self):
+        with self.assertRaises(RuntimeError): await AsyncOrderbook().submit(OrderParams(OrderSide.BID, 100, 10))
+        with self.assertRaises(ValueError): AsyncOrderbook(Orderbook(), ticks=True)
+
+        async with AsyncOrderbook() as book:
+            with self.assertRaises(ValueError): await book.call('_process')
+            with self.assertRaises(AttributeError): await book.call('nothing')
+            with self.assertRaises(TypeError): await book.call('best_bids', 1, 2, 3)
+            # the matching thread is still alive
+            self.assertTrue((await book.submit(OrderParams(OrderSide.BID, 100, 10))).success())
+
+    async def test_lifecycle(self):
+        lob = Orderbook()
+        book = AsyncOrderbook(lob)
+        async with book:
+            self.assertTrue(lob.is_running())
+            future = asyncio.ensure_future(book.submit(OrderParams(OrderSide.ASK, 100, 10)))
+            await asyncio.sleep(0)
+
+        # pending commands are applied before the wrapper is closed, a given lob is not stopped
+        self.assertTrue(future.done() and future.result().success())
+        self.assertTrue(lob.is_running())
+        self.assertEqual(lob.n_asks(), 1)
+        lob.stop()
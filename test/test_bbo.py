@@ -0,0 +1,63 @@
+import unittest, logging, random
+from decimal import Decimal
+from hypothesis import given, settings, strategies as st
+
+from fastlob import Orderbook, OrderParams, OrderSide
+
+valid_seed = st.integers(min_value=0, max_value=2**32)
+
+def expected_bbo(lob):
+    bids, asks = lob._bidside.best_limits(1), lob._askside.best_limits(1)
+    bid = lob._outlimit(bids[0]) if bids else None
+    ask = lob._outlimit(asks[0]) if asks else None
+    return bid, ask
+
+class TestBBO(unittest.TestCase):
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL)
+
+    @settings(max_examples=20, deadline=None)
+    @given(valid_seed)
+    def test_cache_consistent(self, seed):
+        for kwargs in ({}, {'ticks': True}, {'ticks': True, 'ladder': (90, 110)}):
+            with Orderbook(**kwargs) as lob: self.check_consistent(lob, seed)
+
+    def check_consistent(self, lob, seed):
+        rng = random.Random(seed)
+        ids = list()
+        version, bbo = lob.bbo_version(), lob.bbo()
+
+        for _ in range(300):
+            action = rng.random()
+
+            if action < 0.6:
+                side = rng.choice((OrderSide.BID, OrderSide.ASK))
+                params = OrderParams(side, round(rng.uniform(95, 105), 2), round(rng.uniform(0.01, 20), 2))
+                ids.append(lob(params).orderid())
+            elif action < 0.75 and ids: lob.cancel(rng.choice(ids))
+            elif action < 0.9 and ids: lob.update(rng.choice(ids), round(rng.uniform(0.01, 20), 2))
+            else:
+                price, volume = round(rng.uniform(95, 105), 2), rng.choice((0, round(rng.uniform(1, 20), 2)))
+                key = rng.choice(('bids', 'asks'))
+                lob.step_updates({key: [(price, volume)], ('asks' if key == 'bids' else 'bids'): []})
+
+            self.assertEqual(lob.bbo(), expected_bbo(lob))
+            self.assertEqual(lob.bbo(), (lob.best_bid(), lob.best_ask()))
+
+            if lob.bbo() != bbo: self.assertGreater(lob.bbo_version(), version)
+            else: self.assertEqual(lob.bbo_version(), version)
+            version, bbo = lob.bbo_version(), lob.bbo()
+
+    def test_derived(self):
+        with Orderbook() as lob:
+            self.assertEqual(lob.bbo(), (None, None))
+            version = lob.bbo_version()
+
+            lob(OrderParams(OrderSide.BID, 99, 4))
+            lob(OrderParams(OrderSide.ASK, 101, 1))
+            lob(OrderParams(OrderSide.BID, 90, 1)) # behind the best bid, does not change the top
+
+            self.assertEqual(lob.bbo_version(), version + 2)
+            self.assertEqual(lob.spread(), 2)
+            self.assertEqual(lob.midprice(), 100)
+            self.assertEqual(lob.weighted_midprice(), Decimal('99.4'))
@@ -0,0 +1,66 @@
+import unittest, json, os, tempfile, contextlib, io, copy
+
+from fastlob.bench import WORKLOADS, run_suite, compare
+from fastlob.__main__ import main
+
+class TestBench(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.report = run_suite(depths=(1, 20), n=40, repeat=1, ticks=True)
+
+    def test_report(self):
+        results = self.report['results']
+        expected = {(workload, depth) for workload in WORKLOADS for depth in (1, 20)}
+        self.assertSetEqual({(result['workload'], result['depth']) for result in results}, expected)
+        self.assertDictEqual(self.report['config'], dict(ticks=True, n=40, repeat=1, seed=0))
+
+        for result in results:
+            self.assertGreater(result['ops'], 0)
+            self.assertGreater(result['ops_per_sec'], 0)
+            self.assertGreater(result['peak_memory_bytes'], 0)
+            latency = result['latency_ns']
+            self.assertListEqual(list(latency), ['p50', 'p90', 'p99', 'p99.9', 'max'])
+            self.assertListEqual(list(latency.values()), sorted(latency.values()))
+
+        json.dumps(self.report) # serializable
+
+        with self.assertRaises(ValueError): run_suite(['nothing'])
+        with self.assertRaises(ValueError): run_suite(repeat=0)
+
+    def test_compare(self):
+        self.assertListEqual(compare(self.report, self.report), list())
+
+        slower = copy.deepcopy(self.report)
+        slower['results'][0]['ops_per_sec'] *= 0.5
+        slower['results'][1]['peak_memory_bytes'] *= 2
+        slower['results'][2]['ops_per_sec'] *= 0.95 # under the threshold
+
+        regressions = compare(slower, self.report, 0.1)
+        self.assertListEqual([(r['workload'], r['depth'], r['metric']) for r in regressions],
+                             [(slower['results'][0]['workload'], slower['results'][0]['depth'], 'ops_per_sec'),
+                              (slower['results'][1]['workload'], slower['results'][1]['depth'], 'peak_memory_bytes')])
+        self.assertAlmostEqual(regressions[0]['change'], -0.5)
+
+        # faster or missing from the baseline: no regression
+        self.assertListEqual(compare(self.report, slower, 0.1), list())
+        self.assertListEqual(compare(self.report, {'results': list()}), list())
+
+    def test_cli(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output, baseline = os.path.join(directory, 'report.json'), os.path.join(directory, 'baseline.json')
+            args = ['bench', '-w', 'place', 'fok', '-d', '5', '-n', '20', '-r', '1', '-q']
+
+            self.assertEqual(main(args + ['-o', baseline]), 0)
+            with open(baseline, encoding='utf-8') as file: report = json.load(file)
+            self.assertEqual(len(report['results']), 2)
+
+            # a baseline way faster than possible
+            for result in report['results']: result['ops_per_sec'] *= 1000
+            with open(baseline, 'w', encoding='utf-8') as file: json.dump(report, file)
+
+            with contextlib.redirect_stderr(io.StringIO()) as stderr:
+                self.assertEqual(main(args + ['-o', output, '-b', baseline]), 1)
+            self.assertIn('REGRESSION place (depth 5): ops_per_sec', stderr.getvalue())
+
+            with open(output, encoding='utf-8') as file: report = json.load(file)
+            self.assertEqual(len(report['regressions']), 2)
@@ -0,0 +1,125 @@
+import unittest, logging, os, tempfile, random
+from unittest import mock
+from hypothesis import given, settings, strategies as st
+
+from fastlob import Orderbook, OrderParams, OrderSide, OrderType, SimulatedClock, PrefixedIdGenerator
+
+T0 = 1_700_000_000.0
+
+valid_seed = st.integers(min_value=0, max_value=2**32)
+
+def random_flow(seed: int, n: int = 300) -> list[OrderParams | dict]:
+    # limit and market orders (some GTD), and L2 updates
+    rng = random.Random(seed)
+    flow = list()
+    for _ in range(n):
+        if rng.random() < 0.1:
+            bids = [(round(rng.uniform(95, 99.99), 2), rng.choice((0, round(rng.uniform(0.01, 20), 2))))]
+            asks = [(round(rng.uniform(100, 105), 2), rng.choice((0, round(rng.uniform(0.01, 20), 2))))]
+            flow.append({'bids': bids, 'asks': asks})
+            continue
+
+        side = rng.choice((OrderSide.BID, OrderSide.ASK))
+        price = round(rng.uniform(97, 103), 2)
+        qty = round(rng.uniform(0.01, 50), 2)
+        if rng.random() < 0.2: flow.append(OrderParams(side, price, qty, OrderType.GTD, T0 + rng.randrange(1, 50)))
+        else: flow.append(OrderParams(side, price, qty))
+    return flow
+
+def run(lob: Orderbook, flow: list) -> list:
+    out = list()
+    for item in flow:
+        if isinstance(item, dict): lob.step_updates(item)
+        else:
+            result = lob(item)
+            out.append((result.success(), result.orderid(), result.kind(), result.n_orders_matched()))
+    return out
+
+def queues(lob: Orderbook) -> list:
+    return [(lim.price(), lim.external_volume(), lim.external_ahead(), [o.id() for o in lim.orders()])
+            for side in (lob._askside, lob._bidside) for lim in side.limits()]
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL)
+        self.path = os.path.join(tempfile.mkdtemp(), 'lob.ckpt')
+
+    def tearDown(self):
+        if os.path.exists(self.path): os.remove(self.path)
+
+    def check_same(self, lob1: Orderbook, lob2: Orderbook):
+        self.assertEqual(queues(lob1), queues(lob2))
+        self.assertEqual(lob1.best_asks(1000), lob2.best_asks(1000))
+        self.assertEqual(lob1.best_bids(1000), lob2.best_bids(1000))
+        self.assertEqual(lob1.bbo(), lob2.bbo())
+        self.assertEqual(lob1.total_volume(), lob2.total_volume())
+        self.assertEqual(list(lob1._orders), list(lob2._orders))
+        for orderid in lob1._orders: self.assertEqual(lob1.get_status(orderid), lob2.get_status(orderid))
+
+    @settings(max_examples=10, deadline=None)
+    @given(valid_seed, st.booleans(), st.booleans())
+    def test_roundtrip(self, seed, ticks, compact):
+        flow = random_flow(seed)
+        kwargs = dict(ticks=ticks, compact_history=compact, depth_index=ticks)
+
+        with Orderbook('saved', clock=SimulatedClock(T0), **kwargs) as lob1:
+            run(lob1, flow[:200])
+            lob1.save_checkpoint(self.path)
+
+            with Orderbook.load_checkpoint(self.path, clock=SimulatedClock(T0), start=True) as lob2:
+                self.assertEqual(lob2._name, 'saved')
+                self.check_same(lob1, lob2)
+
+                # both books behave the same afterwards, including new ids and GTD expiries
+                self.assertEqual(run(lob1, flow[200:]), run(lob2, flow[200:]))
+                lob1.advance_to(T0 + 25)
+                lob2.advance_to(T0 + 25)
+                self.check_same(lob1, lob2)
+
+    def test_ladder(self):
+        with Orderbook('ladder', ticks=True, ladder=(90, 110)) as lob1:
+            run(lob1, random_flow(0))
+            lob1.save_checkpoint(self.path)
+
+            with Orderbook.load_checkpoint(self.path, start=True) as lob2:
+                self.assertEqual(lob2._ladder, lob1._ladder)
+                self.check_same(lob1, lob2)
+
+    def test_string_ids(self):
+        with Orderbook('prefixed', ids=PrefixedIdGenerator('X-')) as lob1:
+            run(lob1, random_flow(1))
+            lob1.save_checkpoint(self.path)
+
+            self.assertRaises(ValueError, Orderbook.load_checkpoint, self.path)
+
+            with Orderbook.load_checkpoint(self.path, ids=PrefixedIdGenerator('Y-'), start=True) as lob2:
+                self.check_same(lob1, lob2)
+
+    def test_clock(self):
+        with Orderbook('simulated', clock=SimulatedClock(T0)) as lob1:
+            run(lob1, random_flow(2))
+            lob1.advance_to(T0 + 10)
+            lob1.save_checkpoint(self.path)
+
+            with Orderbook.load_checkpoint(self.path, start=True) as lob2: # simulated time restored
+                self.assertTrue(lob2._clock.simulated())
+                self.assertEqual(lob2._clock.now(), T0 + 10)
+                self.check_same(lob1, lob2)
+
+    def test_atomic(self):
+        with Orderbook('atomic') as lob:
+            run(lob, random_flow(3))
+            lob.save_checkpoint(self.path)
+            with open(self.path, 'rb') as file: saved = file.read()
+
+            run(lob, random_flow(4))
+            with mock.patch('fastlob.lob.checkpoint._save_side', side_effect=OSError('disk full')):
+                self.assertRaises(OSError, lob.save_checkpoint, self.path)
+
+        # the previous checkpoint is intact, and the temporary file removed
+        with open(self.path, 'rb') as file: self.assertEqual(file.read(), saved)
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), [os.path.basename(self.path)])
+
+    def test_invalid_file(self):
+        with open(self.path, 'wb') as file: file.write(b'not a checkpoint' * 10)
+        self.assertRaises(ValueError, Orderbook.load_checkpoint, self.path)
@@ -0,0 +1,112 @@
+import unittest, logging, random
+from hypothesis import given, settings, strategies as st
+
+from fastlob import Orderbook, OrderParams, OrderSide, OrderType, ResultType
+from fastlob.side import DepthIndex
+
+valid_seed = st.integers(min_value=0, max_value=2**32)
+
+class TestDepthIndex(unittest.TestCase):
+    @given(st.lists(st.tuples(st.integers(-10**6, 10**6), st.integers(1, 100)), max_size=50))
+    def test_queries(self, levels):
+        index, points = DepthIndex(), dict()
+        for key, volume in levels:
+            index.add(key, volume, 0 if key in points else 1)
+            points[key] = points.get(key, 0) + volume
+
+        keys = sorted(points)
+        for n in range(len(keys) + 2):
+            self.assertEqual(index.volume_levels(n), sum(points[k] for k in keys[:n]))
+
+        for key in keys:
+            self.assertEqual(index.volume_upto(key), sum(points[k] for k in keys if k <= key))
+            self.assertEqual(index.key_to_fill(index.volume_upto(key)), key)
+
+        self.assertIsNone(index.key_to_fill(sum(points.values()) + 1))
+
+    def test_bounds(self):
+        index = DepthIndex(bounds=(-10, 10))
+        index.add(-10, 5, 1)
+        index.add(10, 5, 1)
+
+        self.assertEqual(index.volume_levels(1), 5)
+        self.assertEqual(index.key_to_fill(6), 10)
+        self.assertRaises(ValueError, index.add, 11, 1, 1)
+
+    def test_sparse_queries(self):
+        index = DepthIndex()
+        index.add(100, 5, 1)
+        index.add(300, 7, 1)
+        size = len(index._vtree), len(index._ltree)
+
+        # queries do not insert the positions they read
+        for key in range(0, 1000, 3): index.volume_upto(key)
+        for n in range(5): index.volume_levels(n)
+        for quantity in range(20): index.key_to_fill(quantity)
+        self.assertTupleEqual((len(index._vtree), len(index._ltree)), size)
+
+class TestDepth(unittest.TestCase):
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL)
+
+    @settings(max_examples=10, deadline=None)
+    @given(valid_seed)
+    def test_same_as_linear(self, seed):
+        for kwargs in ({}, {'ticks': True}, {'ticks': True, 'ladder': (90, 110)}):
+            with Orderbook(**kwargs) as lob, Orderbook(depth_index=True, **kwargs) as lob_index:
+                self.check_same(lob, lob_index, seed)
+
+    def check_same(self, lob, lob_index, seed):
+        rng = random.Random(seed)
+        ids = list()
+
+        for _ in range(300):
+            action = rng.random()
+
+            if action < 0.6:
+                side = rng.choice((OrderSide.BID, OrderSide.ASK))
+                otype = rng.choice((OrderType.GTC, OrderType.FOK))
+                params = OrderParams(side, round(rng.uniform(95, 105), 2), round(rng.uniform(0.01, 20), 2), otype)
+                r1, r2 = lob(params), lob_index(params)
+                self.assertEqual((r1.kind(), r1.success()), (r2.kind(), r2.success()))
+                ids.append(r1.orderid())
+            elif action < 0.75 and ids:
+                orderid = rng.choice(ids)
+                lob.cancel(orderid); lob_index.cancel(orderid)
+            elif action < 0.9 and ids:
+                orderid, qty = rng.choice(ids), round(rng.uniform(0.01, 20), 2)
+                lob.update(orderid, qty); lob_index.update(orderid, qty)
+            else:
+                price, volume = round(rng.uniform(95, 105), 2), rng.choice((0, round(rng.uniform(1, 20), 2)))
+                key = rng.choice(('bids', 'asks'))
+                updates = {key: [(price, volume)], ('asks' if key == 'bids' else 'bids'): []}
+                lob.step_updates(updates); lob_index.step_updates(updates)
+
+            self.check_queries(lob, lob_index, rng)
+
+    def check_queries(self, lob, lob_index, rng):
+        for side in (OrderSide.BID, OrderSide.ASK):
+            n, price, qty = rng.randint(0, 10), round(rng.uniform(95, 105), 2), round(rng.uniform(0.01, 100), 2)
+            self.assertEqual(lob.depth(side, n), lob_index.depth(side, n))
+            self.assertEqual(lob.volume_upto(side, price), lob_index.volume_upto(side, price))
+            self.assertEqual(lob.price_to_fill(side, qty), lob_index.price_to_fill(side, qty))
+
+        self.assertEqual(lob.bids_volume(), lob_index.bids_volume())
+        self.assertEqual(lob.asks_volume(), lob_index.asks_volume())
+        if lob.n_bids() and lob.n_asks(): self.assertEqual(lob.imbalance(3), lob_index.imbalance(3))
+
+    def test_queries(self):
+        with Orderbook(depth_index=True) as lob:
+            for price, qty in ((100, 1), (101, 2), (102, 3)): lob(OrderParams(OrderSide.ASK, price, qty))
+            lob(OrderParams(OrderSide.BID, 99, 4))
+
+            self.assertEqual(lob.depth(OrderSide.ASK, 2), 3)
+            self.assertEqual(lob.volume_upto(OrderSide.ASK, 101.5), 3)
+            self.assertEqual(lob.price_to_fill(OrderSide.ASK, 4), 102)
+            self.assertIsNone(lob.price_to_fill(OrderSide.BID, 5))
+
+            r = lob(OrderParams(OrderSide.BID, 101, 4, OrderType.FOK))
+            self.assertFalse(r.success())
+            r = lob(OrderParams(OrderSide.BID, 102, 4, OrderType.FOK))
+            self.assertEqual(r.kind(), ResultType.MARKET)
+            self.assertEqual(lob.depth(OrderSide.ASK, 10), 2)
@@ -0,0 +1,90 @@
+import unittest, logging, random
+from collections import deque
+from decimal import Decimal
+from hypothesis import given, settings, strategies as st
+
+from fastlob import Orderbook, OrderParams, OrderSide, OrderType, SimulatedClock, L2Diff
+
+T0 = 1_700_000_000.0
+
+valid_seed = st.integers(min_value=0, max_value=2**32)
+
+def random_commands(lob: Orderbook, seed: int, n: int = 300) -> None:
+    rng = random.Random(seed)
+    t = lob._clock.now()
+    for _ in range(n):
+        x = rng.random()
+        if x < 0.1:
+            bids = [(round(rng.uniform(95, 99.99), 2), rng.choice((0, round(rng.uniform(0.01, 20), 2))))]
+            asks = [(round(rng.uniform(100, 105), 2), rng.choice((0, round(rng.uniform(0.01, 20), 2))))]
+            lob.step_updates({'bids': bids, 'asks': asks})
+        elif x < 0.15 and lob._orders: lob.cancel(rng.choice(list(lob._orders)))
+        elif x < 0.2 and lob._orders: lob.update(rng.choice(list(lob._orders)), round(rng.uniform(0.01, 50), 2))
+        elif x < 0.25:
+            t += rng.random()
+            lob.advance_to(t)
+        else:
+            side = rng.choice((OrderSide.BID, OrderSide.ASK))
+            price, qty = round(rng.uniform(97, 103), 2), round(rng.uniform(0.01, 50), 2)
+            if rng.random() < 0.2: lob(OrderParams(side, price, qty, OrderType.GTD, t + rng.uniform(1, 20)))
+            else: lob(OrderParams(side, price, qty))
+
+class Mirror:
+    '''A copy of the book levels, maintained from diffs only.'''
+
+    def __init__(self):
+        self.bids, self.asks, self.seq = dict(), dict(), 0
+
+    def __call__(self, diff: L2Diff):
+        assert diff.seq() == self.seq + 1, 'missed a diff'
+        self.seq = diff.seq()
+        for levels, changes in ((self.bids, diff.bids()), (self.asks, diff.asks())):
+            for price, volume, n in changes:
+                if volume == 0: levels.pop(price, None)
+                else: levels[price] = (price, volume, n)
+
+class TestDiff(unittest.TestCase):
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL)
+
+    @settings(max_examples=10, deadline=None)
+    @given(valid_seed, st.booleans())
+    def test_mirror(self, seed, ticks):
+        with Orderbook('diffs', clock=SimulatedClock(T0), ticks=ticks) as lob:
+            random_commands(lob, seed, 50) # before subscribing
+
+            mirror = Mirror()
+            for price, volume, n in lob.best_bids(lob.n_bids()): mirror.bids[price] = (price, volume, n)
+            for price, volume, n in lob.best_asks(lob.n_asks()): mirror.asks[price] = (price, volume, n)
+
+            lob.subscribe(mirror)
+            random_commands(lob, seed + 1)
+
+            self.assertEqual(mirror.seq, lob.diff_seq())
+            self.assertEqual(sorted(mirror.bids.values(), reverse=True), lob.best_bids(lob.n_bids()))
+            self.assertEqual(sorted(mirror.asks.values()), lob.best_asks(lob.n_asks()))
+
+    def test_diff(self):
+        diffs = deque()
+
+        with Orderbook('diffs') as lob:
+            lob.subscribe(diffs.append)
+
+            lob(OrderParams(OrderSide.BID, 99, 2))
+            lob(OrderParams(OrderSide.BID, 98, 1))
+            lob(OrderParams(OrderSide.ASK, 99, 3)) # fills the bid at 99, rests at 99
+            lob(OrderParams(OrderSide.ASK, 200, 0.5, OrderType.FOK)) # rejected, no diff
+
+            self.assertEqual([d.seq() for d in diffs], [1, 2, 3])
+            self.assertEqual(diffs[0].bids(), [(Decimal('99.00'), Decimal('2.00'), 1)])
+            self.assertEqual(diffs[2].bids(), [(Decimal('99.00'), Decimal('0.00'), 0)])
+            self.assertEqual(diffs[2].asks(), [(Decimal('99.00'), Decimal('1.00'), 1)])
+
+            lob.step_updates({'bids': [(97, 5), (96, 1)], 'asks': []})
+            self.assertEqual(diffs[3].bids(), [(Decimal('97.00'), Decimal('5.00'), 1), 
+                                               (Decimal('96.00'), Decimal('1.00'), 1)])
+
+            lob.unsubscribe(diffs.append)
+            lob(OrderParams(OrderSide.BID, 95, 1))
+            self.assertEqual(len(diffs), 4)
+            self.assertIsNone(lob._bidside._changes)
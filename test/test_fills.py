@@ -0,0 +1,73 @@
+import unittest, logging, random
+from collections import defaultdict
+from decimal import Decimal
+from hypothesis import given, settings, strategies as st
+
+from fastlob import Orderbook, OrderParams, OrderSide, OrderStatus, Fill
+
+valid_seed = st.integers(min_value=0, max_value=2**32)
+
+class TestFills(unittest.TestCase):
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL)
+
+    def test_sweep(self):
+        with Orderbook('fills') as lob:
+            makers = [lob(OrderParams(OrderSide.ASK, price, qty)).orderid()
+                      for price, qty in ((100, 1), (100, 2), (101, 3), (102, 5))]
+            lob.step_updates({'bids': [], 'asks': [(101, 4)]}) # external volume, behind the order at 101
+
+            received = list()
+            lob.subscribe_fills(received.append)
+
+            result = lob(OrderParams(OrderSide.BID, 102, 12))
+            self.assertListEqual(result.fills(), [
+                Fill(1, result.orderid(), makers[0], Decimal('100.00'), Decimal('1.00')),
+                Fill(2, result.orderid(), makers[1], Decimal('100.00'), Decimal('2.00')),
+                Fill(3, result.orderid(), makers[2], Decimal('101.00'), Decimal('3.00')),
+                Fill(4, result.orderid(), None, Decimal('101.00'), Decimal('4.00')),
+                Fill(5, result.orderid(), makers[3], Decimal('102.00'), Decimal('2.00')), # partially
+            ])
+            self.assertListEqual(received, [result.fills()])
+            self.assertEqual(lob.get_status(makers[3]), (OrderStatus.PARTIAL, Decimal('3.00')))
+
+            # limit orders that do not cross have no fills, numbering goes on
+            self.assertListEqual(lob(OrderParams(OrderSide.BID, 90, 1)).fills(), list())
+            self.assertEqual(lob(OrderParams(OrderSide.BID, 102, 1)).fills()[0].seq(), 6)
+
+            lob.unsubscribe_fills(received.append)
+            lob(OrderParams(OrderSide.BID, 102, 1))
+            self.assertEqual(len(received), 2)
+            self.assertEqual(lob.fill_seq(), 7)
+
+    @settings(max_examples=10, deadline=None)
+    @given(valid_seed, st.booleans())
+    def test_consistent(self, seed, ticks):
+        # the fills add up to the execution prices, and to what each resting order lost
+        rng = random.Random(seed)
+        fills = list()
+
+        with Orderbook('fills', ticks=ticks) as lob:
+            lob.subscribe_fills(fills.extend)
+            remaining = dict()
+
+            for _ in range(300):
+                side = rng.choice((OrderSide.BID, OrderSide.ASK))
+                result = lob(OrderParams(side, round(rng.uniform(97, 103), 2), round(rng.uniform(0.01, 50), 2)))
+                if not result.success(): continue
+
+                traded = defaultdict(Decimal)
+                for fill in result.fills():
+                    self.assertEqual(fill.taker(), result.orderid())
+                    traded[fill.price()] += fill.quantity()
+                    remaining[fill.maker()] -= fill.quantity()
+                if result.fills(): self.assertDictEqual(dict(traded), dict(result.execprices()))
+
+                status = lob.get_status(result.orderid())
+                if status[0] in (OrderStatus.PENDING, OrderStatus.PARTIAL): remaining[result.orderid()] = status[1]
+
+                for maker, qty in remaining.items():
+                    if lob.get_status(maker)[0] in (OrderStatus.PENDING, OrderStatus.PARTIAL):
+                        self.assertEqual(lob.get_status(maker)[1], qty)
+
+        self.assertListEqual([fill.seq() for fill in fills], list(range(1, len(fills) + 1)))
@@ -0,0 +1,49 @@
+import unittest, logging
+
+from fastlob import Orderbook, OrderParams, OrderSide, OrderStatus, SequentialIdGenerator, PrefixedIdGenerator, \
+    ShardedIdGenerator, RandomIdGenerator
+
+class TestIds(unittest.TestCase):
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL)
+
+    def test_sequential(self):
+        ids = SequentialIdGenerator()
+        self.assertListEqual([ids.next_id() for _ in range(5)], [1, 2, 3, 4, 5])
+
+    def test_prefixed(self):
+        ids = PrefixedIdGenerator('BTC-', start=10)
+        self.assertListEqual([ids.next_id() for _ in range(3)], ['BTC-10', 'BTC-11', 'BTC-12'])
+
+    def test_sharded(self):
+        a, b = ShardedIdGenerator(1, bits=8), ShardedIdGenerator(2, bits=8)
+        ids_a = {a.next_id() for _ in range(255)}
+        ids_b = {b.next_id() for _ in range(255)}
+
+        self.assertEqual(len(ids_a), 255)
+        self.assertTrue(ids_a.isdisjoint(ids_b))
+        self.assertTrue(all(i >> 8 == 1 for i in ids_a))
+        with self.assertRaises(OverflowError): a.next_id()
+
+    def test_random(self):
+        ids = RandomIdGenerator()
+        generated = {ids.next_id() for _ in range(1000)}
+        self.assertEqual(len(generated), 1000)
+        self.assertTrue(all(isinstance(i, str) for i in generated))
+
+    def test_lob_default_sequential(self):
+        with Orderbook() as lob:
+            r1 = lob(OrderParams(OrderSide.BID, 100, 1))
+            r2 = lob(OrderParams(OrderSide.ASK, 101, 1))
+
+            self.assertEqual((r1.orderid(), r2.orderid()), (1, 2))
+            self.assertEqual(lob.get_status(1), (OrderStatus.PENDING, 1))
+            self.assertTrue(lob.update(2, 3).success())
+            self.assertTrue(lob.cancel(1).success())
+
+    def test_lob_custom(self):
+        for ids in (PrefixedIdGenerator('A-'), ShardedIdGenerator(3), RandomIdGenerator()):
+            with Orderbook(ids=ids) as lob:
+                r = lob(OrderParams(OrderSide.BID, 100, 1))
+                self.assertEqual(lob.get_status(r.orderid()), (OrderStatus.PENDING, 1))
+                self.assertTrue(lob.cancel(r.orderid()).success())
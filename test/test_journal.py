@@ -0,0 +1,144 @@
+import unittest, logging, os, tempfile, random
+from unittest import mock
+from hypothesis import given, settings, strategies as st
+
+from fastlob import Orderbook, OrderParams, OrderSide, OrderType, SimulatedClock, RandomIdGenerator
+from fastlob.journal import Journal, read_journal, KIND_PROCESS, KIND_CANCEL, KIND_STEP, KIND_ADVANCE
+
+T0 = 1_700_000_000.0
+
+valid_seed = st.integers(min_value=0, max_value=2**32)
+
+def random_commands(lob: Orderbook, seed: int, n: int = 300) -> None:
+    # orders (some GTD), updates, cancellations, L2 updates and clock moves
+    rng = random.Random(seed)
+    t = lob._clock.now()
+    for _ in range(n):
+        x = rng.random()
+        if x < 0.1:
+            bids = [(round(rng.uniform(95, 99.99), 2), rng.choice((0, round(rng.uniform(0.01, 20), 2))))]
+            asks = [(round(rng.uniform(100, 105), 2), rng.choice((0, round(rng.uniform(0.01, 20), 2))))]
+            t += rng.random()
+            lob.step_updates({'bids': bids, 'asks': asks, 'timestamp': t})
+        elif x < 0.15 and lob._orders: lob.cancel(rng.choice(list(lob._orders)))
+        elif x < 0.2 and lob._orders: lob.update(rng.choice(list(lob._orders)), round(rng.uniform(0.01, 50), 2))
+        elif x < 0.25:
+            t += rng.random()
+            lob.advance_to(t)
+        else:
+            side = rng.choice((OrderSide.BID, OrderSide.ASK))
+            price, qty = round(rng.uniform(97, 103), 2), round(rng.uniform(0.01, 50), 2)
+            if rng.random() < 0.2: lob(OrderParams(side, price, qty, OrderType.GTD, t + rng.uniform(1, 20)))
+            else: lob(OrderParams(side, price, qty))
+
+def state(lob: Orderbook) -> tuple:
+    queues = [(lim.price(), lim.external_volume(), [o.id() for o in lim.orders()])
+              for side in (lob._askside, lob._bidside) for lim in side.limits()]
+    statuses = {orderid: lob.get_status(orderid) for orderid in lob._orders}
+    return queues, statuses, lob._clock.now(), lob._seq
+
+class TestJournal(unittest.TestCase):
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL)
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'lob.journal')
+
+    def tearDown(self):
+        for name in os.listdir(self.dir): os.remove(os.path.join(self.dir, name))
+
+    @settings(max_examples=10, deadline=None)
+    @given(valid_seed, st.booleans())
+    def test_replay(self, seed, ticks):
+        if os.path.exists(self.path): os.remove(self.path)
+
+        with Journal(self.path) as journal, Orderbook('journaled', clock=SimulatedClock(T0), ticks=ticks,
+                                                     journal=journal) as lob1:
+            random_commands(lob1, seed)
+
+        with Orderbook('replayed', clock=SimulatedClock(T0), ticks=ticks) as lob2:
+            self.assertEqual(lob2.replay(self.path), lob1._seq)
+            self.assertEqual(state(lob1), state(lob2))
+
+    @settings(max_examples=5, deadline=None)
+    @given(valid_seed)
+    def test_replay_ids(self, seed):
+        # random ids can not be generated again, replayed orders reuse the journaled ones
+        if os.path.exists(self.path): os.remove(self.path)
+
+        with Journal(self.path) as journal, Orderbook('journaled', clock=SimulatedClock(T0), ids=RandomIdGenerator(),
+                                                     journal=journal) as lob1:
+            random_commands(lob1, seed)
+
+        with Orderbook('replayed', clock=SimulatedClock(T0), ids=RandomIdGenerator()) as lob2:
+            lob2.replay(self.path)
+            self.assertEqual(state(lob1), state(lob2))
+
+    @settings(max_examples=10, deadline=None)
+    @given(valid_seed)
+    def test_recover(self, seed):
+        checkpoint = os.path.join(self.dir, 'lob.ckpt')
+
+        with Journal(self.path, interval=0.001) as journal, \
+             Orderbook('journaled', clock=SimulatedClock(T0), journal=journal) as lob1:
+            random_commands(lob1, seed, 150)
+            lob1.save_checkpoint(checkpoint)
+            random_commands(lob1, seed + 1, 150)
+
+        lob2 = Orderbook.recover(checkpoint, self.path, clock=SimulatedClock(T0))
+        self.assertEqual(state(lob1), state(lob2))
+
+        # the recovered lob keeps journaling after the last sequence number
+        with Journal(self.path) as journal:
+            self.assertEqual(journal.last_seq(), lob1._seq)
+            lob2._journal = journal
+            lob2(OrderParams(OrderSide.BID, 1, 1))
+            self.assertEqual(lob2._seq, lob1._seq + 1)
+        lob2.stop()
+
+        self.assertEqual([seq for seq, _, _ in read_journal(self.path)], list(range(1, lob1._seq + 2)))
+
+    def test_records(self):
+        with Journal(self.path, interval=0) as journal:
+            self.assertEqual(journal.append_process(OrderSide.ASK, OrderType.GTD, 10050, 125, T0, 7), 1)
+            self.assertEqual(journal.append_cancel('X-1'), 2)
+            self.assertEqual(journal.append_step(([9900], [0]), ([10100, 10200], [5, 7]), None), 3)
+            self.assertEqual(journal.append_advance(T0), 4)
+
+        self.assertEqual(list(read_journal(self.path)), [
+            (1, KIND_PROCESS, (OrderSide.ASK, OrderType.GTD, 10050, 125, T0, 7)),
+            (2, KIND_CANCEL, ('X-1',)),
+            (3, KIND_STEP, (([9900], [0]), ([10100, 10200], [5, 7]), None)),
+            (4, KIND_ADVANCE, (T0,)),
+        ])
+
+    def test_torn_tail(self):
+        with Journal(self.path, interval=0) as journal:
+            for _ in range(3): journal.append_advance(T0)
+
+        with open(self.path, 'ab') as file: file.write(b'\x10\x00\x00\x00garbage') # record cut while written
+        self.assertEqual(len(list(read_journal(self.path))), 3)
+
+        with Journal(self.path) as journal: # truncated on open, numbering goes on
+            self.assertEqual(journal.last_seq(), 3)
+            self.assertEqual(journal.append_advance(T0), 4)
+
+        self.assertEqual([seq for seq, _, _ in read_journal(self.path)], [1, 2, 3, 4])
+
+    def test_group_commit(self):
+        with mock.patch('os.fsync') as fsync:
+            with Journal(self.path, interval=60) as journal:
+                fsync.reset_mock() # the file header
+                with Orderbook('grouped', journal=journal) as lob:
+                    lob.process_many(OrderParams(OrderSide.BID, 100, 1) for _ in range(1000))
+                    self.assertEqual(fsync.call_count, 0)
+                self.assertEqual(fsync.call_count, 1) # synced once when stopped
+
+        self.assertEqual(len(list(read_journal(self.path))), 1000)
+
+    def test_closed(self):
+        journal = Journal(self.path, interval=60)
+        journal.append_cancel(1)
+        journal.close()
+
+        self.assertRaises(RuntimeError, journal.append_cancel, 2)
+        self.assertEqual([seq for seq, _, _ in read_journal(self.path)], [1])
@@ -0,0 +1,95 @@
+import unittest, logging, os, tempfile, random, warnings, gc
+
+from fastlob import Orderbook
+from fastlob.l2 import L2File, L2Writer, LevelsView, convert
+from fastlob.utils import todecimal_price, todecimal_quantity
+
+def random_updates(seed: int, n: int = 200) -> list[dict]:
+    rng = random.Random(seed)
+    updates = list()
+    for i in range(n):
+        bids = [(round(rng.uniform(90, 99.99), 2), rng.choice((0, round(rng.uniform(0.01, 50), 2)))) for _ in range(5)]
+        asks = [(round(rng.uniform(100, 110), 2), rng.choice((0, round(rng.uniform(0.01, 50), 2)))) for _ in range(5)]
+        updates.append({'bids': bids, 'asks': asks, 'timestamp': 1000.0 + i})
+    return updates
+
+SNAPSHOT = {'bids': [(99.5, 10), (98.25, 4.5)], 'asks': [(100.5, 3), (101, 7.25)]}
+
+class TestL2(unittest.TestCase):
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL)
+        self.path = os.path.join(tempfile.mkdtemp(), 'updates.l2')
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_roundtrip(self):
+        updates = random_updates(0)
+        self.assertEqual(convert(self.path, updates, SNAPSHOT), len(updates) + 1)
+
+        with L2File(self.path) as data:
+            self.assertEqual(len(data), len(updates))
+
+            snapshot = data.snapshot()
+            self.assertIsInstance(snapshot['bids'], LevelsView)
+            self.assertListEqual(list(snapshot['asks']), [(todecimal_price(p), todecimal_quantity(v))
+                                                          for p, v in SNAPSHOT['asks']])
+
+            for update, record in zip(updates, data, strict=True):
+                self.assertEqual(record['timestamp'], update['timestamp'])
+                for key in ('bids', 'asks'):
+                    expected = [(todecimal_price(p), todecimal_quantity(v)) for p, v in update[key]]
+                    self.assertListEqual(list(record[key]), expected)
+                    self.assertEqual(record[key][-1], expected[-1])
+
+            del snapshot, record
+
+    def test_replay(self):
+        updates = random_updates(1)
+        convert(self.path, updates, SNAPSHOT)
+
+        for ticks in (False, True):
+            lob = Orderbook.from_snapshot(SNAPSHOT, start=True, ticks=ticks)
+            lob.load_updates(updates)
+
+            with L2File(self.path) as data:
+                lob_binary = Orderbook.from_snapshot(data.snapshot(), start=True, ticks=ticks)
+                lob_binary.load_updates(data)
+
+                for _ in range(len(updates)):
+                    lob.step(); lob_binary.step()
+                    self.assertListEqual(lob.best_bids(10), lob_binary.best_bids(10))
+                    self.assertListEqual(lob.best_asks(10), lob_binary.best_asks(10))
+
+            lob.stop(); lob_binary.stop()
+
+    def test_no_snapshot(self):
+        with L2Writer(self.path) as writer: writer.write_update({'bids': [(99, 1)], 'asks': []})
+
+        with L2File(self.path) as data:
+            self.assertIsNone(data.snapshot())
+            self.assertEqual(len(data), 1)
+            record = next(iter(data))
+            self.assertNotIn('timestamp', record)
+            self.assertEqual(len(record['asks']), 0)
+            del record
+
+    def test_invalid(self):
+        with L2Writer(self.path) as writer:
+            writer.write_update({'bids': [], 'asks': []})
+            self.assertRaises(ValueError, writer.write_snapshot, SNAPSHOT)
+
+        with open(self.path, 'r+b') as f: f.write(b'XXXX')
+
+        with warnings.catch_warnings(record=True) as caught: # the file is closed, not leaked
+            warnings.simplefilter('always')
+            self.assertRaises(ValueError, L2File, self.path)
+            gc.collect()
+        self.assertFalse([w for w in caught if issubclass(w.category, ResourceWarning)])
+
+    def test_invalid_levels(self):
+        with L2Writer(self.path) as writer: writer.write_update({'bids': [(-1, 1)], 'asks': []})
+
+        with L2File(self.path) as data, Orderbook('invalid', ticks=True) as lob:
+            self.assertRaises(ValueError, lob.step_updates, next(iter(data)))
+            self.assertEqual(lob.n_prices(), 0)
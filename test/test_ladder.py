@@ -0,0 +1,82 @@
+import unittest, logging, random
+from hypothesis import given, settings, strategies as st
+
+from fastlob import Orderbook, OrderParams, OrderSide, ResultType
+from fastlob.side import PriceLadder, AskSide, BidSide
+from fastlob.limit import Limit
+
+valid_seed = st.integers(min_value=0, max_value=2**32)
+valid_prices = st.lists(st.integers(min_value=0, max_value=1000), max_size=200)
+
+def random_flow(seed: int, n: int = 300) -> list[OrderParams]:
+    rng = random.Random(seed)
+    flow = list()
+    for _ in range(n):
+        side = rng.choice((OrderSide.BID, OrderSide.ASK))
+        price = round(rng.uniform(95, 105), 2)
+        qty = round(rng.uniform(0.01, 50), 2)
+        flow.append(OrderParams(side, price, qty))
+    return flow
+
+class TestLadder(unittest.TestCase):
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL)
+
+    @given(valid_prices, valid_prices)
+    def test_ladder_order(self, inserted, removed):
+        for reverse in (False, True):
+            ladder = PriceLadder(0, 1000, reverse=reverse)
+            expected = set()
+
+            for price in inserted:
+                ladder[price] = Limit(price, ticks=True)
+                expected.add(price)
+
+            for price in removed:
+                if price in expected:
+                    del ladder[price]
+                    expected.remove(price)
+
+            self.assertEqual(len(ladder), len(expected))
+            self.assertListEqual(list(ladder.keys()), sorted(expected, reverse=reverse))
+            if expected: self.assertEqual(ladder.peekitem(0)[0], max(expected) if reverse else min(expected))
+
+    def test_out_of_range(self):
+        ladder = PriceLadder(100, 200)
+
+        self.assertFalse(ladder.in_range(99))
+        self.assertFalse(250 in ladder)
+        with self.assertRaises(ValueError): ladder[201] = Limit(201, ticks=True)
+        with self.assertRaises(KeyError): ladder[150]
+
+    def test_requires_ticks(self):
+        with self.assertRaises(ValueError): AskSide(ladder=(0, 100))
+        with self.assertRaises(ValueError): BidSide(ladder=(0, 100))
+        with self.assertRaises(ValueError): Orderbook(ladder=(90, 110))
+
+    @settings(max_examples=20, deadline=None)
+    @given(valid_seed)
+    def test_same_as_sorteddict(self, seed):
+        with Orderbook('sorted', ticks=True) as lob1, Orderbook('ladder', ticks=True, ladder=(90, 110)) as lob2:
+            for params in random_flow(seed):
+                r1, r2 = lob1(params), lob2(params)
+
+                self.assertEqual(r1.kind(), r2.kind())
+                self.assertEqual(r1.n_orders_matched(), r2.n_orders_matched())
+                if r1.kind() in (ResultType.MARKET, ResultType.PARTIAL_MARKET):
+                    self.assertDictEqual(r1.execprices(), r2.execprices())
+
+            self.assertListEqual(lob1.best_asks(50), lob2.best_asks(50))
+            self.assertListEqual(lob1.best_bids(50), lob2.best_bids(50))
+            self.assertEqual(lob1.total_volume(), lob2.total_volume())
+
+    def test_reject_out_of_ladder(self):
+        with Orderbook('ladder', ticks=True, ladder=(90, 110)) as lob:
+            r = lob(OrderParams(OrderSide.BID, 120, 1))
+            self.assertFalse(r.success())
+            self.assertEqual(lob.n_prices(), 0)
+
+            r = lob(OrderParams(OrderSide.BID, 100, 1))
+            self.assertTrue(r.success())
+            self.assertTrue(lob.cancel(r.orderid()).success())
+            self.assertEqual(lob.n_prices(), 0)
@@ -0,0 +1,85 @@
+import unittest, logging, random
+
+from hypothesis import given, strategies as st
+
+from fastlob import Orderbook, OrderParams, OrderSide, OrderType, SimulatedClock
+from fastlob.lob.latency import LatencyHistogram, bucket, bucket_value, N_BUCKETS, SUB_BUCKETS
+
+class TestLatencyHistogram(unittest.TestCase):
+    @given(st.integers(min_value=0, max_value=2**63))
+    def test_bucket(self, ns):
+        index = bucket(ns)
+        self.assertLess(index, N_BUCKETS)
+        self.assertGreaterEqual(bucket_value(index), ns)
+        if index: self.assertLess(bucket_value(index - 1), ns) # the buckets are contiguous
+        self.assertLessEqual(bucket_value(index) - ns, ns / SUB_BUCKETS) # within 1 / SUB_BUCKETS
+
+    def test_percentiles(self):
+        rng = random.Random(0)
+        durations = sorted(int(rng.lognormvariate(9, 2)) for _ in range(10_000))
+
+        histogram = LatencyHistogram()
+        for ns in durations: histogram.record(ns)
+
+        summary = histogram.summary()
+        self.assertEqual(summary['count'], 10_000)
+        self.assertEqual(summary['max'], durations[-1])
+        self.assertAlmostEqual(summary['mean'], sum(durations) / 10_000)
+        for q in (50, 90, 99, 99.9):
+            exact = durations[round(q / 100 * 10_000) - 1]
+            self.assertGreaterEqual(summary[f'p{q:g}'], exact)
+            self.assertLessEqual(summary[f'p{q:g}'], exact * (1 + 1 / SUB_BUCKETS))
+
+        other = LatencyHistogram()
+        other.record(10**12)
+        histogram.merge(other)
+        self.assertEqual(histogram.count(), 10_001)
+        self.assertEqual(histogram.max(), 10**12)
+
+        self.assertDictEqual(LatencyHistogram().summary(),
+                             {'count': 0, 'mean': 0.0, 'p50': 0, 'p90': 0, 'p99': 0, 'p99.9': 0, 'max': 0})
+
+class TestOrderbookStats(unittest.TestCase):
+    def setUp(self): logging.basicConfig(level=logging.FATAL)
+
+    def test_stats(self):
+        with Orderbook(latency=True, clock=SimulatedClock(10)) as lob:
+            for i in range(10): lob(OrderParams(OrderSide.BID, 99 - i, 1))
+            lob(OrderParams(OrderSide.ASK, 99, 1))    # market
+            lob(OrderParams(OrderSide.ASK, 98, 2))    # partial market
+            lob(OrderParams(OrderSide.ASK, 90, 1000))
+            lob(OrderParams(OrderSide.ASK, 120, 1, OrderType.GTD, expiry=5)) # expired: error
+            lob.cancel(lob(OrderParams(OrderSide.ASK, 120, 1)).orderid())
+            lob.cancel('nothing')
+            lob.update(lob(OrderParams(OrderSide.ASK, 120, 1)).orderid(), 2)
+            lob.step_updates({'bids': [(50, 1)], 'asks': list()})
+
+            stats = lob.stats()
+            by_kind = {kind: summary['count'] for kind, summary in stats['process']['by_kind'].items()}
+            self.assertDictEqual(by_kind, {'LIMIT': 12, 'MARKET': 1, 'PARTIAL_MARKET': 2, 'ERROR': 1})
+            self.assertEqual(stats['process']['count'], 16)
+            self.assertEqual(stats['cancel']['count'], 2)
+            self.assertEqual(stats['update']['count'], 1)
+            self.assertEqual(stats['step_updates']['count'], 1)
+
+            for summary in (stats['process'], stats['cancel']):
+                values = [summary[key] for key in ('p50', 'p90', 'p99', 'p99.9', 'max')]
+                self.assertListEqual(values, sorted(values))
+                self.assertGreater(summary['p50'], 0)
+
+            # a new recorder starts from scratch
+            lob.record_latency(True)
+            self.assertEqual(lob.stats()['process']['count'], 0)
+
+            lob.record_latency(False)
+            lob(OrderParams(OrderSide.BID, 10, 1))
+            self.assertIsNone(lob.stats())
+
+    def test_disabled(self):
+        with Orderbook() as lob:
+            lob(OrderParams(OrderSide.BID, 10, 1))
+            self.assertIsNone(lob.stats())
+
+        with Orderbook(latency=True) as lob:
+            lob.reset()
+            self.assertIsNotNone(lob.stats())
@@ -132,4 +132,59 @@ class TestLimit(unittest.TestCase):
         limit.fill_all()
 
         self.assertTrue(all([o.quantity() == 0 for o in orders]))
-        self.assertTrue(all([o.status() == OrderStatus.FILLED for o in orders]))
\ No newline at end of file
+        self.assertTrue(all([o.status() == OrderStatus.FILLED for o in orders]))
+
+    @given(valid_price, valid_side, valid_qty, valid_otype_noGTD, valid_expiry_noGTD)
+    def test_cancel_unlinks(self, price, side, qty, otype, expiry):
+        limit = Limit(price)
+        params = OrderParams(side, price, qty, otype, expiry)
+        orders = [self.mkorder(params) for _ in range(10)]
+
+        for order in orders: limit.enqueue(order)
+
+        for i in (0, 5, 9): limit.cancel_order(orders[i])
+
+        # canceled orders are removed from the queue right away, fifo priority is kept
+        self.assertListEqual(list(limit._orderqueue), [o for i, o in enumerate(orders) if i not in (0, 5, 9)])
+        self.assertEqual(limit.valid_orders(), 7)
+        self.assertEqual(len(limit._orderqueue), 7)
+        self.assertEqual(limit.next_order(), orders[1])
+
+        for i in (1, 2, 3, 4, 6, 7, 8):
+            self.assertEqual(limit.next_order(), orders[i])
+            limit.pop_next_order()
+
+        self.assertTrue(limit.empty())
+        self.assertTrue(limit.deepempty())
+
+    def test_external_priority(self):
+        limit = Limit(Decimal('100'))
+        params = OrderParams(OrderSide.BID, 100, 1)
+        o1, o2, o3 = self.mkorder(params), self.mkorder(params), self.mkorder(params)
+
+        limit.enqueue(o1)
+        limit.enqueue(o2)
+        limit.set_external(Decimal('5')) # queued behind o1 and o2
+        limit.enqueue(o3)
+
+        self.assertEqual(limit.valid_orders(), 4)
+        self.assertEqual(limit.real_orders(), 3)
+        self.assertEqual(limit.volume(), 8)
+
+        limit.cancel_order(o2) # the external volume moves up behind o1
+        self.assertIs(limit.pop_next(), o1)
+        self.assertEqual(limit.next_quantity(), 5)
+
+        limit.fill_next(2)
+        self.assertEqual(limit.external_volume(), 3)
+        self.assertEqual(limit.volume(), 4)
+
+        limit.set_external(Decimal('4')) # overwritten, goes back behind o3
+        self.assertEqual(limit.next_quantity(), 1)
+        self.assertIs(limit.pop_next(), o3)
+        self.assertIsNone(limit.pop_next())
+
+        self.assertEqual(o3.status(), OrderStatus.FILLED)
+        self.assertEqual(limit.volume(), 0)
+        self.assertTrue(limit.empty())
+        self.assertTrue(limit.deepempty())
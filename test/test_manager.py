@@ -0,0 +1,72 @@
+import unittest, logging, random
+
+from fastlob import Orderbook, OrderParams, OrderSide
+from fastlob.manager import BookManager
+
+def random_orders(seed: int, n: int = 200) -> list[OrderParams]:
+    rng = random.Random(seed)
+    return [OrderParams(rng.choice((OrderSide.BID, OrderSide.ASK)), round(rng.uniform(97, 103), 2),
+                        round(rng.uniform(0.01, 50), 2)) for _ in range(n)]
+
+def summary(result) -> tuple:
+    return result.success(), result.orderid(), result.kind(), result.n_orders_matched(), result.fills()
+
+class TestManager(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        logging.basicConfig(level=logging.FATAL)
+        cls.manager = BookManager(shards=2, batch_size=64, ticks=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.manager.close()
+
+    def test_same_as_local(self):
+        symbols = ['AAA', 'BBB', 'CCC']
+        for symbol in symbols: self.manager.add(symbol).result()
+
+        futures = {symbol: [self.manager.process(symbol, params) for params in random_orders(i)]
+                   for i, symbol in enumerate(symbols)}
+
+        for i, symbol in enumerate(symbols):
+            with Orderbook(symbol, ticks=True) as lob:
+                expected = [summary(lob(params)) for params in random_orders(i)]
+                self.assertListEqual([summary(future.result()) for future in futures[symbol]], expected)
+                self.assertListEqual(self.manager.call(symbol, 'best_bids', 5).result(), lob.best_bids(5))
+
+        for symbol in symbols: self.manager.remove(symbol).result()
+        self.assertListEqual(self.manager.symbols(), list())
+
+    def test_placement(self):
+        self.manager.add('HEAVY', load=10).result()
+        self.manager.add('LIGHT1').result()
+        self.manager.add('LIGHT2').result()
+
+        self.assertEqual(self.manager.shard_of('LIGHT1'), self.manager.shard_of('LIGHT2'))
+        self.assertNotEqual(self.manager.shard_of('HEAVY'), self.manager.shard_of('LIGHT1'))
+        self.assertListEqual(sorted(self.manager.loads()), [2.0, 10.0])
+
+        for symbol in ('HEAVY', 'LIGHT1', 'LIGHT2'): self.manager.remove(symbol).result()
+        self.assertListEqual(self.manager.loads(), [0.0, 0.0])
+
+    def test_cancel_update_stats(self):
+        self.manager.add('DDD').result()
+        orderid = self.manager.process('DDD', OrderParams(OrderSide.BID, 99, 10)).result().orderid()
+
+        self.assertTrue(self.manager.update('DDD', orderid, 5).result().success())
+        self.assertTrue(self.manager.cancel('DDD', orderid).result().success())
+
+        stats = self.manager.stats()
+        self.assertEqual(len(stats['shards']), 2)
+        self.assertEqual(stats['by_symbol']['DDD'], 4) # add, process, update, cancel
+        self.assertGreaterEqual(stats['commands'], 4)
+        self.manager.remove('DDD').result()
+
+    def test_errors(self):
+        self.assertRaises(KeyError, self.manager.process, 'UNKNOWN', OrderParams(OrderSide.BID, 99, 10))
+        self.assertRaises(ValueError, self.manager.call, 'UNKNOWN', '_process')
+
+        self.manager.add('EEE').result()
+        self.assertRaises(ValueError, self.manager.add, 'EEE')
+        self.assertRaises(AttributeError, self.manager.call('EEE', 'not_a_method').result)
+        self.manager.remove('EEE').result()
@@ -63,4 +63,11 @@ class TestOrder(unittest.TestCase):
             self.assertEqual(order.status(), OrderStatus.FILLED)
         else: 
             self.assertEqual(qty - tofill, order.quantity())
-            self.assertEqual(order.status(), OrderStatus.PARTIAL)
\ No newline at end of file
+            self.assertEqual(order.status(), OrderStatus.PARTIAL)
+
+    @given(valid_side, valid_price, valid_qty, valid_otype_noGTD, valid_expiry_noGTD)
+    def test_slots(self, side, price, qty, otype, expiry):
+        order = self.mkorder(OrderParams(side, price, qty, otype, expiry))
+
+        self.assertFalse(hasattr(order, '__dict__'))
+        with self.assertRaises(AttributeError): order.foo = 1
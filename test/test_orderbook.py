@@ -1,7 +1,7 @@
 import unittest, logging
 from hypothesis import given, strategies as st
 
-from fastlob import Orderbook, OrderSide, OrderParams
+from fastlob import Orderbook, OrderSide, OrderParams, OrderStatus, ResultCode
 from fastlob.utils import todecimal_price, todecimal_quantity
 from fastlob.consts import TICK_SIZE_PRICE, TICK_SIZE_QTY, MAX_VALUE
 
@@ -42,14 +42,14 @@ class TestSide(unittest.TestCase):
         for a, b in zip(lob.best_bids(lob.n_bids()), list(reversed(snapshot['bids']))):
             self.assertTupleEqual(a[:2], b)
             price = a[0]
-            self.assertTrue(lob._bidside.get_limit(price).fakeorder_exists())
+            self.assertEqual(lob._bidside.get_limit(price).external_volume(), a[1])
             self.assertEqual(lob._bidside.get_limit(price).valid_orders(), 1)
             self.assertEqual(lob._bidside.get_limit(price).real_orders(), 0)
 
         for a, b in zip(lob.best_asks(lob.n_asks()), snapshot['asks']):
             self.assertTupleEqual(a[:2], b)
             price = a[0]
-            self.assertTrue(lob._askside.get_limit(price).fakeorder_exists())
+            self.assertEqual(lob._askside.get_limit(price).external_volume(), a[1])
             self.assertEqual(lob._askside.get_limit(price).valid_orders(), 1)
             self.assertEqual(lob._askside.get_limit(price).real_orders(), 0)
 
@@ -159,4 +159,42 @@ class TestSide(unittest.TestCase):
         with lob as l: self.assertTrue(l.is_running())
         self.assertFalse(lob.is_running())
 
-        
+    def test_compact_history(self):
+        with Orderbook(compact_history=True) as lob:
+            N = 3_000
+            ids = list()
+
+            for i in range(N):
+                side = OrderSide.BID if i % 2 == 0 else OrderSide.ASK
+                ids.append(lob(OrderParams(side, 100, 1)).orderid())
+
+            resting = lob(OrderParams(OrderSide.BID, 99, 5)).orderid()
+
+            self.assertGreater(len(lob._history), 0)
+            self.assertLess(len(lob._orders), N)
+
+            for orderid in ids: self.assertEqual(lob.get_status(orderid), (OrderStatus.FILLED, 0))
+            self.assertEqual(lob.get_status(resting), (OrderStatus.PENDING, 5))
+
+            archived = next(orderid for orderid in ids if orderid in lob._history)
+            self.assertFalse(lob.cancel(archived).success())
+            self.assertFalse(lob.update(archived, 10).success())
+            self.assertTrue(lob.cancel(resting).success())
+
+    def test_hot_codes(self):
+        with Orderbook(hot=True) as lob_hot, Orderbook() as lob:
+            for book in (lob_hot, lob):
+                r = book(OrderParams(OrderSide.BID, 100, 5))
+                self.assertListEqual(book.cancel(r.orderid()).codes(), [ResultCode.CANCELED])
+
+                result = book.cancel(r.orderid())
+                self.assertListEqual(result.codes(), [ResultCode.NOT_CANCELABLE])
+                self.assertEqual(result.messages(), [f'order [{r.orderid()}] can not be canceled (status=OrderStatus.CANCELED)'])
+
+                book(OrderParams(OrderSide.ASK, 101, 2))
+                result = book(OrderParams(OrderSide.BID, 102, 3))
+                self.assertListEqual(result.codes(), [ResultCode.PARTIAL_PLACED])
+
+            self.assertEqual(lob_hot.best_bid(), lob.best_bid())
+
+        self.assertListEqual(lob.cancel(r.orderid()).codes(), [ResultCode.NOT_RUNNING])
@@ -28,7 +28,7 @@ class TestOrderParams(unittest.TestCase):
         self.assertEqual(params.quantity, todecimal_quantity(qty))
         self.assertEqual(params.otype, otype)
         if expiry is None: self.assertEqual(params.expiry, expiry)
-        else: self.assertEqual(params.expiry, int(expiry))
+        else: self.assertEqual(params.expiry, float(expiry))
 
     @given(valid_side, valid_price, valid_qty, valid_otype, valid_expiry)
     def test_valid_init(self, side, price, qty, otype, expiry):
@@ -39,7 +39,7 @@ class TestOrderParams(unittest.TestCase):
         self.assertEqual(params.quantity, todecimal_quantity(qty))
         self.assertEqual(params.otype, otype)
         if expiry is None: self.assertEqual(params.expiry, expiry)
-        else: self.assertEqual(params.expiry, int(expiry))
+        else: self.assertEqual(params.expiry, float(expiry))
 
     def test_invalid_side(self):
         with self.assertRaises(TypeError):
@@ -79,5 +79,5 @@ class TestOrderParams(unittest.TestCase):
         with self.assertRaises(ValueError):
             OrderParams(OrderSide.ASK, 1, 1, OrderType.GTD, None)
 
-        with self.assertRaises(ValueError):
-            OrderParams(OrderSide.ASK, 1, 1, OrderType.GTD, 12)
+        with self.assertRaises(TypeError):
+            OrderParams(OrderSide.ASK, 1, 1, OrderType.GTD, '12')
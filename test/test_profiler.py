@@ -0,0 +1,94 @@
+import unittest, logging, os, sys, tempfile, pstats, time, types
+
+from fastlob import Orderbook, OrderParams, OrderSide
+from fastlob.lob import Profiler
+
+def orders(n: int, side: OrderSide = OrderSide.BID, price: float = 99) -> list[OrderParams]:
+    return [OrderParams(side, price - i % 10, 1) for i in range(n)]
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self): logging.basicConfig(level=logging.FATAL)
+
+    def test_pstats(self):
+        with Orderbook() as lob:
+            profiler = lob.start_profile(n=100)
+
+            for params in orders(60): lob(params)
+            lob(orders(30, OrderSide.ASK, 80)) # process_many, counted per order
+            lob.step_updates({'bids': list(), 'asks': [(120, 1)]})
+            self.assertEqual(profiler.n_ops(), 91)
+            self.assertFalse(profiler.done())
+
+            lob(orders(20))
+            self.assertTrue(profiler.done())
+            self.assertEqual(profiler.n_ops(), 111)
+            self.assertIsNone(lob.stop_profile()) # detached once done
+
+            stats = profiler.stats()
+            files = {os.path.basename(os.path.dirname(filename)) for filename, _, _ in stats.stats}
+            self.assertSetEqual(files, {'engine', 'side', 'limit'})
+            names = {name for _, _, name in stats.stats}
+            self.assertIn('place', names)
+            self.assertIn('fill_whole_orders', names)
+
+            # nothing is profiled anymore
+            calls = stats.total_calls
+            lob(orders(10))
+            self.assertEqual(profiler.stats().total_calls, calls)
+
+            with self.assertRaises(ValueError): profiler.collapsed()
+
+    def test_collapsed(self):
+        with Orderbook() as lob:
+            profiler = lob.start_profile(output='collapsed')
+            lob(orders(20))
+            lob(orders(5, OrderSide.ASK, 80))
+            self.assertIs(lob.stop_profile(), profiler)
+            self.assertTrue(profiler.done())
+
+            lines = profiler.collapsed().splitlines()
+            stacks = dict(line.rsplit(' ', 1) for line in lines)
+            self.assertTrue(all(stack.split(';')[0] == 'process_many' for stack in stacks))
+            self.assertTrue(all(int(ns) >= 0 for ns in stacks.values()))
+            place = 'Side.place' if sys.version_info >= (3, 11) else 'place' # no qualified names before 3.11
+            self.assertIn(f'process_many;side.side:{place}', stacks)
+            self.assertTrue(any('engine.engine:fill_whole_orders' in stack for stack in stacks))
+
+            with self.assertRaises(ValueError): profiler.stats()
+
+    def test_names_without_qualname(self):
+        # code objects only have a qualified name since python 3.11
+        profiler = Profiler(output='collapsed')
+        code = types.SimpleNamespace(co_filename=os.path.join('fastlob', 'side', 'side.py'), co_name='place')
+        self.assertEqual(profiler._name(code), 'side.side:place')
+
+    def test_seconds_and_dump(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'lob.prof')
+
+            with Orderbook() as lob:
+                profiler = lob.start_profile(seconds=0.05, path=path)
+                lob(orders(5))
+                self.assertFalse(profiler.done())
+                time.sleep(0.06)
+                lob(orders(5))
+                self.assertTrue(profiler.done())
+
+            stats = pstats.Stats(path)
+            self.assertGreater(stats.total_calls, 0)
+
+    def test_stop_while_profiling(self):
+        with Orderbook() as lob:
+            lob.subscribe_fills(lambda fills: lob.stop_profile())
+            profiler = lob.start_profile(output='collapsed')
+            lob(orders(5))
+            lob(OrderParams(OrderSide.ASK, 99, 1)) # fills, stopping the profiler from the callback
+            self.assertTrue(profiler.done())
+            self.assertEqual(profiler.n_ops(), 6)
+
+    def test_invalid(self):
+        with Orderbook() as lob:
+            with self.assertRaises(ValueError): lob.start_profile(output='text')
+            with self.assertRaises(ValueError): lob.start_profile(n=0)
+            with self.assertRaises(ValueError): lob.start_profile(seconds=-1)
+            self.assertIsNone(lob.stop_profile())
@@ -166,3 +166,4 @@ class TestSide(unittest.TestCase):
 
         self.assertTrue(side.empty())
         self.assertEqual(side.volume(), 0)
+        self.assertEqual(side.tombstones_avoided(), 100)
@@ -0,0 +1,88 @@
+import unittest, logging
+
+from fastlob import Orderbook, OrderSide, SimulatedClock
+from fastlob.sim import OrderFlow, run, LIMIT, MARKET, CANCEL, UPDATE
+
+try: import numpy as np
+except ImportError: np = None
+
+def state(lob: Orderbook) -> tuple:
+    return lob.best_bids(20), lob.best_asks(20), lob.n_bids(), lob.n_asks()
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class TestSim(unittest.TestCase):
+    def setUp(self): logging.basicConfig(level=logging.FATAL)
+
+    def test_batch(self):
+        flow = OrderFlow(seed=0, rate=100, window=50)
+        batch = flow.batch(5000)
+
+        self.assertEqual(len(batch), 5000)
+        self.assertEqual(flow.n_orders(), batch.n_orders())
+        self.assertTrue(np.all(np.diff(batch.times) >= 0))
+        self.assertAlmostEqual(batch.times[-1] / 5000, 1 / 100, delta=0.002) # Poisson arrivals of rate 100
+        self.assertTrue(np.all(batch.prices > 0) and np.all(batch.quantities > 0))
+        self.assertSetEqual(set(batch.kinds.tolist()), {LIMIT, MARKET, CANCEL, UPDATE})
+
+        # limit orders are on their side of the midprice, market orders cross it
+        orders = batch.kinds == LIMIT
+        self.assertTrue(np.all(batch.prices[orders & (batch.sides == 0)] <= 10_000))
+        self.assertTrue(np.all(batch.prices[orders & (batch.sides == 1)] >= 10_000))
+        markets = batch.kinds == MARKET
+        self.assertTrue(np.all(batch.prices[markets & (batch.sides == 0)] >= 10_000))
+
+        # cancellations and updates target one of the last 50 orders preceding them
+        is_order = batch.kinds <= MARKET
+        before = np.cumsum(is_order) - is_order
+        events = ~is_order & (batch.targets >= 0)
+        self.assertTrue(np.all(batch.targets[events] < before[events]))
+        self.assertTrue(np.all(batch.targets[events] >= before[events] - 50))
+
+        params = batch.params()
+        self.assertEqual(len(params), batch.n_orders())
+        self.assertListEqual([p.side == OrderSide.ASK for p in params], (batch.sides[is_order] == 1).tolist())
+
+        # batches follow each other
+        batch = flow.batch(10, midprice=50)
+        self.assertGreater(batch.times[0], flow.time() - 1)
+        self.assertLess(batch.prices[batch.kinds == LIMIT].max(), 6000)
+
+    def test_reproducible(self):
+        a, b = OrderFlow(seed=3).batch(1000), OrderFlow(seed=3).batch(1000)
+        for column in ('kinds', 'times', 'sides', 'prices', 'quantities', 'targets'):
+            self.assertTrue(np.array_equal(getattr(a, column), getattr(b, column)))
+
+        self.assertFalse(np.array_equal(OrderFlow(seed=4).batch(1000).prices, a.prices))
+
+    def test_run(self):
+        states = list()
+        for _ in range(2):
+            with Orderbook(ticks=True, hot=True) as lob:
+                counts = run(lob, OrderFlow(seed=7), 20_000, 5000)
+                states.append(state(lob))
+
+        self.assertEqual(states[0], states[1])
+        self.assertGreater(lob.n_bids(), 0)
+        self.assertGreater(lob.n_asks(), 0)
+        # only the cancellations and updates drawn before the first order are skipped
+        self.assertGreater(counts['orders'] + counts['cancels'] + counts['updates'], 20_000 - 10)
+        self.assertLess(counts['failed'], counts['cancels'] + counts['updates'])
+
+        # the prices follow the midprice of the lob, unless asked not to
+        for follow in (True, False):
+            with Orderbook(ticks=True, hot=True) as lob:
+                lob.step_updates({'bids': [(49.9, 1000)], 'asks': [(50.1, 1000)]})
+                run(lob, OrderFlow(seed=8, midprice=100, p_market=0), 500, follow=follow)
+                self.assertEqual(lob.best_bid()[0] < 60, follow)
+
+    def test_simulated_clock(self):
+        clock = SimulatedClock(0)
+        with Orderbook(clock=clock) as lob:
+            flow = OrderFlow(seed=1, rate=10)
+            run(lob, flow, 1000, 100)
+            self.assertGreater(clock.now(), 0)
+            self.assertLessEqual(clock.now(), flow.time())
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError): OrderFlow(p_market=0.5, p_cancel=0.6)
+        with self.assertRaises(ValueError): OrderFlow(rate=0)
@@ -0,0 +1,87 @@
+import unittest, logging, random, threading, time, tempfile, os
+
+from fastlob import Orderbook, OrderParams, OrderSide, OrderType, OrderStatus
+from fastlob.side import NoLock, AffinityLock
+
+def random_orders(seed: int, n: int = 500) -> list[OrderParams]:
+    rng = random.Random(seed)
+    return [OrderParams(rng.choice((OrderSide.BID, OrderSide.ASK)), round(rng.uniform(97, 103), 2),
+                        round(rng.uniform(0.01, 50), 2)) for _ in range(n)]
+
+def summary(result) -> tuple:
+    return result.success(), result.orderid(), result.kind(), result.n_orders_matched(), result.fills()
+
+def in_thread(function) -> list:
+    '''Call `function` from another thread, returns the exception it raised (if any).'''
+
+    errors = list()
+    def run():
+        try: function()
+        except Exception as e: errors.append(e)
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join()
+    return errors
+
+class TestSingleWriter(unittest.TestCase):
+    def setUp(self): logging.basicConfig(level=logging.FATAL)
+
+    def test_same_results(self):
+        for ticks in (False, True):
+            with Orderbook(ticks=ticks) as lob, Orderbook(ticks=ticks, single_writer=True) as single:
+                self.assertFalse(lob.single_writer())
+                self.assertTrue(single.single_writer())
+                self.assertIsInstance(single._askside.lock(), NoLock)
+
+                for params in random_orders(0):
+                    self.assertEqual(summary(lob(params)), summary(single(params)))
+
+                for orderid in range(1, 500, 7):
+                    self.assertEqual(summary(lob.cancel(orderid)), summary(single.cancel(orderid)))
+                for orderid in range(2, 500, 5):
+                    self.assertEqual(summary(lob.update(orderid, 3)), summary(single.update(orderid, 3)))
+
+                self.assertListEqual(lob.best_bids(10), single.best_bids(10))
+                self.assertListEqual(lob.best_asks(10), single.best_asks(10))
+
+    def test_affinity(self):
+        with Orderbook(single_writer=True, check_affinity=True) as lob:
+            if __debug__: self.assertIsInstance(lob._bidside.lock(), AffinityLock)
+
+            self.assertTrue(lob(OrderParams(OrderSide.BID, 100, 10)).success())
+            errors = in_thread(lambda: lob(OrderParams(OrderSide.BID, 99, 10)))
+            if __debug__:
+                self.assertEqual(len(errors), 1)
+                self.assertIsInstance(errors[0], RuntimeError)
+
+            self.assertTrue(lob(OrderParams(OrderSide.ASK, 100, 5)).success())
+
+        # without the check, a lob can be handed over to another thread
+        with Orderbook(single_writer=True) as lob:
+            lob(OrderParams(OrderSide.BID, 100, 10))
+            self.assertListEqual(in_thread(lambda: lob(OrderParams(OrderSide.ASK, 100, 5))), list())
+            self.assertEqual(lob.best_bid()[1], 5)
+
+    def test_gtd_expiry(self):
+        with Orderbook(single_writer=True) as lob:
+            self.assertIsNone(lob._expiries._thread)
+
+            result = lob(OrderParams(OrderSide.BID, 100, 10, OrderType.GTD, time.time() + 0.05))
+            time.sleep(0.1)
+
+            # expired orders are canceled by the next command
+            self.assertEqual(lob.get_status(result.orderid())[0], OrderStatus.PENDING)
+            lob.cancel(-1)
+            self.assertEqual(lob.get_status(result.orderid())[0], OrderStatus.CANCELED)
+            self.assertEqual(lob.n_bids(), 0)
+
+    def test_checkpoint(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'lob.ckpt')
+            with Orderbook(single_writer=True) as lob:
+                lob(random_orders(1, 50))
+                lob.save_checkpoint(path)
+
+            loaded = Orderbook.load_checkpoint(path)
+            self.assertTrue(loaded.single_writer())
+            self.assertIsInstance(loaded._askside.lock(), NoLock)
@@ -0,0 +1,87 @@
+import unittest, logging, random
+from hypothesis import given, settings, strategies as st
+
+from fastlob import Orderbook, OrderParams, OrderSide, OrderStatus, ResultType
+from fastlob.utils import todecimal_price, todecimal_quantity, toticks_price, toticks_quantity, fromticks_price, \
+    fromticks_quantity
+from fastlob.consts import TICK_SIZE_PRICE, TICK_SIZE_QTY, MAX_VALUE
+
+valid_price = st.decimals(min_value=TICK_SIZE_PRICE, max_value=MAX_VALUE, allow_nan=False, allow_infinity=False)
+valid_qty = st.decimals(min_value=TICK_SIZE_QTY, max_value=MAX_VALUE, allow_nan=False, allow_infinity=False)
+valid_seed = st.integers(min_value=0, max_value=2**32)
+
+def random_flow(seed: int, n: int = 300) -> list[OrderParams]:
+    rng = random.Random(seed)
+    flow = list()
+    for _ in range(n):
+        side = rng.choice((OrderSide.BID, OrderSide.ASK))
+        price = round(rng.uniform(95, 105), 2)
+        qty = round(rng.uniform(0.01, 50), 2)
+        flow.append(OrderParams(side, price, qty))
+    return flow
+
+class TestTicks(unittest.TestCase):
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL)
+
+    @given(valid_price, valid_qty)
+    def test_conversions(self, price, qty):
+        price, qty = todecimal_price(price), todecimal_quantity(qty)
+
+        self.assertIsInstance(toticks_price(price), int)
+        self.assertIsInstance(toticks_quantity(qty), int)
+        self.assertEqual(fromticks_price(toticks_price(price)), price)
+        self.assertEqual(fromticks_quantity(toticks_quantity(qty)), qty)
+
+    @settings(max_examples=20, deadline=None)
+    @given(valid_seed)
+    def test_same_as_decimal(self, seed):
+        with Orderbook('decimal') as lob_decimal, Orderbook('ticks', ticks=True) as lob_ticks:
+            self.check_same(lob_decimal, lob_ticks, seed)
+
+    def check_same(self, lob_decimal, lob_ticks, seed):
+        for params in random_flow(seed):
+            r1, r2 = lob_decimal(params), lob_ticks(params)
+
+            self.assertEqual(r1.kind(), r2.kind())
+            self.assertEqual(r1.success(), r2.success())
+            self.assertEqual(r1.n_orders_matched(), r2.n_orders_matched())
+            if r1.kind() in (ResultType.MARKET, ResultType.PARTIAL_MARKET):
+                self.assertDictEqual(r1.execprices(), r2.execprices())
+
+            self.assertEqual(lob_decimal.get_status(r1.orderid()), lob_ticks.get_status(r2.orderid()))
+
+        self.assertListEqual(lob_decimal.best_asks(20), lob_ticks.best_asks(20))
+        self.assertListEqual(lob_decimal.best_bids(20), lob_ticks.best_bids(20))
+        self.assertEqual(lob_decimal.best_ask(), lob_ticks.best_ask())
+        self.assertEqual(lob_decimal.best_bid(), lob_ticks.best_bid())
+        self.assertEqual(lob_decimal.asks_volume(), lob_ticks.asks_volume())
+        self.assertEqual(lob_decimal.bids_volume(), lob_ticks.bids_volume())
+        self.assertEqual(lob_decimal.midprice(), lob_ticks.midprice())
+        self.assertEqual(lob_decimal.spread(), lob_ticks.spread())
+
+    def test_internal_ints(self):
+        with Orderbook('ticks', ticks=True) as lob: self.check_internal_ints(lob)
+
+    def check_internal_ints(self, lob):
+        r = lob(OrderParams(OrderSide.ASK, 100.25, 3.5))
+        lim = lob._askside.best()
+
+        self.assertIsInstance(lim.price(), int)
+        self.assertIsInstance(lim.volume(), int)
+        self.assertEqual(lim.price(), 10025)
+        self.assertEqual(lob.best_ask(), (todecimal_price(100.25), todecimal_quantity(3.5), 1))
+
+        lob.update(r.orderid(), 1.25)
+        self.assertEqual(lob.get_status(r.orderid()), (OrderStatus.PENDING, todecimal_quantity(1.25)))
+
+    def test_snapshot_and_updates(self):
+        snapshot = {'bids': [(99.5, 10), (98, 5)], 'asks': [(100.5, 3)]}
+        lob = Orderbook.from_snapshot(snapshot, ticks=True)
+
+        self.assertEqual(lob.best_bid()[:2], (todecimal_price(99.5), todecimal_quantity(10)))
+
+        lob.step_updates({'bids': [(99.5, 0)], 'asks': [(100.5, 7.25)]})
+
+        self.assertEqual(lob.best_bid()[:2], (todecimal_price(98), todecimal_quantity(5)))
+        self.assertEqual(lob.best_ask()[:2], (todecimal_price(100.5), todecimal_quantity(7.25)))
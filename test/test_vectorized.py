@@ -0,0 +1,113 @@
+import unittest, logging, random
+from decimal import Decimal
+from hypothesis import given, settings, strategies as st
+
+from fastlob import Orderbook, OrderParams, OrderSide
+
+try: import numpy as np
+except ImportError: np = None
+
+valid_seed = st.integers(min_value=0, max_value=2**32)
+
+def random_levels(rng: random.Random, base: float, n: int) -> tuple[list[float], list[float]]:
+    prices = [round(base + rng.randrange(200) / 100, 2) for _ in range(n)]
+    volumes = [0.0 if rng.random() < 0.2 else round(rng.uniform(0.01, 100), 2) for _ in range(n)]
+    return prices, volumes
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class TestVectorized(unittest.TestCase):
+    def setUp(self):
+        logging.basicConfig(level=logging.FATAL)
+
+    def check_same(self, lob1, lob2):
+        self.assertEqual(lob1.best_asks(1000), lob2.best_asks(1000))
+        self.assertEqual(lob1.best_bids(1000), lob2.best_bids(1000))
+        self.assertEqual(lob1.total_volume(), lob2.total_volume())
+        self.assertEqual(lob1.bbo(), lob2.bbo())
+
+    @settings(max_examples=10, deadline=None)
+    @given(valid_seed, st.booleans())
+    def test_same_as_pairs(self, seed, ticks):
+        rng = random.Random(seed)
+
+        with Orderbook('pairs', ticks=ticks) as lob1, Orderbook('arrays', ticks=ticks) as lob2:
+            for i in range(20):
+                bids, asks = random_levels(rng, 98, 50), random_levels(rng, 100, 50)
+
+                lob1.step_updates({'bids': list(zip(*bids)), 'asks': list(zip(*asks))})
+                # alternate between the two columnar forms
+                if i % 2: lob2.step_updates({'bids': np.column_stack(bids), 'asks': np.column_stack(asks)})
+                else: lob2.step_updates({'bids': tuple(map(np.array, bids)), 'asks': tuple(map(np.array, asks))})
+
+                self.check_same(lob1, lob2)
+
+    def test_snapshot(self):
+        bids = np.array([[99.0, 10.0], [98.5, 3.25]])
+        asks = (np.array([100.0, 100.5]), np.array([1, 2]))
+
+        for ticks in (False, True):
+            lob1 = Orderbook.from_snapshot({'bids': bids, 'asks': asks}, ticks=ticks)
+            lob2 = Orderbook.from_snapshot({'bids': [(99.0, 10.0), (98.5, 3.25)], 'asks': [(100.0, 1), (100.5, 2)]},
+                                           ticks=ticks)
+            self.check_same(lob1, lob2)
+            self.assertEqual(lob1.best_bid(), (Decimal('99.00'), Decimal('10.00'), 1))
+
+    def test_rounding(self):
+        with Orderbook('rounding') as lob:
+            lob.step_updates({'bids': np.array([[99.004, 1.006]]), 'asks': np.empty((0, 2))})
+            self.assertEqual(lob.best_bid(), (Decimal('99.00'), Decimal('1.01'), 1))
+
+    @settings(max_examples=50, deadline=None)
+    @given(st.lists(st.tuples(st.floats(0.01, 1000), st.floats(0.01, 1000)), min_size=1, max_size=50), st.booleans())
+    def test_same_rounding(self, levels, ticks):
+        # values that are not already rounded to the precision, ties included (2.675 is 2.67499999... as a float)
+        levels += [(2.675, 1.125), (0.015, 0.025), (1.005, 0.125)]
+
+        side1, side2 = Orderbook('pairs', ticks=ticks)._bidside, Orderbook('arrays', ticks=ticks)._bidside
+        self.assertEqual(side1.levels(levels), side2.levels(np.array(levels)))
+
+    def test_invalid(self):
+        empty = np.empty((0, 2))
+        invalid = [
+            np.array([[-1.0, 1.0]]),         # negative price
+            np.array([[0.001, 1.0]]),        # price rounding to 0
+            np.array([[99.0, 0.001]]),       # volume rounding to 0 (not a deletion)
+            np.array([[np.nan, 1.0]]),       # not finite
+            np.array([[99.0, np.inf]]),      # not finite
+            np.array([[1e12, 1.0]]),         # too large
+            np.array([99.0, 1.0]),           # not 2-d
+            np.array([[99.0, 1.0, 1.0]]),    # not pairs
+            (np.array([99.0]), np.array([1.0, 2.0])), # lengths differ
+        ]
+
+        for levels in invalid:
+            with Orderbook('invalid') as lob:
+                self.assertRaises(ValueError, lob.step_updates, {'bids': levels, 'asks': empty})
+                self.assertEqual(lob.n_prices(), 0)
+
+        self.assertRaises(ValueError, Orderbook.from_snapshot, {'bids': np.array([[99.0, 0.0]]), 'asks': empty})
+
+    def test_update_in_place(self):
+        with Orderbook('in-place') as lob:
+            lob.step_updates({'bids': np.array([[99.0, 10.0]]), 'asks': np.empty((0, 2))})
+            lob.step_updates({'bids': np.array([[99.0, 4.0]]), 'asks': np.empty((0, 2))})
+
+            self.assertEqual(lob.best_bid(), (Decimal('99.00'), Decimal('4.00'), 1))
+            self.assertEqual(lob.bids_volume(), Decimal('4.00'))
+
+            lob.step_updates({'bids': np.array([[99.0, 0.0]]), 'asks': np.empty((0, 2))})
+            self.assertIsNone(lob.best_bid())
+
+    def test_update_after_fill(self):
+        # the external volume is entirely filled by a market order, the level is then set again from market data
+        with Orderbook('filled') as lob:
+            lob.step_updates({'bids': [], 'asks': [(100.0, 5.0)]})
+            lob(OrderParams(OrderSide.BID, 100, 5))
+            self.assertIsNone(lob.best_ask())
+
+            lob.step_updates({'bids': [], 'asks': [(100.0, 3.0)]})
+            self.assertEqual(lob.best_ask(), (Decimal('100.00'), Decimal('3.00'), 1))
+
+            lob.step_updates({'bids': [], 'asks': [(100.0, 0.0)]})
+            self.assertIsNone(lob.best_ask())
+            self.assertEqual(lob.asks_volume(), 0)
@@ -0,0 +1,90 @@
+import unittest, logging, random, threading, sys
+from decimal import Decimal
+
+from fastlob import Orderbook, OrderParams, OrderSide, BookView
+
+def random_orders(seed: int, n: int = 300) -> list[OrderParams]:
+    rng = random.Random(seed)
+    return [OrderParams(rng.choice((OrderSide.BID, OrderSide.ASK)), round(rng.uniform(97, 103), 2),
+                        round(rng.uniform(0.01, 50), 2)) for _ in range(n)]
+
+def consistent(levels: tuple) -> bool:
+    '''The levels written by `rewrite` all have the same volume.'''
+
+    return len({volume for _, volume, _ in levels}) <= 1
+
+def rewrite(lob: Orderbook, stop: threading.Event) -> None:
+    '''Rewrite all the levels of the book with a new volume in each operation, until `stop` is set.'''
+
+    volume = 1
+    while not stop.is_set():
+        volume = volume % 50 + 1
+        lob.step_updates({'bids': [(99 - i / 100, volume) for i in range(20)],
+                          'asks': [(101 + i / 100, volume) for i in range(20)]})
+
+class TestBookView(unittest.TestCase):
+    def setUp(self): logging.basicConfig(level=logging.FATAL)
+
+    def test_same_as_readers(self):
+        for ticks in (False, True):
+            with Orderbook(ticks=ticks) as lob:
+                for params in random_orders(0):
+                    lob(params)
+                    view = lob.book_view(5)
+                    self.assertEqual(view.version(), lob.version())
+                    self.assertTupleEqual(view.bids(), tuple(lob.best_bids(5)))
+                    self.assertTupleEqual(view.asks(), tuple(lob.best_asks(5)))
+                    self.assertEqual(view.spread(), lob.spread())
+                    self.assertEqual(view.midprice(), lob.midprice())
+
+    def test_versions(self):
+        with Orderbook() as lob:
+            view = lob.book_view()
+            self.assertIsNone(view.best_bid())
+            self.assertIsNone(view.imbalance())
+
+            self.assertTrue(lob(OrderParams(OrderSide.BID, 100, 10)).success())
+            self.assertGreater(lob.version(), view.version())
+
+            # views are shared until the version changes
+            view = lob.book_view()
+            self.assertIs(lob.book_view(), view)
+            self.assertIsNot(lob.book_view(3), view)
+            self.assertEqual(lob.book_view(3), view)
+
+            lob.cancel(-1) # even failed operations draw a new version
+            self.assertIsNot(lob.book_view(), view)
+            self.assertEqual(lob.book_view(), view)
+            self.assertEqual(view.best_bid(), (Decimal('100.00'), Decimal('10.00'), 1))
+            self.assertEqual(view.imbalance(), 1)
+
+    def test_concurrent_readers(self):
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-5) # make the threads switch in the middle of operations
+        stop = threading.Event()
+
+        with Orderbook(hot=True) as lob:
+            writer = threading.Thread(target=rewrite, args=(lob, stop))
+            writer.start()
+            try:
+                versions = list()
+                while len(set(versions)) < 10: # the readers see the book at different versions
+                    view = lob.book_view(20)
+                    self.assertTrue(consistent(view.bids()) and consistent(view.asks()), view)
+                    versions.append(view.version())
+            finally:
+                stop.set()
+                writer.join()
+                sys.setswitchinterval(interval)
+
+        self.assertListEqual(versions, sorted(versions))
+
+    def test_market_checks(self):
+        with Orderbook() as lob:
+            lob(OrderParams(OrderSide.ASK, 100, 10))
+            # classified and executed under the ask side lock, which is released afterwards
+            result = lob(OrderParams(OrderSide.BID, 101, 4))
+            self.assertTrue(result.success())
+            self.assertFalse(lob._askside.lock().locked())
+            self.assertEqual(lob.book_view().best_ask()[1], Decimal('6.00'))
+            self.assertIsInstance(lob.book_view(), BookView)